@@ -0,0 +1,312 @@
+"""Benchmarks of the DataJoint checker on synthetic schemas
+
+Generates schema modules of various shapes (many tables, deep foreign key
+chains, wide definitions, many imports), lints each with only the DataJoint
+checker, and records per-file time, per-call time of the checker's main
+methods, and peak memory. With --parser, the native definition parser is also
+timed against DataJoint's prepare_declare. Results are written as JSON so that
+runs can be compared across commits:
+
+    python benchmarks/bench_linter.py -o before.json
+    git checkout other-branch
+    python benchmarks/bench_linter.py -o after.json --compare before.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from collections import defaultdict
+from functools import wraps
+from importlib import metadata
+
+from datajoint_linter.cli import _make_linter
+from datajoint_linter.parser import UnsupportedDefinition, parse_definition
+
+TIMED_METHODS = ("visit_classdef", "_prepare_declare", "_fk_check")
+
+SCENARIOS = dict(  # name: (tables, fk depth, attributes per table, imports)
+    many=(2000, 1, 3, 5),
+    deep=(500, 500, 2, 5),
+    wide=(200, 1, 200, 5),
+    imports=(200, 1, 3, 1000),
+)
+
+
+def generate(tables: int, depth: int, width: int, imports: int) -> str:
+    """Returns the source of a synthetic schema module
+
+    Parameters
+    ----------
+    tables : int
+        Number of table classes.
+    depth : int
+        Length of foreign key chains. Each table references the previous one
+        in its chain, in the primary key.
+    width : int
+        Number of secondary attributes per table.
+    imports : int
+        Number of import statements.
+    """
+    lines = ["import datajoint as dj", ""]
+    lines += [
+        f"from upstream_{idx} import Upstream{idx}" for idx in range(imports)
+    ]
+    lines += ["", 'schema = dj.Schema("bench")', ""]
+    tiers = ("dj.Manual", "dj.Lookup", "dj.Imported", "dj.Computed")
+    for idx in range(tables):
+        parent = f"    -> Table{idx - 1}\n" if idx % depth else ""
+        secondary = "".join(
+            f"    attr{a} = null : varchar(32) # attribute {a}\n"
+            for a in range(width)
+        )
+        lines += [
+            "@schema",
+            f"class Table{idx}({tiers[idx % len(tiers)]}):",
+            '    definition = """ # synthetic table',
+            parent + f"    key{idx} : int",
+            "    ---",
+            secondary + '    """',
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _timed(checker, timings):
+    """Wraps checker methods to record per-call time by table"""
+    for name in TIMED_METHODS:
+        method = getattr(checker, name)
+
+        @wraps(method)
+        def wrapper(node, *args, _method=method, _name=name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(node, *args, **kwargs)
+            finally:
+                timings[_name].append((node.name, time.perf_counter() - start))
+
+        setattr(checker, name, wrapper)
+
+
+def _summary(calls):
+    """Returns aggregate statistics of (table, seconds) calls"""
+    seconds = sorted(s for _, s in calls)
+    if not seconds:
+        return dict(calls=0)
+    slowest = max(calls, key=lambda call: call[1])
+    return dict(
+        calls=len(seconds),
+        total=sum(seconds),
+        mean=sum(seconds) / len(seconds),
+        median=seconds[len(seconds) // 2],
+        p95=seconds[int(len(seconds) * 0.95)],
+        max=slowest[1],
+        slowest=slowest[0],
+    )
+
+
+def run_scenario(name: str, directory: str, options: dict) -> dict:
+    """Lints a generated module, returns timing and memory results"""
+    tables, depth, width, imports = SCENARIOS[name]
+    path = os.path.join(directory, f"bench_{name}.py")
+    with open(path, "w") as f:
+        f.write(generate(tables, depth, width, imports))
+
+    linter = _make_linter(options)
+    checker = next(
+        c for c in linter.get_checkers() if c.name == "datajoint-linter"
+    )
+    timings = defaultdict(list)
+    _timed(checker, timings)
+    start = time.perf_counter()
+    linter.check([path])
+    elapsed = time.perf_counter() - start
+
+    # Separate run for memory, as tracing allocations slows everything down
+    tracemalloc.start()
+    _make_linter(options).check([path])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(
+        tables=tables,
+        depth=depth,
+        width=width,
+        imports=imports,
+        messages=len(linter.reporter.messages),
+        file_seconds=elapsed,
+        table_seconds=elapsed / tables,
+        peak_memory_bytes=peak,
+        **{method: _summary(timings[method]) for method in TIMED_METHODS},
+    )
+
+
+def parser_throughput(name: str, sample: int = 20) -> dict:
+    """Times the native parser and prepare_declare on a scenario's tables
+
+    Only the first sample definitions supported by the native parser are
+    timed, once each. Foreign keys are not resolved, so prepare_declare
+    stops at the first of each table.
+    """
+    from datajoint.declare import prepare_declare
+    from datajoint.errors import DataJointError
+
+    definitions = []
+    for node in ast.walk(ast.parse(generate(*SCENARIOS[name]))):
+        if len(definitions) >= sample:
+            break
+        if isinstance(node, ast.Assign) and isinstance(
+            node.value, ast.Constant
+        ):
+            try:
+                parse_definition(node.value.value)
+            except UnsupportedDefinition:
+                continue
+            definitions.append(node.value.value)
+
+    def _native():
+        for definition in definitions:
+            parse_definition(definition)
+
+    def _declare():
+        for definition in definitions:
+            try:
+                prepare_declare(definition, context={})
+            except DataJointError:
+                pass
+
+    native = timeit.timeit(_native, number=1)
+    declare = timeit.timeit(_declare, number=1)
+    return dict(
+        definitions=len(definitions),
+        native_seconds=native,
+        declare_seconds=declare,
+        speedup=declare / native if native else None,
+    )
+
+
+def _metadata() -> dict:
+    """Returns environment details of the run, imports datajoint"""
+    start = time.perf_counter()
+    import datajoint  # noqa: F401
+
+    import_seconds = time.perf_counter() - start
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(
+        commit=commit,
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        python=platform.python_version(),
+        datajoint=metadata.version("datajoint"),
+        pylint=metadata.version("pylint"),
+        datajoint_import_seconds=import_seconds,
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Returns descriptions of metrics slower than baseline by threshold"""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            continue
+        metrics = [("file_seconds", result, base)]
+        metrics += [
+            (f"{method}.total", result[method], base[method])
+            for method in TIMED_METHODS
+            if result[method].get("calls") and base[method].get("calls")
+        ]
+        metrics.append(("peak_memory_bytes", result, base))
+        for label, new, old in metrics:
+            key = label.split(".")[-1]
+            ratio = new[key] / old[key] if old[key] else 1.0
+            print(f"{name:>8} {label:<24} {ratio:6.2f}x")
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} {label} {ratio:.2f}x")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run, repeatable. Default all.",
+    )
+    parser.add_argument("-o", "--output", help="JSON file for results")
+    parser.add_argument("--compare", help="Baseline JSON file to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fractional slowdown reported as regression. Default 0.2.",
+    )
+    parser.add_argument(
+        "--native-parser",
+        choices=("y", "n"),
+        default="y",
+        help="Use the native definition parser. Default y.",
+    )
+    parser.add_argument(
+        "--parser",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Time the native parser against prepare_declare on N "
+        + "definitions of each scenario. Default 0, not timed.",
+    )
+    args = parser.parse_args(argv)
+
+    options = dict(dj_native_parser=args.native_parser == "y")
+    # Metadata first, so the one-time datajoint import is measured apart
+    results = dict(meta=_metadata(), options=options, scenarios=dict())
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.scenario or sorted(SCENARIOS):
+            result = run_scenario(name, directory, options)
+            results["scenarios"][name] = result
+            print(
+                f"{name:>8}: {result['file_seconds']:.3f}s, "
+                + f"{result['table_seconds'] * 1e3:.3f}ms/table, "
+                + f"{result['peak_memory_bytes'] / 2**20:.1f}MiB peak"
+            )
+            if args.parser:
+                throughput = parser_throughput(name, args.parser)
+                result["parser"] = throughput
+                print(
+                    f"{'':>8}  native {throughput['native_seconds']:.3f}s, "
+                    + "prepare_declare "
+                    + f"{throughput['declare_seconds']:.3f}s "
+                    + f"for {throughput['definitions']} definitions"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""On-disk cache of parsed table definitions"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from importlib import metadata
+from typing import Optional
+
+
+def _version(package: str) -> str:
+    """Returns the installed version of a package without importing it"""
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def normalize_definition(definition: str) -> str:
+    """Normalizes whitespace the same way as dj's prepare_declare
+
+    Leading and trailing whitespace of each line is not significant to
+    DataJoint, so reformatting a definition does not invalidate its entry.
+    """
+    return "\n".join(re.split(r"\s*\n\s*", definition.strip()))
+
+
+class DefinitionCache:
+    """Persistent cache of prepare_declare results, keyed by content hash.
+
+    Entries are stored in a sqlite database in `cache_dir`. Keys combine the
+    normalized definition with the datajoint and linter versions plus any
+    options that change the result, so upgrades never reuse stale entries.
+    When the number of entries exceeds `max_entries`, the least recently used
+    entries are evicted on close.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory in which to store the cache database.
+    max_entries : int, optional
+        Maximum number of definitions retained. Default 10000.
+    salt : str, optional
+        Additional string mixed into each key, for option values.
+    """
+
+    FILENAME = "definitions.sqlite"
+
+    def __init__(
+        self, cache_dir: str, max_entries: int = 10000, salt: str = ""
+    ) -> None:
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.max_entries = max_entries
+        self._salt = "\0".join(
+            (_version("datajoint"), _version("datajoint_linter"), salt)
+        )
+        self._accessed = dict()
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS definitions "
+            "(key TEXT PRIMARY KEY, value TEXT, accessed REAL)"
+        )
+
+    def key(self, definition: str) -> str:
+        """Returns the hash key for a definition string"""
+        content = f"{self._salt}\0{normalize_definition(definition)}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns the cached result for key, or None if not cached"""
+        row = self._conn.execute(
+            "SELECT value FROM definitions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._accessed[key] = time.time()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict) -> None:
+        """Stores a JSON-serializable result for key"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO definitions VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time()),
+        )
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM definitions"
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        """Records access times, evicts least recently used, and commits"""
+        if self._conn is None:
+            return
+        self._conn.executemany(
+            "UPDATE definitions SET accessed = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()],
+        )
+        self._conn.execute(
+            "DELETE FROM definitions WHERE key NOT IN (SELECT key FROM "
+            "definitions ORDER BY accessed DESC, rowid DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+        self._accessed = dict()
@@ -0,0 +1,466 @@
+"""Standalone, parallel command line interface: `dj-lint`
+
+Runs only the DataJoint checker, without pylint's other checkers, over the
+Python files that contain DataJoint table classes. Files are spread across a
+process pool and results are printed as each file finishes. Message IDs and
+exit codes match those of the pylint plugin.
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from pylint.message import Message
+from pylint.reporters import CollectingReporter
+from pylint.reporters.text import TextReporter
+
+from .main import DataJointLinter
+
+_TABLE_PATTERN = re.compile(  # a table base, or a definition of any class
+    r"^\s*class\s+\w+\s*\([^)]*?\b(?:"
+    + "|".join(re.escape(base) for base in DataJointLinter.CHECKED_CLASSES)
+    + r"|Manual|Lookup|Imported|Computed|Part)\b|^\s+definition\s*=",
+    re.M,
+)
+_CONVERTERS = {
+    "yn": lambda value: value.lower() in ("y", "yes", "true", "1"),
+    "int": int,
+    "string": str,
+    "csv": lambda value: tuple(v.strip() for v in value.split(",") if v),
+}
+
+_worker_linter = None  # PyLinter of each worker process
+
+
+def has_tables(path: str) -> bool:
+    """Returns true if the file appears to declare DataJoint tables"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return bool(_TABLE_PATTERN.search(f.read()))
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def find_files(paths: Iterable[str]) -> List[str]:
+    """Returns python files with DataJoint tables under the given paths"""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for directory, subdirs, files in os.walk(path):
+            subdirs[:] = sorted(d for d in subdirs if not d.startswith("."))
+            found.extend(
+                os.path.join(directory, file)
+                for file in sorted(files)
+                if file.endswith(".py")
+            )
+    return [path for path in found if has_tables(path)]
+
+
+def _make_linter(options: dict):
+    """Returns a PyLinter running only the DataJoint checker"""
+    from pylint.lint import PyLinter
+
+    from . import register
+
+    linter = PyLinter()
+    linter.set_reporter(CollectingReporter())
+    register(linter)
+    for key, value in options.items():
+        setattr(linter.config, key, value)
+    return linter
+
+
+def _init_worker(options: dict) -> None:
+    """Initializes the linter of a worker process"""
+    global _worker_linter
+    _worker_linter = _make_linter(options)
+
+
+def _checker(linter) -> DataJointLinter:
+    """Returns the DataJoint checker of a linter"""
+    return next(
+        checker
+        for checker in linter.get_checkers()
+        if isinstance(checker, DataJointLinter)
+    )
+
+
+def _lint_file(path: str, linter=None) -> Tuple[str, List[Message], int, dict]:
+    """Lints one file, returns its path, messages, pylint status code, and
+    the checker's map data"""
+    linter = linter or _worker_linter
+    linter.msg_status = 0
+    linter.check([path])
+    messages = list(linter.reporter.messages)
+    linter.reporter.reset()
+    return path, messages, linter.msg_status, _checker(linter).get_map_data()
+
+
+def _print_messages(messages: List[Message], output=sys.stdout) -> None:
+    """Prints messages in pylint's default text format"""
+    module = None
+    for msg in messages:
+        if msg.module != module:
+            module = msg.module
+            print(f"************* Module {module}", file=output)
+        print(msg.format(TextReporter.line_format), file=output)
+    output.flush()
+
+
+def _write_messages(messages: List[Message], output, reporter=None) -> None:
+    """Prints messages as text, or passes them to a streaming reporter"""
+    if reporter is None:
+        _print_messages(messages, output)
+        return
+    for msg in messages:
+        reporter.handle_message(msg)
+
+
+def _print_reports(linter, output=sys.stdout) -> None:
+    """Prints the DataJoint checker's reports, as pylint's --reports=y does"""
+    from pylint.exceptions import EmptyReportError
+    from pylint.reporters.ureports.nodes import Section
+
+    layout = Section("Report")
+    for report_id, title, report in _checker(linter).reports:
+        section = Section(title)
+        try:
+            report(section, linter.stats, None)
+        except EmptyReportError:
+            continue
+        section.report_id = report_id
+        layout.append(section)
+    if layout.children:
+        TextReporter(output).display_reports(layout)
+        output.flush()
+
+
+def _make_reporter(output_format: str, output):
+    """Returns a streaming reporter for a non-text output format"""
+    from .reporters import NDJSONReporter, SARIFReporter
+
+    reporter = dict(ndjson=NDJSONReporter, sarif=SARIFReporter)[output_format]
+    return reporter(output)
+
+
+def run(
+    paths: Sequence[str],
+    options: dict,
+    jobs: int = 0,
+    output=sys.stdout,
+    output_format: str = "text",
+) -> int:
+    """Lints files under paths with a process pool, streaming results
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        Files or directories to lint.
+    options : dict
+        DataJoint checker options, keyed by config attribute name.
+    jobs : int, optional
+        Number of processes. 0 uses the number of CPUs. Default 0.
+    output : file, optional
+        Stream for results. Default stdout.
+    output_format : str, optional
+        One of text, ndjson or sarif. Default text.
+
+    Returns
+    -------
+    int
+        Exit code, bit-encoded by message category as in pylint.
+    """
+    files = find_files(paths)
+    jobs = min(jobs or os.cpu_count() or 1, len(files) or 1)
+    status = 0
+
+    reporter = None
+    if output_format != "text":
+        reporter = _make_reporter(output_format, output)
+
+    linter, map_data = _make_linter(options), []
+    if jobs == 1:
+        for path in files:
+            _, messages, msg_status, data = _lint_file(path, linter)
+            _write_messages(messages, output, reporter)
+            status |= msg_status
+            map_data.append(data)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(options,)
+        ) as executor:
+            futures = [executor.submit(_lint_file, path) for path in files]
+            for future in as_completed(futures):
+                _, messages, msg_status, data = future.result()
+                _write_messages(messages, output, reporter)
+                status |= msg_status
+                map_data.append(data)
+
+    # References into files checked later, or by other workers
+    linter.msg_status = 0
+    _checker(linter).reduce_map_data(linter, map_data)
+    _write_messages(linter.reporter.messages, output, reporter)
+    linter.reporter.reset()
+    status |= linter.msg_status
+
+    if reporter is not None:
+        reporter.display_messages(None)
+    if linter.config.dj_profile:  # on stderr, to keep structured output valid
+        _print_reports(linter, output if reporter is None else sys.stderr)
+    return status
+
+
+def _checked_classes(table_bases: Sequence[str]) -> Tuple[str, ...]:
+    """Returns DataJoint's table base classes and configured ones"""
+    return DataJointLinter.CHECKED_CLASSES + tuple(table_bases)
+
+
+def report_graph(
+    paths: Sequence[str],
+    top: int = 10,
+    output=sys.stdout,
+    table_bases: Sequence[str] = (),
+) -> int:
+    """Prints the foreign key graph analysis of tables under paths
+
+    Reports cycles and dangling references, then the maximum depth and the
+    tables with most referencing (fan-in) and referenced (fan-out) tables.
+    Tables are classes of DataJoint's base classes, or of table_bases.
+
+    Returns
+    -------
+    int
+        Exit code, 16 (convention messages) if any cycle or dangling
+        reference was found, else 0.
+    """
+    from .graph import DependencyGraph
+    from .index import TableIndex
+
+    graph = DependencyGraph(TableIndex(paths, _checked_classes(table_bases)))
+    report = graph.analyze()
+
+    def _name(table):
+        return ".".join(table)
+
+    for cycle in report.cycles:
+        names = " -> ".join(_name(table) for table in cycle + cycle[:1])
+        print(f"cycle: {names}", file=output)
+    for dangling in report.dangling:
+        print(
+            f"dangling: {_name(dangling.table)} -> {dangling.ref}", file=output
+        )
+    print(
+        f"{len(graph)} tables, {sum(report.fan_out.values())} references, "
+        + f"max depth {report.max_depth}",
+        file=output,
+    )
+    for label, counts in (
+        ("fan-in", report.fan_in),
+        ("fan-out", report.fan_out),
+    ):
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        for table, count in ranked[:top]:
+            if count:
+                print(f"{label}: {count:>6} {_name(table)}", file=output)
+    output.flush()
+    return 16 if report.cycles or report.dangling else 0
+
+
+def report_restrictions(
+    paths: Sequence[str],
+    top: int = 10,
+    output=sys.stdout,
+    table_bases: Sequence[str] = (),
+) -> int:
+    """Prints the attributes of tables most often restricted without index
+
+    Each line gives the number of such restrictions, the table and attribute,
+    and the first restriction found. Tables are found as in `report_graph`.
+
+    Returns
+    -------
+    int
+        Exit code, 16 (convention messages) if any attribute was found,
+        else 0.
+    """
+    from .index import TableIndex
+    from .restrictions import unindexed_restrictions
+
+    index = TableIndex(paths, _checked_classes(table_bases))
+    unindexed = unindexed_restrictions(index)
+    print(
+        f"{len(index)} tables, {len(unindexed)} attributes restricted "
+        + "without an index",
+        file=output,
+    )
+    for found in unindexed[:top]:
+        print(
+            f"unindexed: {found.count:>6} {'.'.join(found.table)}."
+            + f"{found.attribute} ({found.path}:{found.line})",
+            file=output,
+        )
+    output.flush()
+    return 16 if unindexed else 0
+
+
+def prune_lock(
+    paths: Sequence[str],
+    lockfile: str,
+    output=sys.stdout,
+    table_bases: Sequence[str] = (),
+) -> int:
+    """Removes tables no longer under paths from the lockfile
+
+    Tables are found as in `report_graph`, so paths should cover the whole
+    pipeline. Each removed table is printed.
+
+    Returns
+    -------
+    int
+        Exit code, 0.
+    """
+    from .index import TableIndex
+    from .lock import DefinitionLock
+
+    index = TableIndex(paths, _checked_classes(table_bases))
+    lock = DefinitionLock(lockfile)
+    removed = lock.prune(f"{entry.module}.{entry.name}" for entry in index)
+    lock.save()
+    for name in removed:
+        print(f"pruned: {name}", file=output)
+    print(f"{len(lock)} tables locked, {len(removed)} pruned", file=output)
+    output.flush()
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Returns the argument parser, with the checker's options"""
+    parser = argparse.ArgumentParser(
+        prog="dj-lint", description="Lint DataJoint table definitions."
+    )
+    parser.add_argument("paths", nargs="*", help="Files or directories")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Number of processes. 0 (default) uses the number of CPUs.",
+    )
+    parser.add_argument(
+        "-f",
+        "--output-format",
+        choices=("text", "ndjson", "sarif"),
+        default="text",
+        help="Format of messages, streamed as each file finishes",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of tables listed in each ranking of --graph, or "
+        + "attributes listed by --restrictions",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--lsp",
+        action="store_true",
+        help="Run as a language server over stdio",
+    )
+    mode.add_argument(
+        "--watch",
+        action="store_true",
+        help="Relint files under paths as they change",
+    )
+    mode.add_argument(
+        "--diff",
+        metavar="<base>",
+        help="Lint only tables changed since a git ref, and tables "
+        + "referencing them",
+    )
+    mode.add_argument(
+        "--graph",
+        action="store_true",
+        help="Report cycles, dangling references and metrics of the foreign "
+        + "key graph of tables under paths",
+    )
+    mode.add_argument(
+        "--restrictions",
+        action="store_true",
+        help="Report attributes of tables under paths most often restricted "
+        + "in code without an index",
+    )
+    mode.add_argument(
+        "--lock-prune",
+        action="store_true",
+        help="Remove tables not under paths from the --dj-lockfile",
+    )
+    for name, option in DataJointLinter.options:
+        parser.add_argument(
+            f"--{name}",
+            dest=name.replace("-", "_"),
+            type=_CONVERTERS[option["type"]],
+            default=option["default"],
+            metavar=option.get("metavar"),
+            help=option.get("help"),
+        )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of `dj-lint`"""
+    parser = _parser()
+    args = vars(parser.parse_args(argv))
+    paths, jobs = args.pop("paths"), args.pop("jobs")
+    lsp, watch = args.pop("lsp"), args.pop("watch")
+    graph, base = args.pop("graph"), args.pop("diff")
+    restrictions, lock_prune = args.pop("restrictions"), args.pop("lock_prune")
+    output_format, top = args.pop("output_format"), args.pop("top")
+    if lsp:
+        from .server import serve_lsp
+
+        return serve_lsp(args)
+    if not paths:
+        parser.error("paths are required, unless running with --lsp")
+    if graph:
+        return report_graph(
+            paths,
+            top=top,
+            table_bases=args["dj_table_bases"],
+        )
+    if restrictions:
+        return report_restrictions(
+            paths,
+            top=top,
+            table_bases=args["dj_table_bases"],
+        )
+    if lock_prune:
+        if not args["dj_lockfile"]:
+            parser.error("--lock-prune requires --dj-lockfile")
+        return prune_lock(
+            paths,
+            args["dj_lockfile"],
+            table_bases=args["dj_table_bases"],
+        )
+    if watch:
+        from .server import watch as watch_files
+
+        watch_files(paths, args)
+        return 0
+    if base:
+        from .diff import affected_tables
+
+        tables, files = affected_tables(
+            base, paths, _checked_classes(args["dj_table_bases"])
+        )
+        args["dj_tables"] = tuple(sorted(".".join(t) for t in tables))
+        paths = sorted(files)
+    return run(paths, args, jobs=jobs, output_format=output_format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
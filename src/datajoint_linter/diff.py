@@ -0,0 +1,197 @@
+"""Selection of tables changed since a git base ref
+
+Compares the table classes of each file changed since the base ref with
+their versions at the base, then extends the tables whose definition changed
+with every table referencing them, via the foreign key graph. Tables whose
+methods or bases changed are relinted on their own. Only the selected tables
+need to be relinted, so the work scales with the size of the change.
+"""
+
+import ast
+import os
+import subprocess
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .cache import normalize_definition
+from .graph import DependencyGraph, TableKey
+from .index import (
+    TableIndex,
+    is_table_class,
+    module_name,
+    read_imports,
+    table_bases,
+)
+
+
+def _git(args: List[str], cwd: str) -> str:
+    """Returns the output of a git command, raises on failure"""
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def changed_files(base: str, cwd: str = ".") -> Dict[str, str]:
+    """Returns python files changed since base, with their source at base
+
+    Includes uncommitted and untracked files. Files added since base have
+    empty source.
+
+    Parameters
+    ----------
+    base : str
+        Git ref to compare against, e.g. `origin/main`.
+    cwd : str, optional
+        Directory within the repository. Default current directory.
+
+    Returns
+    -------
+    Dict[str, str]
+        Source at base, keyed by absolute path.
+    """
+    top = _git(["rev-parse", "--show-toplevel"], cwd).strip()
+    names = _git(["diff", "--name-only", "-z", base, "--"], top).split("\0")
+    names += _git(
+        ["ls-files", "--others", "--exclude-standard", "-z"], top
+    ).split("\0")
+    changed = dict()
+    for name in filter(None, names):
+        if not name.endswith(".py"):
+            continue
+        try:
+            old = _git(["show", f"{base}:{name}"], top)
+        except subprocess.CalledProcessError:
+            old = ""  # added since base
+        changed[os.path.join(top, name)] = old
+    return changed
+
+
+def table_sources(
+    source: str, checked_classes: Iterable[str]
+) -> Tuple[Dict[str, Tuple[str, str]], str]:
+    """Returns definitions and bodies of tables in a module, and its imports
+
+    Literal definitions are normalized, so that reformatting is not a change.
+    Other definitions are represented by the dumped class. The body is the
+    dumped bases, decorators and statements of the class other than its
+    definition and part tables, e.g. its methods.
+
+    Returns
+    -------
+    Tuple[Dict[str, Tuple[str, str]], str]
+        Definition and body keyed by dotted class name, and dumped imports.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return dict(), ""
+    checked_classes = table_bases(checked_classes)
+    imported = read_imports(tree, "", False)
+    imports = "\n".join(
+        ast.dump(node)
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+    tables = dict()
+
+    def _read(body, prefix):
+        for node in body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            if not is_table_class(node, checked_classes, imported):
+                continue
+            name = prefix + node.name
+            definition = TableIndex._definition(node)
+            if definition is None:
+                tables[name] = ast.dump(node), ""
+            else:
+                tables[name] = normalize_definition(definition), _body(node)
+            _read(node.body, f"{name}.")
+
+    def _body(node):
+        statements = [
+            statement
+            for statement in node.body
+            if not _is_definition(statement)
+            and not (
+                isinstance(statement, ast.ClassDef)
+                and is_table_class(statement, checked_classes, imported)
+            )
+        ]
+        return "\n".join(
+            ast.dump(item)
+            for item in node.bases + node.decorator_list + statements
+        )
+
+    _read(tree.body, "")
+    return tables, imports
+
+
+def _is_definition(statement: ast.stmt) -> bool:
+    """Returns true for the assignment of a class's definition"""
+    return isinstance(statement, ast.Assign) and any(
+        isinstance(target, ast.Name) and target.id == "definition"
+        for target in statement.targets
+    )
+
+
+def changed_tables(
+    base: str, paths: Iterable[str], checked_classes: Iterable[str]
+) -> Tuple[Set[TableKey], Set[TableKey], Set[TableKey]]:
+    """Returns tables under paths changed since base, removed and edited
+
+    A table is changed if it was added or its definition changed. Every
+    table of a file whose imports changed is changed, as its references may
+    resolve differently. A table is edited if only its body changed, e.g. a
+    method, which does not affect tables referencing it.
+    """
+    roots = [os.path.realpath(path) for path in paths]
+    cwd = roots[0] if os.path.isdir(roots[0]) else os.path.dirname(roots[0])
+    changed, removed, edited = set(), set(), set()
+    for path, old_source in changed_files(base, cwd).items():
+        if not any(
+            path == root or path.startswith(root + os.sep) for root in roots
+        ):
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                new_source = f.read()
+        except OSError:
+            new_source = ""  # deleted since base
+        old, old_imports = table_sources(old_source, checked_classes)
+        new, new_imports = table_sources(new_source, checked_classes)
+        module = module_name(path)
+        for name, (definition, body) in new.items():
+            old_definition, old_body = old.get(name, (None, None))
+            if old_imports != new_imports or old_definition != definition:
+                changed.add((module, name))
+            elif old_body != body:
+                edited.add((module, name))
+        removed.update((module, name) for name in set(old) - set(new))
+    return changed, removed, edited
+
+
+def affected_tables(
+    base: str, paths: Iterable[str], checked_classes: Iterable[str]
+) -> Tuple[Set[TableKey], Set[str]]:
+    """Returns tables to relint after changes since base, and their files
+
+    These are the changed tables and every table referencing them, and the
+    edited tables. If tables were removed, tables with references that no
+    longer resolve are included as well.
+    """
+    changed, removed, edited = changed_tables(base, paths, checked_classes)
+    if not changed and not removed and not edited:
+        return set(), set()
+    index = TableIndex(paths, checked_classes)
+    graph = DependencyGraph(index)
+    if removed:
+        changed.update(dangling.table for dangling in graph.dangling)
+    affected = graph.dependents(changed) | {
+        table for table in edited if table in graph.children
+    }
+    files = {index.get(module, name).path for module, name in affected}
+    return affected, files
@@ -0,0 +1,154 @@
+"""Foreign key dependency graph of indexed DataJoint tables
+
+Built from a `TableIndex`, with an edge from each table to every table it
+references with `->`. Analysis runs in time linear in tables and references:
+cycles are the strongly connected components found by an iterative Tarjan
+search, whose output order also gives each table's depth.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from .index import TableEntry, TableIndex
+
+TableKey = Tuple[str, str]  # module, dotted table name
+
+
+class Dangling(NamedTuple):
+    table: TableKey
+    ref: str
+
+
+class GraphReport(NamedTuple):
+    cycles: List[Tuple[TableKey, ...]]  # members of each cycle
+    dangling: List[Dangling]
+    depth: Dict[TableKey, int]  # longest reference chain to a root table
+    fan_in: Dict[TableKey, int]  # number of referencing tables
+    fan_out: Dict[TableKey, int]  # number of referenced tables
+
+    @property
+    def max_depth(self) -> int:
+        return max(self.depth.values(), default=0)
+
+
+def _key(entry: TableEntry) -> TableKey:
+    return entry.module, entry.name
+
+
+class DependencyGraph:
+    """Directed graph of table to referenced table
+
+    References that resolve to no table are recorded as dangling, unless they
+    name objects imported from outside the index, which can not be checked.
+
+    Parameters
+    ----------
+    index : TableIndex
+        Index of the tables to graph.
+    """
+
+    def __init__(self, index: TableIndex) -> None:
+        self.parents: Dict[TableKey, Tuple[TableKey, ...]] = dict()
+        self.children: Dict[TableKey, List[TableKey]] = dict()
+        self.dangling: List[Dangling] = []
+        for entry in index:
+            self.children.setdefault(_key(entry), [])
+        for entry in index:
+            parents = dict()
+            for ref in entry.refs:
+                parent = index.resolve_ref(entry, ref)
+                if parent is not None:
+                    parents[_key(parent)] = None
+                elif not index.is_external(entry.module, ref):
+                    self.dangling.append(Dangling(_key(entry), ref))
+            self.parents[_key(entry)] = tuple(parents)
+            for parent in parents:
+                self.children[parent].append(_key(entry))
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def dependents(self, tables: Iterable[TableKey]) -> Set[TableKey]:
+        """Returns tables and every table referencing them, transitively"""
+        found = {table for table in tables if table in self.children}
+        queue = list(found)
+        while queue:
+            for child in self.children[queue.pop()]:
+                if child not in found:
+                    found.add(child)
+                    queue.append(child)
+        return found
+
+    def components(self) -> List[List[TableKey]]:
+        """Returns strongly connected components, parents before children
+
+        Iterative Tarjan search, so that deep reference chains do not hit the
+        recursion limit.
+        """
+        order: Dict[TableKey, int] = dict()
+        low: Dict[TableKey, int] = dict()
+        stack: List[TableKey] = []
+        on_stack = set()
+        components = []
+        for root in self.parents:
+            if root in order:
+                continue
+            work = [(root, iter(self.parents[root]))]
+            order[root] = low[root] = len(order)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                table, parents = work[-1]
+                for parent in parents:
+                    if parent not in order:
+                        order[parent] = low[parent] = len(order)
+                        stack.append(parent)
+                        on_stack.add(parent)
+                        work.append((parent, iter(self.parents[parent])))
+                        break
+                    if parent in on_stack:
+                        low[table] = min(low[table], order[parent])
+                else:
+                    work.pop()
+                    if work:
+                        child = work[-1][0]
+                        low[child] = min(low[child], low[table])
+                    if low[table] == order[table]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == table:
+                                break
+                        components.append(component[::-1])
+        return components
+
+    def analyze(self) -> GraphReport:
+        """Returns cycles, dangling references and per-table metrics
+
+        Tables in a cycle share one depth, one more than their deepest parent.
+        """
+        cycles = []
+        depth: Dict[TableKey, int] = dict()
+        for component in self.components():
+            members = set(component)
+            first = component[0]
+            if len(component) > 1 or first in self.parents[first]:
+                cycles.append(tuple(component))
+            level = max(
+                (
+                    depth[parent] + 1
+                    for table in component
+                    for parent in self.parents[table]
+                    if parent not in members
+                ),
+                default=0,
+            )
+            depth.update(dict.fromkeys(component, level))
+        return GraphReport(
+            cycles=cycles,
+            dangling=list(self.dangling),
+            depth=depth,
+            fan_in={table: len(c) for table, c in self.children.items()},
+            fan_out={table: len(p) for table, p in self.parents.items()},
+        )
@@ -0,0 +1,482 @@
+"""Project-wide index of DataJoint table classes"""
+
+import ast
+import os
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .parser import (
+    UnsupportedDefinition,
+    parse_definition,
+    parse_foreign_keys,
+)
+from .width import KeyTypes
+
+_BLOCKS = (ast.If, ast.Try, getattr(ast, "TryStar", ast.Try))  # 3.11 except*
+
+
+class TableEntry(NamedTuple):
+    module: str
+    name: str  # dotted within module for part tables, e.g. Master.Part
+    key: Tuple[str, ...]  # primary key items in order, references as `->X`
+    path: str
+    refs: Tuple[str, ...] = ()  # all foreign key references, without proj
+    types: Tuple[Tuple[str, str], ...] = ()  # declared attribute types
+    indexes: Tuple[Tuple[str, ...], ...] = ()  # declared secondary indexes
+
+    @property
+    def key_refs(self) -> Tuple[str, ...]:
+        """Foreign key references in the primary key"""
+        return tuple(item[2:] for item in self.key if item.startswith("->"))
+
+
+class _FileRecord(NamedTuple):
+    mtime: float
+    module: str
+    tables: Dict[str, TableEntry]
+    imports: Dict[str, str]  # local name -> qualified name
+    parsed: bool = True  # false for modules without tables, not read
+
+
+def module_name(path: str) -> str:
+    """Returns the dotted module name of a file, following package inits"""
+    path = os.path.abspath(path)
+    parts = [os.path.splitext(os.path.basename(path))[0]]
+    if parts[0] == "__init__":
+        parts = []
+    directory = os.path.dirname(path)
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        parts.insert(0, os.path.basename(directory))
+        directory = os.path.dirname(directory)
+    return ".".join(parts)
+
+
+def dotted_name(node: ast.AST) -> str:
+    """Returns the dotted name of a Name/Attribute node, or empty string"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = dotted_name(node.value)
+        return value and f"{value}.{node.attr}"
+    return ""
+
+
+def table_bases(checked_classes: Iterable[str]) -> Set[str]:
+    """Returns names of table base classes, with `dj.X` also as `datajoint.X`"""
+    bases = set(checked_classes)
+    bases.update(
+        ["datajoint." + base[3:] for base in bases if base.startswith("dj.")]
+    )
+    return bases
+
+
+def _module_statements(body: List[ast.stmt]) -> Iterator[ast.stmt]:
+    """Yields module-level statements, including those of if and try blocks
+
+    Statements of functions and classes are not yielded, as their names are
+    local to their scope.
+    """
+    for node in body:
+        yield node
+        if isinstance(node, _BLOCKS):
+            for field in ("body", "orelse", "finalbody"):
+                yield from _module_statements(getattr(node, field, []))
+            for handler in getattr(node, "handlers", []):
+                yield from _module_statements(handler.body)
+
+
+def read_imports(
+    tree: ast.Module, module: str, package: bool
+) -> Dict[str, str]:
+    """Returns qualified names of module-level imports, keyed by local name
+
+    Imports in functions and classes are skipped, as they do not bind the
+    module's names.
+
+    Parameters
+    ----------
+    tree : ast.Module
+        Parsed module.
+    module : str
+        Dotted module name, for relative imports.
+    package : bool
+        True if the module is a package init.
+    """
+    imports = dict()
+    for node in _module_statements(tree.body):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                local = alias.asname or alias.name.split(".")[0]
+                imports[local] = alias.asname and alias.name or local
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = module.split(".")
+                if not package:
+                    parent = parent[:-1]
+                parent = parent[: len(parent) - node.level + 1]
+                base = ".".join(parent + ([base] if base else []))
+            for alias in node.names:
+                local = alias.asname or alias.name
+                imports[local] = f"{base}.{alias.name}"
+    return imports
+
+
+def is_table_class(
+    node: ast.ClassDef, bases: Set[str], imports: Dict[str, str]
+) -> bool:
+    """Returns true if any base of a class is a table base class
+
+    Bases match as written (e.g. `dj.Manual`) or as qualified through the
+    module's imports (e.g. `Manual` from `from datajoint import Manual`).
+    """
+    for base in node.bases:
+        name = dotted_name(base)
+        head, _, rest = name.partition(".")
+        if name in bases or (
+            head in imports
+            and ".".join(filter(None, (imports[head], rest))) in bases
+        ):
+            return True
+    return False
+
+
+class TableIndex:
+    """Index of every DataJoint table class under a set of root directories.
+
+    Files are read with the standard library's `ast`, without inference, and
+    tables are recorded by module and class name. The index is refreshed with
+    `update`, which re-reads only files whose modification time changed.
+    Lookups are dictionary accesses.
+
+    Parameters
+    ----------
+    roots : Iterable[str]
+        Directories (or files) to index.
+    checked_classes : Iterable[str]
+        Base class names identifying DataJoint tables.
+    """
+
+    def __init__(
+        self, roots: Iterable[str], checked_classes: Iterable[str]
+    ) -> None:
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        self.checked_classes = table_bases(checked_classes)
+        self._files: Dict[str, _FileRecord] = dict()
+        self._tables: Dict[Tuple[str, str], TableEntry] = dict()
+        self._modules = set()
+        self._imports: Dict[str, Dict[str, str]] = dict()
+        self._unparsed: Set[str] = set()
+        self._key_cache: Dict[Tuple[str, str], Tuple[str, ...]] = dict()
+        self._type_cache: Dict[Tuple[str, str], KeyTypes] = dict()
+        self.update()
+
+    def _paths(self) -> Iterable[str]:
+        """Yields python files under the roots"""
+        for root in self.roots:
+            if os.path.isfile(root):
+                yield root
+                continue
+            for directory, subdirs, files in os.walk(root):
+                subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+                for file in files:
+                    if file.endswith(".py"):
+                        yield os.path.join(directory, file)
+
+    def update(self) -> List[str]:
+        """Re-indexes new or modified files, drops deleted ones
+
+        Returns
+        -------
+        List[str]
+            Paths that were (re-)indexed or removed.
+        """
+        changed = []
+        seen = set()
+        for path in self._paths():
+            seen.add(path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            record = self._files.get(path)
+            if record is None or record.mtime != mtime:
+                self._files[path] = self._read(path, mtime)
+                changed.append(path)
+        for path in set(self._files) - seen:
+            del self._files[path]
+            changed.append(path)
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self) -> None:
+        """Recomputes the lookup tables from file records"""
+        self._tables = {
+            (record.module, name): entry
+            for record in self._files.values()
+            for name, entry in record.tables.items()
+        }
+        self._modules = {record.module for record in self._files.values()}
+        self._imports = {
+            record.module: record.imports for record in self._files.values()
+        }
+        self._unparsed = {
+            record.module
+            for record in self._files.values()
+            if not record.parsed
+        }
+        self._key_cache = dict()
+        self._type_cache = dict()
+
+    def _read(self, path: str, mtime: float) -> _FileRecord:
+        """Parses a file, returns its tables and imports"""
+        module = module_name(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            package = path.endswith("__init__.py")  # may re-export tables
+            read = package or "definition" in source
+            tree = ast.parse(source) if read else None
+        except (OSError, SyntaxError, ValueError):
+            tree = None
+        if tree is None:
+            return _FileRecord(mtime, module, dict(), dict(), parsed=False)
+
+        imports = read_imports(tree, module, package)
+        tables = dict()
+        self._read_classes(tree.body, "", module, path, tables, imports)
+        return _FileRecord(mtime, module, tables, imports)
+
+    def _read_classes(self, body, prefix, module, path, tables, imports):
+        """Records table classes in body, recursing into part tables"""
+        for node in body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            if not is_table_class(node, self.checked_classes, imports):
+                continue
+            name = prefix + node.name
+            definition = self._definition(node)
+            key, types, indexes = self._key(definition)
+            tables[name] = TableEntry(
+                module, name, key, path, self._refs(definition), types, indexes
+            )
+            self._read_classes(
+                node.body, f"{name}.", module, path, tables, imports
+            )
+
+    @staticmethod
+    def _refs(definition: Optional[str]) -> Tuple[str, ...]:
+        """Returns the names referenced by well-formed foreign keys"""
+        if definition is None:
+            return ()
+        return tuple(
+            dict.fromkeys(
+                fk.name.strip() for fk in parse_foreign_keys(definition)
+            )
+        )
+
+    def _key(
+        self, definition: Optional[str]
+    ) -> Tuple[Tuple[str, ...], KeyTypes, Tuple[Tuple[str, ...], ...]]:
+        """Returns primary key items of a definition, in declared order
+
+        Also returns the types of the attributes declared directly, and the
+        attributes of the declared secondary indexes.
+        """
+        if definition is None:
+            return (), (), ()
+        try:
+            parsed = parse_definition(definition)
+        except UnsupportedDefinition:
+            return (), (), ()
+        items = {attr.line: attr.name for attr in parsed.attributes}
+        items.update(
+            {fk.line: "->" + fk.ref.strip() for fk in parsed.foreign_keys}
+        )
+        key_lines = {
+            item.line
+            for item in parsed.attributes + parsed.foreign_keys
+            if item.in_key
+        }
+        key = tuple(
+            dict.fromkeys(
+                items[line] for line in parsed.lines if line in key_lines
+            )
+        )
+        types = tuple((attr.name, attr.type) for attr in parsed.attributes)
+        indexes = tuple(index.attributes for index in parsed.indexes)
+        return key, types, indexes
+
+    @staticmethod
+    def _definition(node: ast.ClassDef) -> Optional[str]:
+        """Returns the literal definition string of a class, if any"""
+        for stmt in node.body:
+            if (
+                isinstance(stmt, ast.Assign)
+                and any(
+                    isinstance(t, ast.Name) and t.id == "definition"
+                    for t in stmt.targets
+                )
+                and isinstance(stmt.value, ast.Constant)
+                and isinstance(stmt.value.value, str)
+            ):
+                return stmt.value.value
+        return None
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __iter__(self):
+        return iter(self._tables.values())
+
+    def files(self) -> Dict[str, str]:
+        """Returns the module name of each indexed file, keyed by path"""
+        return {path: record.module for path, record in self._files.items()}
+
+    def has_module(self, module: str) -> bool:
+        """Returns true if module was indexed"""
+        return module in self._modules
+
+    def get(self, module: str, name: str) -> Optional[TableEntry]:
+        """Returns the table entry, or None if no such table exists"""
+        return self._tables.get((module, name))
+
+    def find(self, qualified: str) -> Tuple[Optional[str], Optional[str]]:
+        """Splits a qualified name into indexed module and remainder
+
+        Returns (None, None) if no prefix of the name is an indexed module.
+        """
+        parts = qualified.split(".")
+        for split in range(len(parts) - 1, 0, -1):
+            module = ".".join(parts[:split])
+            if module in self._modules:
+                return module, ".".join(parts[split:])
+        return None, None
+
+    def locate(self, qualified: str) -> Tuple[Optional[str], Optional[str]]:
+        """Splits a qualified name into the module defining it and its name
+
+        Follows re-exports, e.g. `pkg.Session` imported in `pkg/__init__.py`
+        from `pkg.core`, to the indexed module importing the name last.
+        Returns (None, None) if the name leaves the index, or is in a module
+        that was not read as it declares no tables.
+        """
+        module, name = self.find(qualified)
+        seen = set()
+        while module is not None and self.get(module, name) is None:
+            head, _, rest = name.partition(".")
+            imports = self._imports.get(module, dict())
+            if head not in imports or (module, name) in seen:
+                break
+            seen.add((module, name))
+            module, name = self.find(
+                ".".join(filter(None, (imports[head], rest)))
+            )
+        if module in self._unparsed:
+            return None, None
+        return module, name
+
+    def resolve(
+        self, module: str, ref: str, imports: Optional[Dict[str, str]] = None
+    ) -> Optional[TableEntry]:
+        """Resolves a foreign key reference made in module to a table entry
+
+        Parameters
+        ----------
+        module : str
+            Module in which the reference appears.
+        ref : str
+            Referenced name, e.g. `Table`, `mod.Table` or `Table.proj()`.
+        imports : Optional[Dict[str, str]]
+            Imports of the module, as returned by `read_imports`. Defaults to
+            those indexed, which are only read from modules with tables.
+        """
+        name = ref.split(".proj")[0].strip()
+        entry = self.get(module, name)
+        if entry is not None:
+            return entry
+        if imports is None:
+            imports = self._imports.get(module, dict())
+        head, _, rest = name.partition(".")
+        if head not in imports:
+            return None
+        target_module, target = self.locate(
+            ".".join(filter(None, (imports[head], rest)))
+        )
+        return target_module and self.get(target_module, target)
+
+    def is_external(self, module: str, ref: str) -> bool:
+        """Returns true if ref names an object imported from outside the index
+
+        References to such objects can not be checked against the index.
+        """
+        head, _, rest = ref.split(".proj")[0].strip().partition(".")
+        imports = self._imports.get(module, dict())
+        if head not in imports or self.get(module, head) is not None:
+            return False
+        qualified = ".".join(filter(None, (imports[head], rest)))
+        return self.locate(qualified)[0] is None
+
+    def resolve_ref(self, entry: TableEntry, ref: str) -> Optional[TableEntry]:
+        """Resolves a reference made in a table's definition, incl. master"""
+        if ref == "master" and "." in entry.name:
+            return self.get(entry.module, entry.name.rsplit(".", 1)[0])
+        return self.resolve(entry.module, ref)
+
+    def primary_key(self, entry: TableEntry) -> Tuple[str, ...]:
+        """Returns all primary key attributes, including inherited ones
+
+        Projections that rename attributes are not followed, inherited
+        attributes are reported under their original names.
+        """
+        cache_key = (entry.module, entry.name)
+        if cache_key in self._key_cache:
+            return self._key_cache[cache_key]
+        self._key_cache[cache_key] = ()  # guard against cycles
+
+        attributes = []
+        for item in entry.key:
+            if not item.startswith("->"):
+                attributes.append(item)
+                continue
+            parent = self.resolve_ref(entry, item[2:])
+            if parent is not None:
+                attributes.extend(self.primary_key(parent))
+        result = tuple(dict.fromkeys(attributes))
+        self._key_cache[cache_key] = result
+        return result
+
+    def key_types(self, entry: TableEntry) -> Optional[KeyTypes]:
+        """Returns all primary key attributes with their types
+
+        Returns None if a reference in the key does not resolve to an
+        indexed table, as the key is then not fully known.
+        """
+        cache_key = (entry.module, entry.name)
+        if cache_key in self._type_cache:
+            return self._type_cache[cache_key]
+        self._type_cache[cache_key] = None  # guard against cycles
+
+        declared, attributes = dict(entry.types), dict()
+        for item in entry.key:
+            if not item.startswith("->"):
+                attributes.setdefault(item, declared.get(item, ""))
+                continue
+            parent = self.resolve_ref(entry, item[2:])
+            inherited = parent and self.key_types(parent)
+            if inherited is None:
+                return None
+            for name, attribute_type in inherited:
+                attributes.setdefault(name, attribute_type)
+        result = tuple(attributes.items())
+        self._type_cache[cache_key] = result
+        return result
@@ -0,0 +1,320 @@
+"""Lockfile of table definitions, to flag changes to declared tables
+
+Changing the definition of a populated table requires an ALTER, or a drop and
+repopulate. The lockfile records a hash of each normalized definition, plus
+hashes of its parts, so that a diverging definition is found with one hash
+comparison and its change classified without the old definition text.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from .cache import normalize_definition
+from .parser import (
+    ForeignKey,
+    UnsupportedDefinition,
+    parse_attribute,
+    parse_definition,
+    parse_foreign_keys,
+    split_definition,
+    strip_comment,
+)
+
+_INTEGER_SIZES = ("tinyint", "smallint", "mediumint", "int", "bigint")
+_BLOB_SIZES = ("tinyblob", "blob", "mediumblob", "longblob")
+_SIZED = re.compile(
+    r"^(?P<base>[a-z]+)\s*(?:\(\s*(?P<size>\d+)\s*(?:,\s*(?P<scale>\d+))?\))?"
+    + r"(?P<rest>.*)$"
+)
+
+
+def _hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def _reference(fk: ForeignKey) -> str:
+    """Returns a foreign key without its comment, with sorted options"""
+    return f"->{fk.ref.strip()}{sorted(fk.options)}"
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(f: IO[bytes]) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock(f: IO[bytes]) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(f: IO[bytes]) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f: IO[bytes]) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def _exclusive(path: str) -> Iterator[None]:
+    """Holds an exclusive lock for a lockfile, shared by all processes
+
+    The lockfile itself is replaced on save, so processes lock a file in the
+    temporary directory, named by the lockfile's path. It is left in place,
+    as removing it would let a waiting process lock a stale file.
+    """
+    digest = _hash(os.path.abspath(path))
+    name = os.path.join(tempfile.gettempdir(), f"dj-lint-{digest}.lock")
+    with open(name, "a+b") as f:
+        _lock(f)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+class LockEntry(NamedTuple):
+    hash: str  # normalized definition
+    content: str  # definition without comments
+    key: str  # primary key attributes and references
+    refs: str  # foreign key references with options
+    types: Dict[str, str]  # attribute name -> type
+
+    @classmethod
+    def from_definition(cls, definition: str) -> "LockEntry":
+        """Returns the hashes of a definition and its parts"""
+        try:
+            parsed = parse_definition(definition)
+        except UnsupportedDefinition:  # hash lines, skipping comments
+            lines = [
+                strip_comment(line)
+                for line in split_definition(definition)
+                if not line.startswith("#")
+            ]
+            lines = [line for line in lines if line]
+            divider = next(
+                (
+                    i
+                    for i, line in enumerate(lines)
+                    if line.startswith(("---", "___"))
+                ),
+                len(lines),
+            )
+            foreign_keys = parse_foreign_keys(definition)
+            normalized = {
+                strip_comment(fk.line): _reference(fk) for fk in foreign_keys
+            }
+            key = [normalized.get(line, line) for line in lines[:divider]]
+            lines = [normalized.get(line, line) for line in lines]
+            refs = [f"{_reference(fk)}{fk.in_key}" for fk in foreign_keys]
+            types = dict()
+            for line in lines:
+                try:
+                    attr = parse_attribute(line)
+                except UnsupportedDefinition:
+                    continue
+                types[attr.name] = attr.type
+        else:
+            key = [
+                f"{attr.name}:{attr.type}"
+                for attr in parsed.attributes
+                if attr.in_key
+            ] + [_reference(fk) for fk in parsed.foreign_keys if fk.in_key]
+            refs = [
+                f"{_reference(fk)}{fk.in_key}" for fk in parsed.foreign_keys
+            ]
+            types = {attr.name: attr.type for attr in parsed.attributes}
+            lines = (
+                key
+                + refs
+                + [
+                    f"{attr.name}={attr.default}:{attr.type}"
+                    for attr in parsed.attributes
+                ]
+                + [
+                    f"{index.unique}{index.attributes}"
+                    for index in parsed.indexes
+                ]
+            )
+        return cls(
+            hash=_hash(normalize_definition(definition)),
+            content=_hash("\n".join(lines)),
+            key=_hash("\n".join(key)),
+            refs=_hash("\n".join(refs)),
+            types=types,
+        )
+
+
+def _widens(old: str, new: str) -> bool:
+    """Returns true if type new holds every value of type old"""
+    old_match = _SIZED.match(old.lower().strip())
+    new_match = _SIZED.match(new.lower().strip())
+    if not old_match or not new_match:
+        return False
+    old_base, old_size, old_scale, old_rest = old_match.groups()
+    new_base, new_size, new_scale, new_rest = new_match.groups()
+    if old_rest.split() != new_rest.split():  # e.g., unsigned
+        return False
+    old_base = "int" if old_base == "integer" else old_base
+    new_base = "int" if new_base == "integer" else new_base
+    for sizes in (_INTEGER_SIZES, _BLOB_SIZES):
+        if old_base in sizes and new_base in sizes:
+            return sizes.index(new_base) > sizes.index(old_base)
+    if (old_base, new_base) in (("float", "double"), ("char", "varchar")):
+        return not old_size or int(new_size or 0) >= int(old_size)
+    if old_base != new_base or not (old_size and new_size):
+        return False
+    old_size, new_size = int(old_size), int(new_size)
+    if old_base in ("decimal", "numeric"):  # no fewer digits on either side
+        old_scale, new_scale = int(old_scale or 0), int(new_scale or 0)
+        return (
+            new_scale >= old_scale
+            and new_size - new_scale >= old_size - old_scale
+            and new_size > old_size
+        )
+    return old_base in ("varchar", "char") and new_size > old_size
+
+
+def classify(old: LockEntry, new: LockEntry) -> List[str]:
+    """Returns the kinds of change from old to new, which differ in hash"""
+    if old.content == new.content:
+        return ["comment-only"]
+    kinds = []
+    if old.key != new.key:
+        kinds.append("primary key change")
+    if old.refs != new.refs:
+        kinds.append("foreign key change")
+    changed = [
+        name
+        for name, type_ in new.types.items()
+        if name in old.types and old.types[name] != type_
+    ]
+    if changed:
+        widened = all(_widens(old.types[n], new.types[n]) for n in changed)
+        kinds.append("type widening" if widened else "type change")
+    if not kinds:
+        kinds.append("attribute change")
+    return kinds
+
+
+class DefinitionLock:
+    """Lockfile of table definitions, keyed by qualified table name
+
+    Parameters
+    ----------
+    path : str
+        Path of the JSON lockfile, typically committed with the pipeline.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+        self._entries = self._load()
+        self._updates: Dict[str, LockEntry] = dict()
+        self._removed: Set[str] = set()
+
+    def _load(self) -> Dict[str, LockEntry]:
+        """Returns the entries of the lockfile, if any"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        if data.get("version") != self.VERSION:
+            return dict()
+        return {
+            name: LockEntry(**entry)
+            for name, entry in data.get("tables", dict()).items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def check(self, name: str, definition: str) -> Optional[List[str]]:
+        """Returns the kinds of change from the locked definition, if any
+
+        Returns None if the table is not locked or its definition matches.
+        """
+        old = self._entries.get(name)
+        if old is None:
+            return None
+        if old.hash == _hash(normalize_definition(definition)):
+            return None
+        return classify(old, LockEntry.from_definition(definition))
+
+    def update(self, name: str, definition: str) -> None:
+        """Locks the current definition of a table, written on save"""
+        digest = _hash(normalize_definition(definition))
+        old = self._entries.get(name)
+        if old is not None and old.hash == digest:
+            return
+        self._updates[name] = self._entries[name] = LockEntry.from_definition(
+            definition
+        )
+
+    def prune(self, names: Iterable[str]) -> List[str]:
+        """Removes tables other than names from the lockfile, on save
+
+        Updates only add or replace entries, as a run may check some tables
+        only, so tables deleted or renamed are removed here.
+
+        Returns
+        -------
+        List[str]
+            Names of the removed tables, sorted.
+        """
+        names = set(names)
+        removed = sorted(name for name in self._entries if name not in names)
+        for name in removed:
+            del self._entries[name]
+            self._updates.pop(name, None)
+        self._removed.update(removed)
+        return removed
+
+    def save(self) -> None:
+        """Merges updates into the lockfile on disk, written atomically
+
+        Parallel workers save their own updates, so loading, merging and
+        replacing the lockfile is done under an exclusive file lock.
+        """
+        if not self._updates and not self._removed:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with _exclusive(self.path):
+            entries = self._load()
+            entries.update(self._updates)
+            for name in self._removed:
+                entries.pop(name, None)
+            data = dict(
+                version=self.VERSION,
+                tables={
+                    name: entry._asdict()
+                    for name, entry in sorted(entries.items())
+                },
+            )
+            with tempfile.NamedTemporaryFile(
+                "w",
+                dir=directory,
+                delete=False,
+                encoding="utf-8",
+                suffix=".tmp",
+            ) as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+                f.write("\n")
+            os.replace(f.name, self.path)
+        self._entries = entries
+        self._updates = dict()
+        self._removed = set()
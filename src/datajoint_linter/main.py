@@ -1,13 +1,125 @@
-from typing import TYPE_CHECKING, Optional, Union
+import os
+import time
+import weakref
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 import astroid  # noqa: F401
 from astroid import nodes
-from datajoint.declare import foreign_key_parser, prepare_declare
-from datajoint.errors import DataJointError
 from pylint.checkers import BaseChecker
 
+from .cache import DefinitionCache
+from .graph import DependencyGraph
+from .index import TableIndex, module_name
+from .lock import DefinitionLock
+from .parser import (
+    Definition,
+    ForeignKey,
+    UnsupportedDefinition,
+    is_foreign_key,
+    parse_definition,
+    parse_foreign_keys,
+    split_definition,
+)
+from .profiling import Profiler, timed
+from .queries import (
+    FETCH_METHODS,
+    INSERT_METHODS,
+    TableExpression,
+    enclosing_class,
+    enclosing_loop,
+    make_phases,
+    table_query,
+)
+from .secondary import bad_index_types, describe, redundant_indexes
+from .symbols import PendingRef, SymbolTable
+from .width import (
+    INDEX_KEY_LIMIT,
+    ROW_SIZE_LIMIT,
+    KeyTypes,
+    TableWidth,
+    table_width,
+)
+
 if TYPE_CHECKING:
+    from datajoint.errors import DataJointError
     from pylint.lint import PyLinter
+    from pylint.reporters.ureports.nodes import Section
+    from pylint.utils import LinterStats
+
+# datajoint is imported within methods, on the first table checked. Importing
+# it loads connection, config, numpy and pandas machinery, which would slow
+# every pylint run, including those on files without tables.
+
+
+@lru_cache(maxsize=None)
+def _stub_table() -> type:
+    """Returns a query expression class that stands in for any table
+
+    Stubs satisfy dj's compile_foreign_key without declaring attributes, so
+    prepare_declare validates every line past unresolved foreign keys.
+    Attribute access and projection return the stub, covering part tables
+    and module references.
+    """
+    from datajoint.expression import QueryExpression
+
+    class StubTable(QueryExpression):
+        _support = ["`stub`"]
+        primary_key = []
+
+        def proj(self, *args, **kwargs):
+            return self
+
+        def __getattr__(self, name):
+            if name.startswith("_"):
+                raise AttributeError(name)
+            return self
+
+    return StubTable
+
+
+def _fold_str(node: nodes.NodeNG, depth: int = 0) -> Optional[str]:
+    """Returns the value of a constant string expression, without inference
+
+    Folds string literals, `+` concatenations and names assigned once to such
+    an expression, e.g., module-level constants. Returns None for anything
+    else, which is left to inference.
+    """
+    if isinstance(node, nodes.Const):
+        return node.value if isinstance(node.value, str) else None
+    if isinstance(node, nodes.BinOp) and node.op == "+":
+        left = _fold_str(node.left, depth)
+        right = _fold_str(node.right, depth) if left is not None else None
+        return None if right is None else left + right
+    if isinstance(node, nodes.Name) and depth < 8:
+        _, assigned = node.lookup(node.name)
+        if len(assigned) != 1:
+            return None
+        target = assigned[0]
+        if (
+            isinstance(target, nodes.AssignName)
+            and isinstance(target.parent, nodes.Assign)
+            and target.parent.targets == [target]
+        ):
+            return _fold_str(target.parent.value, depth + 1)
+    return None
+
+
+_DJ_TABLES = frozenset(
+    ("Manual", "Lookup", "Imported", "Computed", "Part", "Table")
+)
+
+
+_LOOP_SYMBOLS = {
+    **{method: "fetch-in-loop" for method in FETCH_METHODS},
+    **{method: "insert-in-loop" for method in INSERT_METHODS},
+}
+
+
+def _stub_context(names: List[str]) -> dict:
+    """Returns a prepare_declare context resolving names to stub tables"""
+    stub = _stub_table()()
+    return {name: stub for name in names}
 
 
 class DataJointLinter(BaseChecker):
@@ -53,9 +165,105 @@ class DataJointLinter(BaseChecker):
             "no-def",
             "Table appears to be missing a definition attribute",
         ),
+        "C0009": (
+            "`%s` err: Foreign key cycle %s",
+            "fk-cycle",
+            "Tables referencing each other can not be declared. Requires "
+            + "--dj-index-roots",
+        ),
+        "C0010": (
+            "`%s` err: Definition differs from lockfile: %s",
+            "definition-changed",
+            "Declared tables need an ALTER or repopulation to change. Update "
+            + "the lockfile with --dj-lock-update=y",
+        ),
+        "C0011": (
+            "`%s` err: Primary key is %d bytes, over the %s of %d",
+            "wide-pk",
+            "Primary keys are inherited by every referencing table and index. "
+            + "Limit set by MySQL (3072 bytes) or --dj-max-pk-bytes",
+        ),
+        "C0012": (
+            "`%s` err: Row is %d bytes, over the %s of %d",
+            "wide-row",
+            "Limit set by MySQL (65535 bytes) or --dj-max-row-bytes",
+        ),
+        "C0013": (
+            "`%s` err: %s is redundant with %s",
+            "redundant-index",
+            "MySQL uses any leftmost prefix of an index, so an index that is "
+            + "a prefix of the primary key or another index only slows writes",
+        ),
+        "C0014": (
+            "`%s` err: %s includes %s attribute %s",
+            "bad-index-type",
+            "Blob and json attributes can not be indexed. Long strings make "
+            + "wide, slow indexes. Length set by --dj-max-index-varchar",
+        ),
+        "C0015": (
+            "`%s` err: %s() in a loop (line %d) runs a query per iteration. "
+            + "Fetch once, with a restriction or join",
+            "fetch-in-loop",
+            "One query per loop iteration (N+1 queries) is slower than one "
+            + "restricted or joined fetch of all rows",
+        ),
+        "C0016": (
+            "`%s` err: %s() in a loop (line %d) inserts per iteration. "
+            + "Collect rows and insert them at once",
+            "insert-in-loop",
+            "One round trip per row is far slower than a single insert of a "
+            + "list of rows",
+        ),
+        "C0017": (
+            "`%s` err: %s.%s() fetches the whole table. Restrict or project "
+            + "it, or pass a limit",
+            "unrestricted-fetch",
+            "Fetching every row loads the table into memory. dj.Lookup tables "
+            + "are allowed, unless --dj-allow-lookup-fetch=n",
+        ),
+        "C0018": (
+            "`%s` err: make() runs %d calls between fetching (line %d) and "
+            + "inserting (line %d), in the populate transaction. Split it "
+            + "into make_fetch, make_compute and make_insert",
+            "split-make",
+            "Computing inside make holds the transaction and job reservation "
+            + "open. Threshold set by --dj-make-compute-calls",
+        ),
+    }
+
+    # Names of each message's arguments, for structured output. Integer
+    # arguments (%d) are typed, errors of DataJoint are parsed by reporters
+    MSG_FIELDS = {
+        "C0001": ("table", "error"),
+        "C0002": (),
+        "C0003": ("table",),
+        "C0004": ("table",),
+        "C0005": ("table",),
+        "C0006": ("table", "option"),
+        "C0007": ("table",),
+        "C0008": ("table",),
+        "C0009": ("table", "cycle"),
+        "C0010": ("table", "changes"),
+        "C0011": ("table", "width", "limit_name", "limit"),
+        "C0012": ("table", "width", "limit_name", "limit"),
+        "C0013": ("table", "index", "covers"),
+        "C0014": ("table", "index", "attribute_type", "attribute"),
+        "C0015": ("table", "method", "loop"),
+        "C0016": ("table", "method", "loop"),
+        "C0017": ("table", "fetched", "method"),
+        "C0018": ("table", "calls", "fetch_line", "insert_line"),
     }
 
     options = (
+        (
+            "dj-native-parser",
+            {
+                "default": True,
+                "type": "yn",
+                "metavar": "<y or n>",
+                "help": "Parse common definitions without prepare_declare",
+            },
+        ),
         (
             "permit-dj-filepath",
             {
@@ -65,6 +273,143 @@ class DataJointLinter(BaseChecker):
                 "help": "Disable check for filepath datatype",
             },
         ),
+        (
+            "dj-cache-dir",
+            {
+                "default": "",
+                "type": "string",
+                "metavar": "<path>",
+                "help": "Directory for the parsed definition cache. "
+                + "Empty disables caching.",
+            },
+        ),
+        (
+            "dj-cache-size",
+            {
+                "default": 10000,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum number of cached definitions",
+            },
+        ),
+        (
+            "dj-index-roots",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<paths>",
+                "help": "Package directories to index for resolving foreign "
+                + "keys to tables in other modules",
+            },
+        ),
+        (
+            "dj-lockfile",
+            {
+                "default": "",
+                "type": "string",
+                "metavar": "<path>",
+                "help": "Lockfile of table definitions to compare against. "
+                + "Empty disables the check.",
+            },
+        ),
+        (
+            "dj-lock-update",
+            {
+                "default": False,
+                "type": "yn",
+                "metavar": "<y or n>",
+                "help": "Write checked definitions to the lockfile instead of "
+                + "comparing",
+            },
+        ),
+        (
+            "dj-tables",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<names>",
+                "help": "Qualified names of the only tables to check, e.g. "
+                + "pkg.module.Table. Empty checks all tables",
+            },
+        ),
+        (
+            "dj-table-bases",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<names>",
+                "help": "Base classes of tables besides DataJoint's, as "
+                + "imported (e.g. pkg.base.MyTable) or named in modules",
+            },
+        ),
+        (
+            "dj-allow-lookup-fetch",
+            {
+                "default": True,
+                "type": "yn",
+                "metavar": "<y or n>",
+                "help": "Allow fetching whole dj.Lookup tables, which are "
+                + "expected to be small",
+            },
+        ),
+        (
+            "dj-make-compute-calls",
+            {
+                "default": 3,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Calls between the fetches and inserts of make() of "
+                + "computed tables to suggest splitting it. 0 disables",
+            },
+        ),
+        (
+            "dj-max-pk-bytes",
+            {
+                "default": 0,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Primary key width to report tables over, including "
+                + "inherited attributes. 0 reports only MySQL's limit",
+            },
+        ),
+        (
+            "dj-max-row-bytes",
+            {
+                "default": 0,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Row width to report tables over. 0 reports only "
+                + "MySQL's limit",
+            },
+        ),
+        (
+            "dj-max-index-varchar",
+            {
+                "default": 255,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Longest char or varchar, in characters, to allow in "
+                + "a secondary index. 0 allows any length",
+            },
+        ),
+        (
+            "dj-profile",
+            {
+                "default": False,
+                "type": "yn",
+                "metavar": "<y or n>",
+                "help": "Time the checker, shown in reports (--reports=y)",
+            },
+        ),
+        (
+            "dj-profile-top",
+            {
+                "default": 10,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Number of slowest tables to report when profiling",
+            },
+        ),
     )
 
     CHECKED_CLASSES = (
@@ -83,45 +428,685 @@ class DataJointLinter(BaseChecker):
         Attributes
         ----------
         _class_namespace : set
-            Set of table names defined in the module
+            Set of table names defined in the module, reset per module
         _module_namespace : set
             Set of module names imported in the module as alias or name
+        _imports : dict
+            Qualified names of imported objects, keyed by local name
+        _base_kinds : dict
+            Table kind of each base class seen this run, e.g. Manual, keyed
+            by qualified name. None for base classes of non-tables. Dropped
+            for a module's classes when it is visited
+        _extra_bases : frozenset
+            Configured base classes of tables, by qualified or local name
+        _key_types : dict
+            Primary key attribute types of tables in the module, keyed by
+            dotted class name. None if a reference could not be resolved
+        _symbols : SymbolTable
+            Tables of all modules checked so far, for imported references
+        _pending : List[PendingRef]
+            References imported from modules not yet checked, resolved on
+            close or, across parallel workers, on reduce_map_data
+        _cache : DefinitionCache
+            On-disk cache of prepare_declare results, if enabled
+        _index : TableIndex
+            Project-wide index of table classes, if enabled
+        _cycles : dict
+            Foreign key cycle of each indexed table in one, keyed by
+            module and table name
+        _lock : DefinitionLock
+            Lockfile of table definitions, if enabled
+        _only : frozenset
+            Qualified names of the only tables to check, if any
+        _profiler : Profiler
+            Timings of checker methods and tables, if enabled
+        _inferred : weakref.WeakKeyDictionary
+            Inferred definition strings, keyed by assigned value node
         """
         super().__init__(linter)
         self._class_namespace = set()
         self._module_namespace = set()
+        self._imports = dict()
+        self._key_types = dict()
+        self._base_kinds = dict()
+        self._extra_bases = frozenset()
+        self._symbols = SymbolTable()
+        self._pending = []
+        self._cache = None
+        self._index = None
+        self._cycles = dict()
+        self._lock = None
+        self._only = frozenset()
+        self._profiler = None
+        self._inferred = weakref.WeakKeyDictionary()
+        self.reports = (
+            ("RP9101", "DataJoint checker timings", self._report_timings),
+            ("RP9102", "Slowest DataJoint tables", self._report_tables),
+        )
+
+    def open(self) -> None:
+        """Opens the definition cache and table index, if configured
+
+        The table index is built on the first call only.
+        """
+        self._profiler = Profiler() if self.linter.config.dj_profile else None
+        self._only = frozenset(self.linter.config.dj_tables)
+        extra_bases = frozenset(self.linter.config.dj_table_bases)
+        if extra_bases != self._extra_bases:
+            self._extra_bases = extra_bases
+            self._base_kinds = dict()
+
+        roots = self.linter.config.dj_index_roots
+        if roots and self._index is None:
+            self._index = TableIndex(
+                roots, self.CHECKED_CLASSES + tuple(extra_bases)
+            )
+            self._find_cycles()
+
+        lockfile = self.linter.config.dj_lockfile
+        if lockfile and self._lock is None:
+            self._lock = DefinitionLock(lockfile)
+
+        cache_dir = self.linter.config.dj_cache_dir
+        if cache_dir and self._cache is None:
+            self._cache = DefinitionCache(
+                cache_dir,
+                max_entries=self.linter.config.dj_cache_size,
+                salt="permit_fp={},env_fp={},native={}".format(
+                    self.linter.config.permit_dj_filepath,
+                    os.getenv("DJ_SUPPORT_FILEPATH_MANAGEMENT", ""),
+                    self.linter.config.dj_native_parser,
+                ),
+            )
+
+    def refresh_index(self) -> bool:
+        """Re-indexes files modified since the index was built, if enabled
+
+        The index is built once per process, as `open` runs for every file
+        checked. Long-running servers refresh it between checks instead.
+
+        Returns
+        -------
+        bool
+            True if any indexed file changed.
+        """
+        if self._index is None or not self._index.update():
+            return False
+        self._find_cycles()
+        return True
+
+    def class_key_types(
+        self, node: nodes.ClassDef
+    ) -> Dict[str, Optional[KeyTypes]]:
+        """Returns the primary key types recorded for a table class
+
+        Servers keep these to restore with `restore_class` when the class
+        is reused without being checked again.
+        """
+        path = self._class_path(node)
+        return {
+            name: value
+            for name, value in self._key_types.items()
+            if name == path
+        }
+
+    def restore_class(
+        self, node: nodes.ClassDef, key_types: Dict[str, Optional[KeyTypes]]
+    ) -> None:
+        """Records a table class that is not checked again, and its key types
+
+        Parameters
+        ----------
+        node : nodes.ClassDef
+            Class of an earlier version of the module, unchanged since.
+        key_types : dict
+            Key types of the class when checked, from `class_key_types`.
+        """
+        if self._record_table(node) is not None:
+            self._key_types.update(key_types)
+
+    def check_module_queries(self, node: nodes.Module) -> None:
+        """Reports queries in module-level code, as on leaving a module"""
+        self._module_query_check(node)
+
+    def clear_pending(self) -> None:
+        """Drops references not yet resolved, e.g. of a document linted alone"""
+        self._pending = []
+
+    def _find_cycles(self) -> None:
+        """Records the foreign key cycles of the indexed tables"""
+        report = DependencyGraph(self._index).analyze()
+        self._cycles = {
+            table: cycle for cycle in report.cycles for table in cycle
+        }
+
+    def close(self) -> None:
+        """Resolves pending references, writes cache and updated lockfile
+
+        References into modules checked since they were seen are reported
+        if unresolved, others remain pending for reduce_map_data.
+        """
+        self._resolve_pending()
+        if self._lock is not None:
+            self._lock.save()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def visit_module(self, node: nodes.Module) -> None:
+        """Resets the namespaces, which are scoped to each module
+
+        Base kinds of the module's classes are dropped, as a module checked
+        again, e.g. by a server, may have changed its bases.
+        """
+        self._class_namespace = set()
+        self._module_namespace = set()
+        self._imports = dict()
+        self._key_types = dict()
+        prefix = f"{node.name}."
+        self._base_kinds = {
+            name: kind
+            for name, kind in self._base_kinds.items()
+            if not name.startswith(prefix)
+        }
+
+    def leave_module(self, node: nodes.Module) -> None:
+        """Checks module-level queries, records the module's tables"""
+        self._module_query_check(node)
+        imports, unknown = self._module_names(node)
+        self._symbols.add_module(node.name, node.package, imports, unknown)
+
+    def _module_names(
+        self, node: nodes.Module
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """Returns the module-level imports and other names that may be tables
+
+        Imports are qualified names keyed by local name, so that references
+        to re-exported tables are followed. Names other than tables,
+        functions and classes without bases are of unknown kind, e.g.
+        assignments or classes of bases that could not be inferred.
+        """
+        imports, unknown = dict(), []
+        for name, assigned in node.locals.items():
+            statement = assigned[-1]
+            if isinstance(statement, nodes.ImportFrom):
+                try:
+                    modname = node.relative_to_absolute_name(
+                        statement.modname, statement.level
+                    )
+                except astroid.TooManyLevelsError:
+                    modname = statement.modname
+                imports[name] = f"{modname}.{statement.real_name(name)}"
+            elif isinstance(statement, nodes.Import):
+                imports[name] = statement.real_name(name)
+            elif name in self._class_namespace or any(
+                isinstance(n, nodes.FunctionDef)
+                or (isinstance(n, nodes.ClassDef) and not n.bases)
+                for n in assigned
+            ):
+                continue
+            else:
+                unknown.append(name)
+        return imports, unknown
 
     def visit_classdef(self, node: nodes.ClassDef) -> None:
         """Captures table definitions, runs dj's prepare_declare"""
-        if node.basenames[0] not in self.CHECKED_CLASSES:
+        if self._record_table(node) is None:
             return  # Skip non-dj classes
 
+        if self._only and ".".join(self._table_key(node)) not in self._only:
+            return  # Skip tables not selected, e.g. unchanged in --diff
+
+        if self._profiler is None:
+            self._check_table(node)
+            return
+
+        start = time.perf_counter()
+        self._check_table(node)
+        self._profiler.record_table(node, time.perf_counter() - start)
+
+    def _record_table(self, node: nodes.ClassDef) -> Optional[str]:
+        """Records a table class in the namespaces, returns its kind"""
+        kind = self._table_kind(node)
+        if kind is None:
+            return None
+        self._base_kinds[node.qname()] = kind  # for subclasses
         self._class_namespace.add(node.name)
+        self._symbols.add_table(node.root().name, self._class_path(node))
+        return kind
 
+    def _check_table(self, node: nodes.ClassDef) -> None:
+        """Checks the definition and methods of a table class"""
         definition = self._get_def(node)
 
-        if not definition:
+        if definition:
+            self._prepare_declare(node, definition)
+            self._storage_check(node, definition)
+            self._cycle_check(node)
+            self._lock_check(node, definition)
+
+        self._query_check(node)
+        self._make_check(node)
+
+    @timed
+    def _query_check(self, node: nodes.ClassDef) -> None:
+        """Reports fetches of whole tables, and fetches or inserts in loops
+
+        Read from syntax only, with tables recognized by name in the module's
+        namespace, so that checking a method costs one pass over its calls.
+        """
+        for method in node.mymethods():
+            for call in method.nodes_of_class(nodes.Call):
+                self._call_check(call, node.name)
+
+    @timed
+    def _make_check(self, node: nodes.ClassDef) -> None:
+        """Suggests splitting a make that computes between fetch and insert
+
+        Applies to computed and imported tables whose make is not already
+        split into make_fetch, make_compute and make_insert.
+        """
+        threshold = self.linter.config.dj_make_compute_calls
+        make = node.locals.get("make")
+        if (
+            threshold <= 0
+            or not make
+            or not isinstance(make[0], nodes.FunctionDef)
+            or "make_fetch" in node.locals
+            or self._table_kind(node) not in ("Computed", "Imported")
+        ):
+            return
+        phases = make_phases(make[0], self._is_queried_table)
+        if phases is None or phases.compute_calls < threshold:
+            return
+        self.add_message(
+            "split-make",
+            node=make[0],
+            args=(
+                node.name,
+                phases.compute_calls,
+                phases.last_fetch.lineno,
+                phases.first_insert.lineno,
+            ),
+        )
+
+    @timed
+    def _module_query_check(self, node: nodes.Module) -> None:
+        """Reports the queries of _query_check in module-level code"""
+        for call in node.nodes_of_class(
+            nodes.Call, skip_klass=(nodes.FunctionDef, nodes.ClassDef)
+        ):
+            self._call_check(call)
+
+    def _call_check(self, call: nodes.Call, table: str = "") -> None:
+        """Reports fetches of whole tables, and fetches or inserts in loops
+
+        Parameters
+        ----------
+        call : nodes.Call
+            Any call, e.g. `(Trial & key).fetch1()`.
+        table : str, optional
+            Name of the table whose method makes the call. Defaults to the
+            table called.
+        """
+        expression = table_query(call, self._is_queried_table)
+        if expression is None:
+            return
+        func = call.func
+        symbol = _LOOP_SYMBOLS[func.attrname]
+        table = table or expression.name
+        loop = enclosing_loop(call)
+        if loop is not None:
+            self.add_message(
+                symbol, node=call, args=(table, func.attrname, loop.lineno)
+            )
+        if (
+            func.attrname == "fetch"
+            and not expression.restricted
+            and not expression.projected
+            and not any(kw.arg == "limit" for kw in call.keywords or ())
+            and expression.name.partition(".")[0] not in ("self", "cls")
+            and not self._allowed_fetch(expression)
+        ):
+            self.add_message(
+                "unrestricted-fetch",
+                node=call,
+                args=(table, expression.name, func.attrname),
+            )
+
+    def _allowed_fetch(self, expression: TableExpression) -> bool:
+        """Returns true if the table may be fetched whole, e.g. dj.Lookup"""
+        if not self.linter.config.dj_allow_lookup_fetch:
+            return False
+        return self._query_kind(expression) == "Lookup"
+
+    def _is_queried_table(self, expression: TableExpression) -> bool:
+        """Returns true if the name of a query expression is a table"""
+        return self._query_kind(expression) is not None
+
+    def _query_kind(self, expression: TableExpression) -> Optional[str]:
+        """Returns the kind of the table named in a query expression, if any
+
+        `self` and `cls` are the enclosing table when bare, followed only by
+        nested table classes, e.g. `self.Part`. Other names must be defined
+        in or imported into the module, and are inferred once per qualified
+        name, so that e.g. `np.insert` or `sys.path.insert` are not tables.
+        Imported names that can not be inferred are tables if indexed or
+        checked so far, of unknown kind (`Table`).
+        """
+        node, name = expression.node, expression.name
+        head, _, rest = name.partition(".")
+        if head in ("self", "cls"):
+            klass = enclosing_class(node)
+            for part in filter(None, rest.split(".")):
+                klass = klass and next(
+                    (
+                        local
+                        for local in klass.locals.get(part, ())
+                        if isinstance(local, nodes.ClassDef)
+                    ),
+                    None,
+                )
+            return klass and self._table_kind(klass)
+        if head not in self._imports and head not in node.root().locals:
+            return None
+        qualified = self._qualify(node, name)
+        if qualified not in self._base_kinds:
+            self._base_kinds[qualified] = self._infer_kind(
+                node, name, qualified
+            )
+        kind = self._base_kinds[qualified]
+        if kind is None and head in self._imports:
+            if self._index_check(name) or self._symbol_check(name):
+                return "Table"
+        return kind
+
+    @staticmethod
+    def _class_path(node: nodes.ClassDef) -> str:
+        """Returns the dotted class name of a table, e.g. Master.Part"""
+        names = [node.name]
+        parent = node.parent
+        while isinstance(parent, nodes.ClassDef):
+            names.insert(0, parent.name)
+            parent = parent.parent
+        return ".".join(names)
+
+    def _table_key(self, node: nodes.ClassDef) -> Tuple[str, str]:
+        """Returns the module and dotted class name of a table, as indexed"""
+        root = node.root()
+        module = module_name(root.file) if root.file else root.name
+        return module, self._class_path(node)
+
+    def _cycle_check(self, node: nodes.ClassDef) -> None:
+        """Reports an indexed table that is part of a foreign key cycle"""
+        if not self._cycles or not node.root().file:
             return
+        cycle = self._cycles.get(self._table_key(node))
+        if cycle is None:
+            return
+        self.add_message(
+            "fk-cycle",
+            node=node,
+            args=(node.name, " -> ".join(name for _, name in cycle)),
+        )
+
+    @timed
+    def _storage_check(self, node: nodes.ClassDef, definition: str) -> None:
+        """Checks the widths and secondary indexes of a valid definition
+
+        Inherited key attributes are found among earlier tables of the module
+        or, if enabled, the table index. Unresolved references add no width.
+        """
+        try:
+            parsed = parse_definition(definition)
+        except UnsupportedDefinition:
+            return  # invalid, or widths not known
+        width = table_width(parsed, lambda name: self._parent_key(node, name))
+        self._key_types[self._class_path(node)] = width.key
+        self._width_check(node, width)
+        self._secondary_index_check(node, parsed, width)
 
-        self._prepare_declare(node, definition)
+    def _width_check(self, node: nodes.ClassDef, width: TableWidth) -> None:
+        """Reports primary keys and rows wider than MySQL or configured limits"""
+        config = self.linter.config
+        for symbol, value, mysql_limit, option in (
+            ("wide-pk", width.primary_key, INDEX_KEY_LIMIT, "dj-max-pk-bytes"),
+            ("wide-row", width.row, ROW_SIZE_LIMIT, "dj-max-row-bytes"),
+        ):
+            limit = getattr(config, option.replace("-", "_"))
+            if value > mysql_limit:
+                limit, name = mysql_limit, "MySQL limit"
+            elif 0 < limit < value:
+                name = option
+            else:
+                continue
+            self.add_message(
+                symbol, node=node, args=(node.name, value, name, limit)
+            )
 
+    def _secondary_index_check(
+        self, node: nodes.ClassDef, parsed: Definition, width: TableWidth
+    ) -> None:
+        """Reports redundant indexes and indexes on blobs or long strings"""
+        if not parsed.indexes:
+            return
+        primary_key = width.key and [name for name, _ in width.key]
+        for index, covered_by in redundant_indexes(parsed, primary_key):
+            self.add_message(
+                "redundant-index",
+                node=node,
+                args=(
+                    node.name,
+                    describe(index),
+                    describe(covered_by) if covered_by else "the primary key",
+                ),
+            )
+        for index, attribute, attribute_type in bad_index_types(
+            parsed,
+            width.attributes,
+            self.linter.config.dj_max_index_varchar,
+        ):
+            self.add_message(
+                "bad-index-type",
+                node=node,
+                args=(node.name, describe(index), attribute_type, attribute),
+            )
+
+    def _parent_key(
+        self, node: nodes.ClassDef, name: str
+    ) -> Optional[KeyTypes]:
+        """Returns the primary key types of a referenced table, if known"""
+        if name == "master" and isinstance(node.parent, nodes.ClassDef):
+            name = self._class_path(node.parent)
+        if name in self._key_types:
+            return self._key_types[name]
+        if self._index is None:
+            return None
+        entry = self._index.resolve(self._table_key(node)[0], name)
+        return entry and self._index.key_types(entry)
+
+    def _lock_check(self, node: nodes.ClassDef, definition: str) -> None:
+        """Reports a definition that differs from the lockfile, or locks it"""
+        if self._lock is None:
+            return
+        name = ".".join(self._table_key(node))
+        if self.linter.config.dj_lock_update:
+            self._lock.update(name, definition)
+            return
+        kinds = self._lock.check(name, definition)
+        if kinds:
+            self.add_message(
+                "definition-changed",
+                node=node,
+                args=(node.name, ", ".join(kinds)),
+            )
+
+    def _table_kind(self, node: nodes.ClassDef) -> Optional[str]:
+        """Returns the DataJoint class a table inherits from, e.g. Manual
+
+        Bases are matched as written, then as qualified through the module's
+        imports, then against tables checked so far. Other bases are inferred
+        through their MRO, once per run for each qualified base name. Tables
+        of a configured base class, or a subclass of one, are `Table`.
+        """
+        for base, name in zip(node.bases, node.basenames):
+            if name in self.CHECKED_CLASSES:
+                return name.rpartition(".")[2]
+            qualified = self._qualify(node, name)
+            if qualified not in self._base_kinds:
+                self._base_kinds[qualified] = self._infer_kind(
+                    base, name, qualified
+                )
+            kind = self._base_kinds[qualified]
+            if kind is not None:
+                return kind
+        return None
+
+    def _qualify(self, node: nodes.ClassDef, name: str) -> str:
+        """Returns the qualified name of a base class name used in a module"""
+        head, _, rest = name.partition(".")
+        if head in self._imports:
+            return ".".join(filter(None, (self._imports[head], rest)))
+        if head in node.root().locals:
+            return f"{node.root().name}.{name}"
+        return f"builtins.{name}"
+
+    def _base_kind(self, qualified: str) -> Optional[str]:
+        """Returns the table kind of a known base class name, if any"""
+        module, _, name = qualified.rpartition(".")
+        if module.partition(".")[0] == "datajoint" and name in _DJ_TABLES:
+            return name
+        if name == "_Merge":
+            return name
+        return "Table" if qualified in self._extra_bases else None
+
+    @timed
+    def _infer_kind(
+        self, base: nodes.NodeNG, name: str, qualified: str
+    ) -> Optional[str]:
+        """Returns the table kind of a base class, inferring its MRO"""
+        if name in self._extra_bases:
+            return "Table"
+        kind = self._base_kind(qualified)
+        if kind is not None:
+            return kind
+
+        from pylint.checkers.utils import safe_infer
+
+        inferred = safe_infer(base)
+        if not isinstance(inferred, nodes.ClassDef):
+            return None
+        try:
+            mro = [inferred, *inferred.ancestors()]
+        except astroid.AstroidError:
+            return None
+        for ancestor in mro:
+            kind = self._base_kinds.get(ancestor.qname()) or self._base_kind(
+                ancestor.qname()
+            )
+            if kind is not None:
+                return kind
+        return None
+
+    @timed
     def _get_def(self, node: nodes.ClassDef) -> Union[str, None]:
-        """Gets the definition of the table from the classdef"""
-        def_attr = node.locals.get("definition")
+        """Gets the definition of the table from the classdef
+
+        Literal strings, concatenations and string constants are read from
+        the assignment. Other values are inferred once per node, and skipped
+        unless they infer to a string (e.g., functions or properties).
+        """
+        def_attr = node.locals.get("definition") or self._inherited_def(node)
 
         if not def_attr:
             self.add_message("no-def", node=node, args=node.name)
             return None
 
-        def_obj = next(node.getattr("definition")[0].assigned_stmts())
-
-        if not isinstance(def_obj, nodes.node_classes.Const):
+        if not isinstance(def_attr[0], nodes.AssignName):
             return None  # Skip complex definitions like functions
 
-        return def_obj.value
+        def_obj = next(def_attr[0].assigned_stmts())
 
-    def _prepare_declare(self, node: nodes.ClassDef, definition: str) -> None:
-        """Runs dj's prepare_declare, checks for errors"""
+        definition = _fold_str(def_obj)
+        if definition is not None:
+            return definition
+
+        if def_obj not in self._inferred:
+            from pylint.checkers.utils import safe_infer
+
+            inferred = safe_infer(def_obj)
+            self._inferred[def_obj] = (
+                inferred.value
+                if isinstance(inferred, nodes.Const)
+                and isinstance(inferred.value, str)
+                else None
+            )
+        return self._inferred[def_obj]
+
+    def _inherited_def(self, node: nodes.ClassDef) -> List[nodes.NodeNG]:
+        """Returns the definition a table inherits from a table base class"""
+        if all(name in self.CHECKED_CLASSES for name in node.basenames):
+            return []
+        try:
+            for ancestor in node.ancestors():
+                if ancestor.root().name.partition(".")[0] == "datajoint":
+                    continue
+                if "definition" in ancestor.locals:
+                    return ancestor.locals["definition"]
+        except astroid.AstroidError:
+            pass
+        return []
+
+    def _declare(
+        self, definition: str, foreign_keys: List[ForeignKey], part: bool
+    ) -> Tuple[List[str], Optional["DataJointError"], bool]:
+        """Validates all but foreign keys, returns primary key and error
+
+        Common definitions are handled by the native parser. Others are run
+        through dj's prepare_declare, with each foreign key resolved to a stub
+        table. Foreign keys are checked separately, by _fk_check.
+
+        Parameters
+        ----------
+        definition : str
+            DataJoint table definition string
+        foreign_keys : List[ForeignKey]
+            Well-formed foreign keys of the definition
+        part : bool
+            True if the table is a part table, which may reference master
+
+        Returns
+        -------
+        Tuple[List[str], Optional[DataJointError], bool]
+            Primary key, error if any, and whether the result depends only on
+            the definition, so that it may be cached.
+        """
+        if self.linter.config.dj_native_parser:
+            try:
+                return parse_definition(definition).primary_key, None, True
+            except UnsupportedDefinition:
+                pass  # fall back to prepare_declare
+
+        from datajoint.declare import prepare_declare
+        from datajoint.errors import DataJointError
+
+        # Options were checked by _fk_check, drop them so dj does not raise
+        stubbed = {fk.line: "->" + fk.ref for fk in foreign_keys}
+        lines = split_definition(definition)
+        definition = "\n".join(stubbed.get(line, line) for line in lines)
+
+        # Unparsed fk lines are resolved against the namespace, so their
+        # result is not cacheable
+        cacheable = all(
+            line in stubbed for line in lines if is_foreign_key(line)
+        )
+        context = _stub_context(
+            [fk.name.split(".")[0] for fk in foreign_keys]
+            + list(self._class_namespace)
+            + list(self._module_namespace)
+            + list(self._imports)
+            + (["master"] if part else [])
+        )
         try:
             (
                 _,
@@ -130,12 +1115,54 @@ class DataJointLinter(BaseChecker):
                 _,
                 _,
                 _,
-            ) = prepare_declare(definition, context={})
-            # TODO: Refactor to include context, dynamic analysis
-        except DataJointError as error:
-            if self._fk_check(node, error, definition):
-                return
+            ) = prepare_declare(definition, context=context)
+            error = None
+        except DataJointError as err:
+            primary_key, error = [], err
+        return primary_key, error, cacheable
+
+    @timed
+    def _prepare_declare(self, node: nodes.ClassDef, definition: str) -> None:
+        """Checks foreign keys, then the rest of the definition
+
+        The parsed foreign keys and the result of _declare are read from and
+        stored to the definition cache, if enabled.
+        """
+        key = cached = None
+        if self._cache is not None:
+            key = self._cache.key(definition)
+            cached = self._cache.get(key)
+
+        if cached is None:
+            foreign_keys = parse_foreign_keys(definition)
+        else:
+            foreign_keys = [
+                ForeignKey(ref, tuple(options), in_key, line)
+                for ref, options, in_key, line in cached["foreign_keys"]
+            ]
+        part = self._table_kind(node) == "Part"
+        self._fk_check(node, foreign_keys, part)
+
+        if cached is not None and "primary_key" in cached:
+            primary_key, error = cached["primary_key"], cached["error"]
+            if error is not None:
+                from datajoint.errors import DataJointError
+
+                error = DataJointError(*error)
+        else:
+            primary_key, error, cacheable = self._declare(
+                definition, foreign_keys, part
+            )
+            if key:
+                entry = dict(foreign_keys=[list(fk) for fk in foreign_keys])
+                if cacheable:
+                    entry.update(
+                        primary_key=primary_key,
+                        error=list(error.args) if error else None,
+                    )
+                self._cache.set(key, entry)
 
+        if error is not None:
             if "filepath data" in error.args[0]:
                 if not self.linter.config.permit_dj_filepath:
                     self.add_message("no-fp", node=node, args=node.name)
@@ -144,88 +1171,318 @@ class DataJointLinter(BaseChecker):
             self.add_message(
                 "definition-error", node=node, args=(node.name, error)
             )
-        else:
-            if not primary_key:
-                self.add_message("no-pk", node=node, args=node.name)
+        elif not primary_key and not any(fk.in_key for fk in foreign_keys):
+            self.add_message("no-pk", node=node, args=node.name)
 
-    def _get_fk_from_err(self, error):
-        return (
-            error.args[0]
-            .split("reference ")[1]  # After reference
-            .split("]")[-1]  # after options
-            .split(" could ")[0]  # Before could
-            .split(".proj")[0]  # Before any projections
-            .strip()  # remove spaces
-        )
+    @timed
+    def _fk_check(
+        self, node: nodes.ClassDef, foreign_keys: List[ForeignKey], part: bool
+    ) -> None:
+        """Checks all foreign keys of a table in one pass
 
-    def _fk_check(self, node: nodes.ClassDef, error: str, definition: str):
-        """Checks foreign key errors
-
-        Without passing context to prepare_declare, it will raise fk reference
-        error false positives. This runs checks performed after the fk error in
-        prepare_declare, and then checks our sets for valid references.
+        Runs the checks of dj's compile_foreign_key on every reference, then
+        resolves each against the project index or our namespace sets. Each
+        unresolved reference is reported with dj's error message.
 
         Parameters
         ----------
         node : nodes.ClassDef
             The classdef node of the table
-        error : str
-            The error message from the DataJointError raised by prepare_declare
-        definition : str
-            DataJoint table definition string
+        foreign_keys : List[ForeignKey]
+            Well-formed foreign keys of the table definition
+        part : bool
+            True if the table is a part table, which may reference master
         """
-        # TODO: PR to DJ to refactor subsets into private methods this can use?
-        if not error.args[0].startswith("Foreign"):
-            return False  # return if not fk error
+        refs = [fk.ref.strip() for fk in foreign_keys]
+        if len(set(refs)) != len(refs):  # check for multiple references
+            self.add_message("mult-fk-ref", node=node, args=node.name)
 
-        fk = self._get_fk_from_err(error)
-        in_pk = fk in definition.split("---")[0].split("___")[0]
-        fk_pad = f" {fk}"  # avoid mult ref where one table substring of another
-        fk_ref = [line for line in definition.split("\n") if fk_pad in line]
+        for fk in foreign_keys:
+            for opt in fk.options:  # check for invalid options
+                if opt not in {"NULLABLE", "UNIQUE"}:
+                    self.add_message(
+                        "bad-opt", node=node, args=(node.name, opt)
+                    )
+                elif opt == "NULLABLE" and fk.in_key:
+                    self.add_message("null-pk-ref", node=node, args=node.name)
 
-        if len(fk_ref) != 1:  # check for multiple references
-            self.add_message("mult-fk-ref", node=node, args=node.name)
+            resolved = self._resolves(fk.name.strip(), part)
+            if resolved is None:
+                self._defer(node, fk)
+            elif not resolved:
+                self.add_message(
+                    "definition-error",
+                    node=node,
+                    args=(node.name, self._unresolved_error(fk.ref)),
+                )
 
-        options = [
-            opt.upper()
-            for opt in foreign_key_parser.parseString(fk_ref[0]).options
-        ]
+    @staticmethod
+    def _unresolved_error(ref: str) -> "DataJointError":
+        """Returns dj's error for a foreign key that could not be resolved"""
+        from datajoint.errors import DataJointError
 
-        for opt in options:  # check for invalid options
-            if opt not in {"NULLABLE", "UNIQUE"}:
-                self.add_message("bad-opt", node=node, args=(node.name, opt))
-            elif opt == "NULLABLE" and in_pk:
-                self.add_message("null-pk-ref", node=node, args=node.name)
+        return DataJointError(
+            "Foreign key reference %s could not be resolved" % ref
+        )
 
-        if (
-            (node.basenames[0] == "dj.Part" and fk == "master")  # master ref
-            or fk in self._class_namespace  # Table imported or in schema
-            or fk.split(".")[0] in self._module_namespace  # module imported
-        ):
+    def _defer(self, node: nodes.ClassDef, fk: ForeignKey) -> None:
+        """Records a reference into a module not yet checked
+
+        Pragmas are read now, as the module's file state is gone by the time
+        the reference is reported.
+        """
+        head, _, rest = fk.name.strip().partition(".")
+        position = node.position or node
+        self._pending.append(
+            PendingRef(
+                module=node.root().name,
+                path=node.root().file,
+                table=node.name,
+                ref=fk.ref,
+                qualified=".".join(filter(None, (self._imports[head], rest))),
+                line=position.lineno,
+                col_offset=position.col_offset,
+                end_lineno=position.end_lineno,
+                end_col_offset=position.end_col_offset,
+                enabled=self.linter.is_message_enabled(
+                    "definition-error", node.fromlineno
+                ),
+            )
+        )
+
+    def _resolve_pending(self) -> None:
+        """Reports pending references whose module has since been checked"""
+        pending = []
+        for ref in self._pending:
+            found = self._symbols.find(ref.qualified)
+            if found is None:
+                pending.append(ref)
+            elif not found and ref.enabled:
+                self._add_pending_message(ref)
+        self._pending = pending
+
+    def _add_pending_message(self, ref: PendingRef) -> None:
+        """Reports an unresolved reference, outside of its module's check
+
+        The class node is rebuilt from the recorded location, as the
+        module's tree may be gone, e.g., in another worker. Pragmas of the
+        file checked last do not apply, those of the module were read on
+        deferral.
+        """
+        node = nodes.ClassDef(
+            ref.table,
+            lineno=ref.line,
+            col_offset=ref.col_offset,
+            parent=nodes.Module(ref.module, file=ref.path),
+            end_lineno=ref.end_lineno,
+            end_col_offset=ref.end_col_offset,
+        )
+        from pylint.utils.file_state import FileState
+
+        linter = self.linter
+        current, file_state = linter.current_name, linter.file_state
+        linter.current_name = ref.module  # for per-module message counts
+        linter.file_state = FileState(ref.module, linter.msgs_store)
+        if ref.module not in linter.stats.by_module:
+            linter.stats.init_single_module(ref.module)
+        try:
+            self.add_message(
+                "definition-error",
+                node=node,
+                args=(ref.table, self._unresolved_error(ref.ref)),
+            )
+        finally:
+            linter.current_name, linter.file_state = current, file_state
+
+    def _resolves(self, name: str, part: bool) -> Optional[bool]:
+        """Returns true if a referenced name is a known table
+
+        Returns None for names imported from modules not yet checked, which
+        are resolved once the module is checked or at the end of the run.
+        """
+        if part and name == "master":  # master ref
             return True
 
-        return False
+        indexed = self._index_check(name)
+        if indexed is not None:  # imported from indexed module
+            return indexed
+
+        known = self._symbol_check(name)
+        if known is not None:  # imported from module checked this run
+            return known
+        if name.partition(".")[0] in self._imports:  # checked later, or never
+            return None
+
+        return (
+            name in self._class_namespace  # Table imported or in schema
+            or name.split(".")[0] in self._module_namespace  # module imported
+        )
+
+    def _index_check(self, fk: str) -> Optional[bool]:
+        """Checks an imported fk reference against the project table index
+
+        Returns None if the index is disabled, or if the reference is not
+        imported from an indexed module. Otherwise, returns whether the
+        referenced table exists.
+        """
+        head, _, rest = fk.partition(".")
+        if self._index is None or head not in self._imports:
+            return None
+        module, name = self._index.locate(
+            ".".join(filter(None, (self._imports[head], rest)))
+        )
+        if module is None:
+            return None
+        return self._index.get(module, name) is not None
+
+    def _symbol_check(self, fk: str) -> Optional[bool]:
+        """Checks an imported fk reference against tables checked this run
+
+        Returns None if the reference is not imported from a module checked
+        so far. Otherwise, returns whether the referenced table exists.
+        """
+        head, _, rest = fk.partition(".")
+        if head not in self._imports:
+            return None
+        return self._symbols.find(
+            ".".join(filter(None, (self._imports[head], rest)))
+        )
 
+    @timed
     def visit_import(self, node):
         """Captures module import statements, retains for fk check"""
         for names in node.names:
             self._module_namespace.add(names[1] or names[0])
+            local = names[1] or names[0].split(".")[0]
+            self._imports[local] = names[1] and names[0] or local
 
+    @timed
     def visit_importfrom(self, node):
         """Captures table names from import statements, retains for fk check"""
+        try:
+            modname = node.root().relative_to_absolute_name(
+                node.modname, node.level
+            )
+        except astroid.TooManyLevelsError:
+            modname = node.modname
         for names in node.names:
             if names[0] == "*":
                 self.add_message("dj-wildcard-import", node=node)
                 return
             self._class_namespace.add(names[1] or names[0])
+            self._imports[names[1] or names[0]] = f"{modname}.{names[0]}"
+
+    def get_map_data(self) -> dict:
+        """Returns data of a parallel worker since the last call
+
+        Includes new tables and checked modules, pending references and, if
+        profiling, timings.
+        """
+        tables, modules = self._symbols.drain()
+        pending, self._pending = self._pending, []
+        return dict(
+            tables=tables,
+            modules=modules,
+            pending=pending,
+            profile=self._profiler.data() if self._profiler else None,
+        )
+
+    def reduce_map_data(self, linter: "PyLinter", data: List[dict]) -> None:
+        """Merges data of parallel workers, reports unresolved references
+
+        References pending in one worker are resolved against the tables
+        of all workers, so results do not depend on file scheduling.
+        """
+        profiler = None  # timings of this process are in its own data
+        for worker_data in data:
+            self._symbols.merge(worker_data["tables"], worker_data["modules"])
+            self._pending.extend(worker_data["pending"])
+            if worker_data["profile"] is not None:
+                profiler = profiler or Profiler()
+                profiler.merge(worker_data["profile"])
+        if profiler is not None:
+            self._profiler = profiler
+        self._resolve_pending()
+
+    def _report_timings(
+        self,
+        sect: "Section",
+        stats: "LinterStats",
+        old_stats: Optional["LinterStats"],
+    ) -> None:
+        """Reports cumulative and per-call timings of checker methods"""
+        from pylint.exceptions import EmptyReportError
+        from pylint.reporters.ureports.nodes import Paragraph, Table, Text
+
+        profiler = self._profiler
+        if profiler is None or not (profiler.methods or profiler.tables):
+            raise EmptyReportError()
+
+        total = sum(timing.seconds for timing in profiler.tables) + sum(
+            profiler.methods.get(visit, (0, 0.0, 0.0))[1]
+            for visit in ("visit_import", "visit_importfrom")
+        )
+        sect.append(
+            Paragraph(
+                [
+                    Text(
+                        f"{len(profiler.tables)} tables checked, "
+                        + f"{total:.3f}s in the DataJoint checker\n"
+                    )
+                ]
+            )
+        )
+        lines = ["method", "calls", "total (s)", "mean (ms)", "max (ms)"]
+        for method, (calls, seconds, longest) in sorted(
+            profiler.methods.items(), key=lambda item: -item[1][1]
+        ):
+            lines += [
+                method,
+                str(calls),
+                f"{seconds:.3f}",
+                f"{1000 * seconds / calls:.3f}",
+                f"{1000 * longest:.3f}",
+            ]
+        sect.append(Table(children=lines, cols=5, rheaders=1))
+
+    def _report_tables(
+        self,
+        sect: "Section",
+        stats: "LinterStats",
+        old_stats: Optional["LinterStats"],
+    ) -> None:
+        """Reports the slowest tables to check"""
+        from pylint.exceptions import EmptyReportError
+        from pylint.reporters.ureports.nodes import Table
+
+        if self._profiler is None or not self._profiler.tables:
+            raise EmptyReportError()
+
+        lines = ["table", "module", "line", "time (ms)"]
+        for timing in self._profiler.slowest(self.linter.config.dj_profile_top):
+            lines += [
+                timing.name,
+                timing.module,
+                str(timing.line),
+                f"{1000 * timing.seconds:.3f}",
+            ]
+        sect.append(Table(children=lines, cols=4, rheaders=1))
 
 
 def register(linter: "PyLinter") -> None:
     """This required method auto registers the checker during initialization.
 
+    Parallel workers call this again on their copy of the linter, which
+    already holds a checker if the plugin was given by `--load-plugins`.
+
     Parameters
     ----------
     linter
         The linter to register the checker to.
     """
-    linter.register_checker(DataJointLinter(linter))
+    from .reporters import NDJSONReporter, SARIFReporter
+
+    if not linter._checkers.get(DataJointLinter.name):
+        linter.register_checker(DataJointLinter(linter))
+    linter.register_reporter(NDJSONReporter)
+    linter.register_reporter(SARIFReporter)
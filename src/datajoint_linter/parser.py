@@ -0,0 +1,274 @@
+"""Native parser for DataJoint table definitions
+
+Covers the common definition grammar (attribute lines, `---` dividers, `->`
+references with options, indexes and comments) without pyparsing or the
+`datajoint.declare` stack. Definitions that are invalid or use rare constructs
+raise `UnsupportedDefinition`, signaling the caller to fall back to
+DataJoint's `prepare_declare` for the authoritative result.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+# Vendored from datajoint.declare, v0.14.1
+TYPE_PATTERN = {
+    k: re.compile(v, re.I)
+    for k, v in dict(
+        INTEGER=r"((tiny|small|medium|big|)int|integer)(\s*\(.+\))?"
+        + r"(\s+unsigned)?(\s+auto_increment)?|serial$",
+        DECIMAL=r"(decimal|numeric)(\s*\(.+\))?(\s+unsigned)?$",
+        FLOAT=r"(double|float|real)(\s*\(.+\))?(\s+unsigned)?$",
+        STRING=r"(var)?char\s*\(.+\)$",
+        JSON=r"json$",
+        ENUM=r"enum\s*\(.+\)$",
+        BOOL=r"bool(ean)?$",
+        TEMPORAL=r"(date|datetime|time|timestamp|year)(\s*\(.+\))?$",
+        INTERNAL_BLOB=r"(tiny|small|medium|long|)blob$",
+        EXTERNAL_BLOB=r"blob@(?P<store>[a-z][\-\w]*)$",
+        INTERNAL_ATTACH=r"attach$",
+        EXTERNAL_ATTACH=r"attach@(?P<store>[a-z][\-\w]*)$",
+        FILEPATH=r"filepath@(?P<store>[a-z][\-\w]*)$",
+        UUID=r"uuid$",
+        ADAPTED=r"<.+>$",
+    ).items()
+}
+SERIALIZED_TYPES = {
+    "EXTERNAL_ATTACH",
+    "INTERNAL_ATTACH",
+    "EXTERNAL_BLOB",
+    "INTERNAL_BLOB",
+}
+UNSUPPORTED_TYPES = {"FILEPATH", "ADAPTED"}  # depend on env or context
+
+_QUOTED = r"\"[^\"]*\"|'[^']*'"
+_ATTRIBUTE = re.compile(
+    rf"""^(?P<name>[a-z][a-z0-9_]*)\s*
+    (?:=\s*(?P<default>(?:{_QUOTED}|[^:"'])*?))?\s*
+    :\s*(?P<type>[a-zA-Z](?:{_QUOTED}|[^\#"'])*?)\s*
+    (?:\#(?P<comment>.*))?$""",
+    re.X,
+)
+_FOREIGN_KEY = re.compile(
+    r"^->(?:\s*\[(?P<options>[^\]]*)\]|\s*)(?P<ref>[^\[\]]*)$"
+)
+_CODE = re.compile(rf"^(?:{_QUOTED}|[^#\"'])*")  # before a trailing comment
+_OPTIONS = re.compile(r"^\s*[a-zA-Z]+(\s*,\s*[a-zA-Z]+)*\s*$")
+_REF = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*(\.proj\(.*\))?$")
+_INDEX_LINE = re.compile(r"^(unique\s+)?index\s*.*$", re.I)
+_INDEX = re.compile(
+    r"^(?P<unique>unique\s+)?index\s*\(\s*(?P<args>.*)\)$", re.I
+)
+_IDENTIFIER = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+class UnsupportedDefinition(ValueError):
+    """Definition requires DataJoint's prepare_declare"""
+
+
+class Attribute(NamedTuple):
+    name: str
+    type: str
+    default: str
+    comment: str
+    in_key: bool
+    line: str
+
+    @property
+    def nullable(self) -> bool:
+        return self.default.lower() == "null"
+
+    @property
+    def category(self) -> str:
+        return match_type(self.type)
+
+
+class ForeignKey(NamedTuple):
+    ref: str  # raw text after `->` and options, as parsed by datajoint
+    options: Tuple[str, ...]
+    in_key: bool
+    line: str
+
+    @property
+    def name(self) -> str:
+        """Referenced object name, without projections"""
+        return self.ref.strip().split(".proj")[0]
+
+
+class Index(NamedTuple):
+    attributes: Tuple[str, ...]
+    unique: bool
+    line: str
+
+
+class Definition(NamedTuple):
+    comment: str
+    attributes: List[Attribute]
+    foreign_keys: List[ForeignKey]
+    indexes: List[Index]
+    lines: Tuple[str, ...]
+
+    @property
+    def primary_key(self) -> List[str]:
+        """Primary key attributes declared directly, excluding inherited"""
+        return list(
+            dict.fromkeys(attr.name for attr in self.attributes if attr.in_key)
+        )
+
+
+def match_type(attribute_type: str) -> str:
+    """Returns the TYPE_PATTERN category of the type, or raises"""
+    for category, pattern in TYPE_PATTERN.items():
+        if pattern.match(attribute_type):
+            return category
+    raise UnsupportedDefinition(f"Unsupported attribute type {attribute_type}")
+
+
+def strip_comment(line: str) -> str:
+    """Returns a definition line without its trailing comment"""
+    return _CODE.match(line).group().rstrip()
+
+
+def is_foreign_key(line: str) -> bool:
+    """Returns true if the line appears to be a foreign key definition"""
+    arrow_position = line.find("->")
+    return arrow_position >= 0 and not any(
+        c in line[:arrow_position] for c in "\"#'"
+    )
+
+
+@lru_cache(maxsize=4096)
+def parse_foreign_key(line: str, in_key: bool = True) -> ForeignKey:
+    """Parses a `->` line into reference, options
+
+    A trailing comment is not part of the reference, as DataJoint evaluates
+    the reference as Python. Results are memoized by stripped line, as the
+    same references (e.g., `-> Session`) recur across many tables.
+    """
+    match = _FOREIGN_KEY.match(strip_comment(line))
+    if not match:
+        raise UnsupportedDefinition(f"Parsing error in line {line}")
+    options = match.group("options")
+    if options is not None and not _OPTIONS.match(options):
+        raise UnsupportedDefinition(f"Parsing error in line {line}")
+    ref = match.group("ref")
+    if not _REF.match(ref.strip()):
+        raise UnsupportedDefinition(f"Unsupported reference {ref}")
+    return ForeignKey(
+        ref=ref,
+        options=tuple(
+            opt.strip().upper() for opt in (options or "").split(",") if opt
+        ),
+        in_key=in_key,
+        line=line,
+    )
+
+
+def parse_index(line: str) -> Index:
+    """Parses an index line into attribute names"""
+    match = _INDEX.match(line)
+    if not match:
+        raise UnsupportedDefinition(f"Index error in line {line}")
+    attributes = tuple(
+        attr.strip()
+        for attr in re.findall(r"(?:[^,(]|\([^)]*\))+", match.group("args"))
+    )
+    if not all(_IDENTIFIER.match(attr) for attr in attributes):
+        raise UnsupportedDefinition(f"Unsupported index in line {line}")
+    return Index(attributes, bool(match.group("unique")), line)
+
+
+def parse_attribute(line: str, in_key: bool = True) -> Attribute:
+    """Parses and validates an attribute line"""
+    match = _ATTRIBUTE.match(line)
+    if not match:
+        raise UnsupportedDefinition(f"Declaration error in line {line}")
+    attribute = Attribute(
+        name=match.group("name"),
+        type=match.group("type").strip(),
+        default=(match.group("default") or "").strip(),
+        comment=(match.group("comment") or "").rstrip("#").strip(),
+        in_key=in_key,
+        line=line,
+    )
+    if attribute.nullable and in_key:
+        raise UnsupportedDefinition(f"Nullable primary key in line {line}")
+    if attribute.comment.startswith(":"):
+        raise UnsupportedDefinition(f"Comment starts with colon in {line}")
+    category = attribute.category
+    if category in UNSUPPORTED_TYPES:
+        raise UnsupportedDefinition(f"Unsupported type in line {line}")
+    if (
+        category in SERIALIZED_TYPES
+        and attribute.default
+        and not attribute.nullable
+    ):
+        raise UnsupportedDefinition(f"Blob default in line {line}")
+    return attribute
+
+
+@lru_cache(maxsize=256)
+def split_definition(definition: str) -> Tuple[str, ...]:
+    """Splits a definition into stripped lines, as in prepare_declare
+
+    Memoized, so that the passes over a definition share one split.
+    """
+    return tuple(re.split(r"\s*\n\s*", definition.strip()))
+
+
+def parse_foreign_keys(definition: str) -> List[ForeignKey]:
+    """Parses every well-formed `->` line of a definition
+
+    Unlike parse_definition, other lines are not validated, and malformed
+    or unsupported foreign key lines are skipped.
+    """
+    in_key, foreign_keys = True, []
+    for line in split_definition(definition):
+        if line.startswith("---") or line.startswith("___"):
+            in_key = False
+        elif not line.startswith("#") and is_foreign_key(line):
+            try:
+                foreign_keys.append(parse_foreign_key(line, in_key))
+            except UnsupportedDefinition:
+                pass
+    return foreign_keys
+
+
+def parse_definition(definition: str) -> Definition:
+    """Parses a table definition string
+
+    Parameters
+    ----------
+    definition : str
+        DataJoint table definition string
+
+    Returns
+    -------
+    Definition
+        Parsed table comment, attributes, foreign keys and indexes
+
+    Raises
+    ------
+    UnsupportedDefinition
+        If the definition is invalid or uses constructs not covered here.
+    """
+    lines = split_definition(definition)
+    comment = lines[0][1:].strip() if lines[0].startswith("#") else ""
+    if comment.startswith(":"):
+        raise UnsupportedDefinition("Table comment must not start with colon")
+
+    in_key = True
+    attributes, foreign_keys, indexes = [], [], []
+    for line in lines[1:] if lines[0].startswith("#") else lines:
+        if not line or line.startswith("#"):
+            continue
+        elif line.startswith("---") or line.startswith("___"):
+            in_key = False
+        elif is_foreign_key(line):
+            foreign_keys.append(parse_foreign_key(line, in_key))
+        elif _INDEX_LINE.match(line):
+            indexes.append(parse_index(line))
+        else:
+            attributes.append(parse_attribute(line, in_key))
+
+    return Definition(comment, attributes, foreign_keys, indexes, lines)
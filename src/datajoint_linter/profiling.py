@@ -0,0 +1,83 @@
+"""Opt-in timing of the DataJoint checker, reported at the end of a run"""
+
+import heapq
+import time
+from functools import wraps
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from astroid import nodes
+
+
+class TableTiming(NamedTuple):
+    seconds: float
+    module: str
+    name: str
+    line: int
+
+
+class Profiler:
+    """Cumulative and per-call timings of checker methods, and of tables.
+
+    Method timings are kept as (calls, total, max) so that memory does not
+    grow with the number of calls. Table timings are kept individually, to
+    list the slowest ones.
+    """
+
+    def __init__(self) -> None:
+        self.methods: Dict[str, Tuple[int, float, float]] = dict()
+        self.tables: List[TableTiming] = []
+
+    def record(self, method: str, seconds: float) -> None:
+        """Adds one call of a method"""
+        calls, total, longest = self.methods.get(method, (0, 0.0, 0.0))
+        self.methods[method] = (
+            calls + 1,
+            total + seconds,
+            max(longest, seconds),
+        )
+
+    def record_table(self, node: nodes.ClassDef, seconds: float) -> None:
+        """Adds the time taken to check a table class"""
+        self.tables.append(
+            TableTiming(seconds, node.root().name, node.name, node.lineno)
+        )
+
+    def slowest(self, count: int) -> List[TableTiming]:
+        """Returns the count slowest tables, slowest first"""
+        return heapq.nlargest(count, self.tables)
+
+    def data(self) -> dict:
+        """Returns timings as plain data, for merging across processes"""
+        return dict(methods=self.methods, tables=self.tables)
+
+    def merge(self, data: dict) -> None:
+        """Adds timings returned by another profiler's `data`"""
+        for method, (calls, total, longest) in data["methods"].items():
+            previous = self.methods.get(method, (0, 0.0, 0.0))
+            self.methods[method] = (
+                previous[0] + calls,
+                previous[1] + total,
+                max(previous[2], longest),
+            )
+        self.tables.extend(TableTiming(*timing) for timing in data["tables"])
+
+
+def timed(method):
+    """Decorates a checker method to record its timing, if profiling
+
+    The checker's `_profiler` attribute is a Profiler, or None when disabled.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler: Optional[Profiler] = self._profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profiler.record(name, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,196 @@
+"""Recognition of DataJoint queries in method bodies, without inference
+
+Query expressions are read from their syntax: a table name, optionally
+instantiated, restricted (`&`, `-`, `.restrict`), joined (`*`) or projected
+(`.proj`, `.aggr`). Whether the name is a table is left to the caller, who
+knows the module's namespace and tables.
+"""
+
+import builtins
+from typing import Callable, NamedTuple, Optional
+
+from astroid import nodes
+
+FETCH_METHODS = frozenset(("fetch", "fetch1"))
+INSERT_METHODS = frozenset(("insert", "insert1"))
+_BUILTINS = frozenset(dir(builtins))
+_LIGHT_METHODS = frozenset(  # of dicts, lists, sets and strings
+    (
+        "append",
+        "extend",
+        "update",
+        "copy",
+        "get",
+        "items",
+        "keys",
+        "values",
+        "pop",
+        "add",
+        "format",
+        "join",
+        "split",
+        "strip",
+    )
+)
+_SCOPES = (nodes.FunctionDef, nodes.ClassDef, nodes.Lambda)
+_LOOPS = (nodes.For, nodes.While)
+_COMPREHENSIONS = (
+    nodes.ListComp,
+    nodes.SetComp,
+    nodes.DictComp,
+    nodes.GeneratorExp,
+)
+
+
+class TableExpression(NamedTuple):
+    name: str  # dotted name of the leftmost table, e.g. Session or self.Part
+    restricted: bool  # restricted by `&`, `-` or `.restrict()`
+    projected: bool  # projected by `.proj()`
+    node: nodes.NodeNG  # Name or Attribute node of the table
+
+
+def _dotted(node: nodes.NodeNG) -> Optional[str]:
+    """Returns the dotted name of a Name/Attribute chain, or None"""
+    if isinstance(node, nodes.Name):
+        return node.name
+    if isinstance(node, nodes.Attribute):
+        value = _dotted(node.expr)
+        return value and f"{value}.{node.attrname}"
+    return None
+
+
+def table_expression(node: nodes.NodeNG) -> Optional[TableExpression]:
+    """Returns the table and restriction of a query expression, if it is one
+
+    Returns None for anything but names, instances, restrictions, joins and
+    projections of names.
+    """
+    restricted = projected = False
+    while True:
+        if isinstance(node, nodes.BinOp) and node.op in ("&", "-"):
+            restricted = True
+            node = node.left
+        elif isinstance(node, nodes.BinOp) and node.op == "*":
+            right = table_expression(node.right)
+            restricted = restricted or bool(right and right.restricted)
+            node = node.left
+        elif isinstance(node, nodes.Call) and isinstance(
+            node.func, nodes.Attribute
+        ):
+            method = node.func.attrname
+            if method not in ("proj", "restrict", "aggr", "join"):
+                return None
+            restricted = restricted or method == "restrict"
+            projected = projected or method == "proj"
+            node = node.func.expr
+        elif isinstance(node, nodes.Call) and not node.args:
+            node = node.func  # instance, e.g. Session()
+        else:
+            name = _dotted(node)
+            return name and TableExpression(name, restricted, projected, node)
+
+
+def enclosing_class(node: nodes.NodeNG) -> Optional[nodes.ClassDef]:
+    """Returns the innermost class whose body or methods contain node"""
+    scope = node.scope()
+    while scope is not None and not isinstance(scope, nodes.ClassDef):
+        scope = scope.parent and scope.parent.scope()
+    return scope
+
+
+def table_query(
+    call: nodes.Call, is_table: Callable[[TableExpression], bool]
+) -> Optional[TableExpression]:
+    """Returns the table expression fetched or inserted into by a call
+
+    Returns None for calls other than fetch, fetch1, insert and insert1 of
+    an expression whose name is a table, as decided by is_table.
+    """
+    func = call.func
+    if not isinstance(func, nodes.Attribute) or func.attrname not in (
+        FETCH_METHODS | INSERT_METHODS
+    ):
+        return None
+    expression = table_expression(func.expr)
+    if expression is None or not is_table(expression):
+        return None
+    return expression
+
+
+def enclosing_loop(node: nodes.NodeNG) -> Optional[nodes.NodeNG]:
+    """Returns the innermost loop that runs node once per iteration
+
+    Loops are `for` and `while` statements and comprehensions within the same
+    function. The iterable of a `for` loop or of the first generator of a
+    comprehension is evaluated once, and is not in the loop.
+    """
+    child, parent = node, node.parent
+    while parent is not None and not isinstance(
+        parent, (nodes.FunctionDef, nodes.Lambda, nodes.ClassDef, nodes.Module)
+    ):
+        if isinstance(parent, _LOOPS):
+            if not (isinstance(parent, nodes.For) and child is parent.iter):
+                if child not in parent.orelse:
+                    return parent
+        elif isinstance(parent, _COMPREHENSIONS):
+            if child is not parent.generators[0]:
+                return parent
+        elif isinstance(parent, nodes.Comprehension):
+            if child is not parent.iter:  # conditions, nested iterables
+                return parent.parent
+        child, parent = parent, parent.parent
+    return None
+
+
+class MakePhases(NamedTuple):
+    last_fetch: nodes.NodeNG  # last statement fetching, before inserts
+    first_insert: nodes.NodeNG  # first statement inserting
+    compute_calls: int  # calls other than queries and builtins between them
+
+
+def _is_light(call: nodes.Call) -> bool:
+    """Returns true for calls of builtins and methods of builtin containers"""
+    func = call.func
+    if isinstance(func, nodes.Name):
+        return func.name in _BUILTINS and func.name not in call.root().locals
+    return isinstance(func, nodes.Attribute) and func.attrname in _LIGHT_METHODS
+
+
+def make_phases(
+    function: nodes.FunctionDef, is_table: Callable[[TableExpression], bool]
+) -> Optional[MakePhases]:
+    """Splits a make method into fetch, compute and insert statements
+
+    Statements of the body are read in order, with queries recognized as by
+    `table_query`. Returns None unless the fetches all come before or within
+    the first insert statement, with at least one statement between the last
+    fetch and it.
+    """
+    fetches, inserts, calls = [], [], []
+    for position, statement in enumerate(function.body):
+        statement_calls = list(
+            statement.nodes_of_class(nodes.Call, skip_klass=_SCOPES)
+        )
+        methods = set()
+        for call in statement_calls:
+            if table_query(call, is_table) is not None:
+                methods.add(call.func.attrname)
+        if methods & FETCH_METHODS:
+            fetches.append(position)
+        if methods & INSERT_METHODS:
+            inserts.append(position)
+        calls.append(statement_calls)
+    if not inserts or not fetches or fetches[-1] > inserts[0]:
+        return None
+    last_fetch = max((p for p in fetches if p < inserts[0]), default=None)
+    if last_fetch is None or inserts[0] - last_fetch < 2:
+        return None
+    return MakePhases(
+        function.body[last_fetch],
+        function.body[inserts[0]],
+        sum(
+            not _is_light(call)
+            for statement_calls in calls[last_fetch + 1 : inserts[0]]
+            for call in statement_calls
+        ),
+    )
@@ -0,0 +1,224 @@
+"""Streaming NDJSON and SARIF reporters
+
+Each message is written and flushed as it is emitted, rather than buffered
+until the end of the run, so memory stays constant and results can be read
+while pylint is still running. Messages of the DataJoint checker carry their
+arguments as structured data, read back through the message templates.
+
+    pylint --load-plugins=datajoint_linter --output-format=dj-ndjson
+    pylint --load-plugins=datajoint_linter --output-format=dj-sarif
+"""
+
+import json
+import re
+from typing import TYPE_CHECKING, Optional, Pattern, Set, TextIO, Tuple
+
+from pylint.reporters import BaseReporter
+
+from .main import DataJointLinter
+
+if TYPE_CHECKING:
+    from pylint.message import Message
+    from pylint.reporters.ureports.nodes import Section
+
+_TABLE_MESSAGE = re.compile(r"^`[^`]*` err: (?P<error>.*)$", re.S)
+_ERROR_FIELDS = (  # patterns of DataJoint's error text, in definition-error
+    r"Foreign key reference\s*(?P<ref>.*?) could not",
+    r"Unsupported attribute type (?P<attribute_type>.*)$",
+    r'in line:?\s*"?(?P<definition_line>.*?)"?\.?$',
+)
+_ERROR_FIELDS = tuple(re.compile(pattern) for pattern in _ERROR_FIELDS)
+_LISTS = dict(cycle=" -> ", changes=", ")
+
+
+def _message_fields(
+    template: str, fields: Tuple[str, ...]
+) -> Tuple[Pattern, Set[str]]:
+    """Returns a pattern matching a template's arguments by field name, and
+    the names of integer (%d) fields"""
+    parts = re.split(r"(%[sd])", template)
+    if len(parts) // 2 != len(fields):
+        raise ValueError(f"Fields {fields} do not match {template!r}")
+    pattern, integers = re.escape(parts[0]), set()
+    for field, placeholder, text in zip(fields, parts[1::2], parts[2::2]):
+        if placeholder == "%d":
+            integers.add(field)
+        value = r"-?\d+" if placeholder == "%d" else ".*?"
+        pattern += f"(?P<{field}>{value}){re.escape(text)}"
+    return re.compile(f"^{pattern}$", re.S), integers
+
+
+_MESSAGES = {  # msg_id: pattern, integer fields
+    msg_id: _message_fields(template, DataJointLinter.MSG_FIELDS[msg_id])
+    for msg_id, (template, *_) in DataJointLinter.msgs.items()
+}
+_SARIF_OMITTED = {  # fields of the result itself
+    "message_id",
+    "message",
+    "path",
+    "line",
+    "column",
+    "end_line",
+    "end_column",
+}
+_SARIF_LEVELS = dict(
+    fatal="error", error="error", warning="warning", convention="note"
+)
+
+
+def message_data(msg: "Message") -> dict:
+    """Returns a message as a dict, with DataJoint fields if applicable
+
+    DataJoint messages add their arguments, named in MSG_FIELDS, e.g.
+    `table` and `width`, and the `error` text. DataJoint's errors add fields
+    parsed from their text, e.g. the unresolved `ref`.
+    """
+    data = dict(
+        type=msg.category,
+        symbol=msg.symbol,
+        message_id=msg.msg_id,
+        message=msg.msg,
+        path=msg.path,
+        module=msg.module,
+        obj=msg.obj,
+        line=msg.line,
+        column=msg.column,
+        end_line=msg.end_line,
+        end_column=msg.end_column,
+    )
+    if msg.msg_id not in _MESSAGES:
+        return data
+    pattern, integers = _MESSAGES[msg.msg_id]
+    match = pattern.match(msg.msg)
+    if not match:
+        return data
+    for key, value in match.groupdict().items():
+        if key in integers:
+            value = int(value)
+        elif key in _LISTS:
+            value = value.split(_LISTS[key])
+        data[key] = value
+    error = _TABLE_MESSAGE.match(msg.msg)
+    if error:
+        data["error"] = error.group("error")
+    if msg.symbol != "definition-error":
+        return data
+    for error_pattern in _ERROR_FIELDS:
+        field_match = error_pattern.search(data["error"])
+        if field_match:
+            data.update(field_match.groupdict())
+            break
+    return data
+
+
+class NDJSONReporter(BaseReporter):
+    """Writes one JSON object per message, as each is emitted"""
+
+    name = "dj-ndjson"
+    extension = "ndjson"
+
+    def handle_message(self, msg: "Message") -> None:
+        self.out.write(json.dumps(message_data(msg)) + "\n")
+        self.out.flush()
+
+    def display_messages(self, layout: Optional["Section"]) -> None:
+        """Messages were written as emitted"""
+
+    def _display(self, layout: "Section") -> None:
+        """Reports are not written, only messages"""
+
+
+class SARIFReporter(BaseReporter):
+    """Writes a SARIF 2.1.0 log, streaming each result as it is emitted
+
+    The log is opened before the first result and closed at the end of the
+    run, so the output is valid SARIF only once the run completes.
+    """
+
+    name = "dj-sarif"
+    extension = "sarif"
+
+    SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+    def __init__(self, output: Optional[TextIO] = None) -> None:
+        super().__init__(output)
+        self._results = None  # number of results written, once opened
+
+    def _open(self) -> None:
+        """Writes the log header, with a rule per DataJoint message"""
+        rules = [
+            dict(
+                id=msg_id,
+                name=symbol,
+                shortDescription=dict(text=description),
+            )
+            for msg_id, (_, symbol, description) in sorted(
+                DataJointLinter.msgs.items()
+            )
+        ]
+        header = json.dumps(
+            {
+                "$schema": self.SCHEMA,
+                "version": "2.1.0",
+                "runs": [
+                    dict(
+                        tool=dict(
+                            driver=dict(name="datajoint_linter", rules=rules)
+                        ),
+                        results=[],
+                    )
+                ],
+            }
+        )
+        self.out.write(header[: -len("]}]}")])
+        self._results = 0
+
+    def handle_message(self, msg: "Message") -> None:
+        if self._results is None:
+            self._open()
+        data = message_data(msg)
+        result = dict(
+            ruleId=msg.msg_id,
+            level=_SARIF_LEVELS.get(msg.category, "note"),
+            message=dict(text=msg.msg),
+            locations=[
+                dict(
+                    physicalLocation=dict(
+                        artifactLocation=dict(uri=msg.path.replace("\\", "/")),
+                        region=dict(
+                            startLine=msg.line,
+                            startColumn=msg.column + 1,
+                            **(
+                                dict(
+                                    endLine=msg.end_line,
+                                    endColumn=msg.end_column + 1,
+                                )
+                                if msg.end_line and msg.end_column is not None
+                                else dict()
+                            ),
+                        ),
+                    ),
+                    logicalLocations=(
+                        [dict(fullyQualifiedName=msg.obj)] if msg.obj else []
+                    ),
+                )
+            ],
+            properties={
+                k: v for k, v in data.items() if k not in _SARIF_OMITTED
+            },
+        )
+        separator = "," if self._results else ""
+        self.out.write(separator + "\n" + json.dumps(result))
+        self.out.flush()
+        self._results += 1
+
+    def display_messages(self, layout: Optional["Section"]) -> None:
+        """Closes the log, which is empty of results if none were emitted"""
+        if self._results is None:
+            self._open()
+        self.out.write("\n]}]}\n")
+        self.out.flush()
+        self._results = None
+
+    def _display(self, layout: "Section") -> None:
+        """Reports are not written, only messages"""
@@ -0,0 +1,276 @@
+"""Restrictions of indexed tables in code, compared with the tables' indexes
+
+Every module under the index roots is read with `ast`. A restriction is the
+right operand of `&` (or the argument of `.restrict()`) on a table name, and
+its attributes are read when it is a dict, a `dict(...)` call, an SQL string
+or f-string, or a list of them. An attribute is served by an index whose
+preceding attributes are restricted too: the primary key, a declared
+secondary index, or the index InnoDB adds on every foreign key. Restrictions
+on other attributes scan the table, or the range of an index.
+"""
+
+import ast
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .graph import TableKey
+from .index import TableEntry, TableIndex, dotted_name, read_imports
+
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_CONDITION = re.compile(  # attribute before a comparison operator
+    r"`?\b([a-z_]\w*)`?\s*(?:[<>!]?=|<>|<|>|\s(?:not\s+)?"
+    + r"(?:in|like|between|is)\b)",
+    re.I,
+)
+_PLACEHOLDER = "?"  # stands for formatted values of f-strings
+
+
+class Restriction(NamedTuple):
+    table: TableKey
+    attributes: Tuple[str, ...]  # attributes restricted together
+    path: str
+    line: int
+
+
+class Unindexed(NamedTuple):
+    table: TableKey
+    attribute: str
+    count: int  # restrictions not served by an index
+    path: str  # first such restriction
+    line: int
+
+
+def _sql_attributes(condition: str) -> Tuple[str, ...]:
+    """Returns the names compared in an SQL condition, without literals"""
+    return tuple(
+        dict.fromkeys(_CONDITION.findall(_STRINGS.sub("''", condition)))
+    )
+
+
+def conditions(node: ast.AST) -> List[Tuple[str, ...]]:
+    """Returns the attributes of each condition of a restriction
+
+    A list or tuple restricts by any one of its conditions, so each of its
+    items is a separate condition. Returns an empty list for restrictions
+    that are not literals, e.g. by a variable or another table.
+    """
+    if isinstance(node, ast.Dict):
+        return [
+            tuple(
+                key.value
+                for key in node.keys
+                if isinstance(key, ast.Constant) and isinstance(key.value, str)
+            )
+        ]
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "dict"
+    ):
+        return [tuple(k.arg for k in node.keywords if k.arg is not None)]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [_sql_attributes(node.value)]
+    if isinstance(node, ast.JoinedStr):
+        return [
+            _sql_attributes(
+                "".join(
+                    (
+                        value.value
+                        if isinstance(value, ast.Constant)
+                        else _PLACEHOLDER
+                    )
+                    for value in node.values
+                )
+            )
+        ]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [
+            condition for item in node.elts for condition in conditions(item)
+        ]
+    return []
+
+
+def _table_name(node: ast.AST) -> str:
+    """Returns the dotted name of the table restricted in an expression
+
+    Instances, projections and restrictions are unwrapped, joins are not as
+    their restriction applies to several tables. Returns an empty string for
+    other expressions.
+    """
+    while True:
+        if isinstance(node, ast.BinOp) and isinstance(
+            node.op, (ast.BitAnd, ast.Sub)
+        ):
+            node = node.left
+        elif isinstance(node, ast.Call) and isinstance(
+            node.func, ast.Attribute
+        ):
+            if node.func.attr not in ("proj", "restrict"):
+                return ""
+            node = node.func.value
+        elif isinstance(node, ast.Call) and not node.args:
+            node = node.func
+        else:
+            return dotted_name(node)
+
+
+class _RestrictionVisitor(ast.NodeVisitor):
+    """Collects restrictions of indexed tables in a module"""
+
+    def __init__(
+        self,
+        index: TableIndex,
+        module: str,
+        path: str,
+        imports: Dict[str, str],
+    ) -> None:
+        self.index = index
+        self.module = module
+        self.path = path
+        self.imports = imports
+        self.classes: List[str] = []
+        self.restrictions: List[Restriction] = []
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append(node.name)
+        self.generic_visit(node)
+        self.classes.pop()
+
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        if isinstance(node.op, ast.BitAnd):
+            self._add(node.left, node.right, node)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if (
+            isinstance(func, ast.Attribute)
+            and func.attr == "restrict"
+            and node.args
+        ):
+            self._add(func.value, node.args[0], node)
+        self.generic_visit(node)
+
+    def _resolve(self, name: str) -> Optional[TableEntry]:
+        """Resolves a table name, with self and cls as the enclosing class"""
+        head, _, rest = name.partition(".")
+        if head in ("self", "cls"):
+            # the innermost enclosing table, e.g. Master.Part
+            for depth in range(len(self.classes), 0, -1):
+                table = ".".join(self.classes[:depth])
+                if self.index.get(self.module, table) is not None:
+                    break
+            else:
+                return None
+            return self.index.get(
+                self.module, ".".join(filter(None, (table, rest)))
+            )
+        return self.index.resolve(self.module, name, self.imports)
+
+    def _add(self, table: ast.AST, restriction: ast.AST, node: ast.AST) -> None:
+        name = _table_name(table)
+        entry = name and self._resolve(name)
+        if not entry:
+            return
+        for attributes in conditions(restriction):
+            if attributes:
+                self.restrictions.append(
+                    Restriction(
+                        (entry.module, entry.name),
+                        attributes,
+                        self.path,
+                        node.lineno,
+                    )
+                )
+
+
+def find_restrictions(index: TableIndex) -> Iterator[Restriction]:
+    """Yields restrictions of indexed tables in every indexed file"""
+    for path, module in sorted(index.files().items()):
+        try:
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            if "&" not in source and ".restrict(" not in source:
+                continue
+            tree = ast.parse(source)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        imports = read_imports(tree, module, path.endswith("__init__.py"))
+        visitor = _RestrictionVisitor(index, module, path, imports)
+        visitor.visit(tree)
+        yield from visitor.restrictions
+
+
+def _parents(index: TableIndex, entry: TableEntry) -> List[TableEntry]:
+    """Returns the tables referenced by a table that resolve in the index"""
+    parents = (index.resolve_ref(entry, ref) for ref in entry.refs)
+    return [parent for parent in parents if parent is not None]
+
+
+def table_indexes(
+    index: TableIndex, entry: TableEntry
+) -> List[Tuple[str, ...]]:
+    """Returns the attributes of every index of a table, in order
+
+    These are the primary key, the declared secondary indexes, and the
+    primary key of each referenced table, which InnoDB indexes unless an
+    index already starts with it.
+    """
+    return (
+        [index.primary_key(entry)]
+        + list(entry.indexes)
+        + [index.primary_key(parent) for parent in _parents(index, entry)]
+    )
+
+
+def heading(index: TableIndex, entry: TableEntry) -> Tuple[str, ...]:
+    """Returns the attributes of a table, including inherited ones"""
+    attributes = list(index.primary_key(entry))
+    for parent in _parents(index, entry):
+        attributes.extend(index.primary_key(parent))
+    attributes.extend(name for name, _ in entry.types)
+    return tuple(dict.fromkeys(attributes))
+
+
+def unserved(
+    attributes: Tuple[str, ...], indexes: List[Tuple[str, ...]]
+) -> Tuple[str, ...]:
+    """Returns the restricted attributes that no index serves
+
+    An index serves an attribute if all attributes before it in the index
+    are restricted as well.
+    """
+    restricted = set(attributes)
+    return tuple(
+        attribute
+        for attribute in attributes
+        if not any(
+            attribute in columns
+            and restricted.issuperset(columns[: columns.index(attribute)])
+            for columns in indexes
+        )
+    )
+
+
+def unindexed_restrictions(index: TableIndex) -> List[Unindexed]:
+    """Returns the attributes restricted without an index, most frequent first
+
+    Attributes not in the table's heading are ignored, as DataJoint ignores
+    them in dict restrictions and they are not attributes in SQL strings.
+    """
+    counts: Dict[Tuple[TableKey, str], List] = dict()
+    for restriction in find_restrictions(index):
+        entry = index.get(*restriction.table)
+        known = set(heading(index, entry))
+        attributes = tuple(a for a in restriction.attributes if a in known)
+        for attribute in unserved(attributes, table_indexes(index, entry)):
+            found = counts.setdefault(
+                (restriction.table, attribute),
+                [0, restriction.path, restriction.line],
+            )
+            found[0] += 1
+    ranked = [
+        Unindexed(table, attribute, count, path, line)
+        for (table, attribute), (count, path, line) in counts.items()
+    ]
+    return sorted(ranked, key=lambda u: (-u.count, u.table, u.attribute))
@@ -0,0 +1,118 @@
+"""Analysis of secondary indexes declared in definitions
+
+Indexes are compared as MySQL uses them: an index serves lookups on any
+leftmost prefix of its attributes, so an index that is a prefix of the
+primary key or of another index adds write cost without speeding up any
+restriction. Large attributes either can not be indexed without a prefix
+length (blobs, json) or make for wide, slow index entries (long strings).
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from .parser import (
+    SERIALIZED_TYPES,
+    Definition,
+    Index,
+    UnsupportedDefinition,
+    match_type,
+)
+
+_UNINDEXABLE = SERIALIZED_TYPES | {"JSON"}
+_LENGTH = re.compile(r"\(\s*(\d+)\s*\)")
+
+
+class Redundant(NamedTuple):
+    index: Index
+    covered_by: Optional[Index]  # None for the primary key
+
+
+class BadIndexType(NamedTuple):
+    index: Index
+    attribute: str
+    type: str
+
+
+def describe(index: Index) -> str:
+    """Returns an index as declared, e.g. `unique index(a, b)`"""
+    unique = "unique " if index.unique else ""
+    return f"{unique}index({', '.join(index.attributes)})"
+
+
+def _covers(other: Index, index: Index, other_first: bool) -> bool:
+    """Returns true if other serves every use of index
+
+    A unique index is only covered by one enforcing uniqueness on the same
+    attributes. Of two identical indexes, the first covers the second.
+    """
+    size = len(index.attributes)
+    if other.attributes[:size] != index.attributes:
+        return False
+    if index.unique and not (other.unique and len(other.attributes) == size):
+        return False
+    if len(other.attributes) == size and other.unique == index.unique:
+        return other_first
+    return True
+
+
+def redundant_indexes(
+    definition: Definition, primary_key: Optional[Sequence[str]]
+) -> List[Redundant]:
+    """Returns indexes covered by the primary key or another index
+
+    Parameters
+    ----------
+    definition : Definition
+        Parsed table definition.
+    primary_key : Optional[Sequence[str]]
+        All primary key attributes in order, including inherited ones, or
+        None if not known, which skips comparison to the primary key.
+    """
+    primary = primary_key and Index(tuple(primary_key), True, "")
+    redundant = []
+    for position, index in enumerate(definition.indexes):
+        if primary and _covers(primary, index, True):
+            redundant.append(Redundant(index, None))
+            continue
+        covered_by = next(
+            (
+                other
+                for other_position, other in enumerate(definition.indexes)
+                if other_position != position
+                and _covers(other, index, other_position < position)
+            ),
+            None,
+        )
+        if covered_by is not None:
+            redundant.append(Redundant(index, covered_by))
+    return redundant
+
+
+def bad_index_types(
+    definition: Definition, types: Dict[str, str], max_length: int
+) -> List[BadIndexType]:
+    """Returns indexed attributes of blob types or long strings
+
+    Parameters
+    ----------
+    definition : Definition
+        Parsed table definition.
+    types : Dict[str, str]
+        Type of each attribute of the table, including inherited ones.
+    max_length : int
+        Longest string, in characters, not reported. 0 reports none.
+    """
+    bad = []
+    for index in definition.indexes:
+        for attribute in index.attributes:
+            attribute_type = types.get(attribute)
+            try:
+                category = attribute_type and match_type(attribute_type)
+            except UnsupportedDefinition:
+                continue
+            length = category == "STRING" and _LENGTH.search(attribute_type)
+            if category in _UNINDEXABLE or (
+                length and 0 < max_length < int(length.group(1))
+            ):
+                bad.append(BadIndexType(index, attribute, attribute_type))
+    return bad
@@ -0,0 +1,436 @@
+"""Long-running diagnostics server: language server and file watcher
+
+`DiagnosticServer` keeps a single DataJoint checker warm between edits. Each
+document is re-parsed on change, but only table classes whose source,
+preceding namespace, or inherited key types changed are re-checked.
+Diagnostics of unchanged classes are reused, shifted to the class's new
+position, and the checker state they set is restored.
+
+`serve_lsp` speaks the Language Server Protocol over stdio, with full-text
+document sync. `watch` polls files for editors without LSP support.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import tokenize
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import astroid
+from astroid import nodes
+from pylint.lint import PyLinter
+from pylint.utils.file_state import FileState
+
+from .index import module_name
+from .main import DataJointLinter
+
+_SEVERITY = dict(F=1, E=1, W=2, C=3, R=4, I=4)  # pylint category -> LSP
+
+
+class _CollectingLinter(PyLinter):
+    """PyLinter that records checker messages as diagnostics dicts"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.collected = []
+
+    def process_pragmas(
+        self, module: nodes.Module, tokens: List[tokenize.TokenInfo]
+    ) -> bool:
+        """Sets up the file state of a module and reads its pragmas
+
+        Returns
+        -------
+        bool
+            False if the module is marked skip-file, else True.
+        """
+        self.file_state = FileState(module.name, self.msgs_store, module)
+        self._ignore_file = False
+        self.process_tokens(tokens)  # e.g. disable on a line
+        return not self._ignore_file
+
+    def add_message(
+        self,
+        msgid,
+        line=None,
+        node=None,
+        args=None,
+        confidence=None,
+        col_offset=None,
+        end_lineno=None,
+        end_col_offset=None,
+    ) -> None:
+        if node is not None:
+            position = getattr(node, "position", None) or node
+            line = line or position.lineno
+            col_offset = position.col_offset
+            end_lineno = position.end_lineno
+            end_col_offset = position.end_col_offset
+        for definition in self.msgs_store.get_message_definitions(msgid):
+            self.collected.append(
+                dict(
+                    msg_id=definition.msgid,
+                    symbol=definition.symbol,
+                    msg=definition.msg % args if args else definition.msg,
+                    line=line or 1,
+                    column=col_offset or 0,
+                    end_line=end_lineno or line or 1,
+                    end_column=end_col_offset or 0,
+                )
+            )
+
+
+class DiagnosticServer:
+    """Warm DataJoint checker that relints only changed table classes.
+
+    Parameters
+    ----------
+    options : dict, optional
+        DataJoint checker options, keyed by config attribute name.
+    """
+
+    def __init__(self, options: Optional[dict] = None) -> None:
+        self.linter = _CollectingLinter()
+        self.checker = DataJointLinter(self.linter)
+        self.linter.register_checker(self.checker)
+        for key, value in (options or dict()).items():
+            setattr(self.linter.config, key, value)
+        self.checker.open()
+        self._documents: Dict[str, Dict[str, Tuple[List[dict], dict]]] = dict()
+        self.checked = 0  # number of classes checked, for diagnostics reuse
+
+    def close(self) -> None:
+        """Closes the checker, writing any caches"""
+        self.checker.close()
+
+    def refresh(self) -> None:
+        """Re-indexes modified files, if indexing is enabled
+
+        Retained diagnostics are dropped if any indexed file changed, as they
+        may depend on its tables.
+        """
+        if self.checker.refresh_index():
+            self._documents = dict()
+
+    def forget(self, uri: str) -> None:
+        """Drops the retained state of a closed document"""
+        self._documents.pop(uri, None)
+
+    def lint(self, uri: str, text: str, path: str = "") -> List[dict]:
+        """Returns messages for a document, re-checking only changed classes
+
+        Parameters
+        ----------
+        uri : str
+            Document identifier, used to retain state between versions.
+        text : str
+            Full document text.
+        path : str, optional
+            File path of the document, if any.
+
+        Returns
+        -------
+        List[dict]
+            Messages with msg_id, symbol, msg, line, column, end_line and
+            end_column, as in pylint's message attributes. Messages disabled
+            by the options or by pragmas, e.g. `# pylint: disable=no-pk`,
+            are left out, as pylint does.
+        """
+        try:
+            module = astroid.parse(
+                text,
+                module_name=module_name(path) if path else "",
+                path=path or None,
+            )
+            tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+        except (astroid.AstroidSyntaxError, tokenize.TokenError):
+            return []  # leave syntax errors to other tools
+
+        linter = self.linter
+        if not linter.process_pragmas(module, tokens):
+            return []
+
+        checker = self.checker
+        checker.visit_module(module)
+        lines = text.splitlines()
+        namespace = hashlib.sha256()
+        for node in module.nodes_of_class(nodes.ClassDef):  # table kinds
+            namespace.update(f"{node.name}{node.basenames}".encode())
+        previous = self._documents.get(uri, dict())
+        current, messages = dict(), []
+
+        for node in module.nodes_of_class(
+            (nodes.Import, nodes.ImportFrom, nodes.ClassDef)
+        ):
+            if isinstance(node, nodes.Import):
+                messages.extend(self._check(checker.visit_import, node))
+                namespace.update(node.as_string().encode())
+                continue
+            if isinstance(node, nodes.ImportFrom):
+                messages.extend(self._check(checker.visit_importfrom, node))
+                namespace.update(node.as_string().encode())
+                continue
+
+            source = "\n".join(lines[node.fromlineno - 1 : node.tolineno])
+            key = hashlib.sha256(
+                namespace.hexdigest().encode() + source.encode()
+            ).hexdigest()
+            relative, key_types = previous.get(key, (None, None))
+            if relative is None:
+                relative = [
+                    dict(
+                        msg,
+                        line=msg["line"] - node.fromlineno,
+                        end_line=msg["end_line"] - node.fromlineno,
+                    )
+                    for msg in self._check(checker.visit_classdef, node)
+                ]
+                key_types = checker.class_key_types(node)
+                self.checked += 1
+            else:
+                checker.restore_class(node, key_types)
+            current[key] = relative, key_types
+            messages.extend(
+                dict(
+                    msg,
+                    line=msg["line"] + node.fromlineno,
+                    end_line=msg["end_line"] + node.fromlineno,
+                )
+                for msg in relative
+            )
+            namespace.update(f"{node.name}{key_types}".encode())
+
+        messages.extend(self._check(checker.check_module_queries, module))
+        # Documents are linted on their own, so references into modules not
+        # checked are not resolved later, as they are at the end of a run
+        checker.clear_pending()
+        self._documents[uri] = current
+        # Filtered after reuse, as pragmas outside a class may have changed
+        return [
+            msg
+            for msg in messages
+            if linter.is_message_enabled(msg["msg_id"], msg["line"])
+        ]
+
+    def _check(self, visit, node: nodes.NodeNG) -> List[dict]:
+        """Runs a checker visit method, returns the messages it added"""
+        self.linter.collected = []
+        visit(node)
+        return self.linter.collected
+
+
+def to_lsp(message: dict) -> dict:
+    """Converts a message to an LSP diagnostic"""
+    return dict(
+        range=dict(
+            start=dict(line=message["line"] - 1, character=message["column"]),
+            end=dict(
+                line=message["end_line"] - 1, character=message["end_column"]
+            ),
+        ),
+        severity=_SEVERITY.get(message["msg_id"][0], 3),
+        code=message["msg_id"],
+        source=DataJointLinter.name,
+        message=f"{message['msg']} ({message['symbol']})",
+    )
+
+
+def _uri_path(uri: str) -> str:
+    """Returns the file path of a file:// uri"""
+    parsed = urlparse(uri)
+    return unquote(parsed.path) if parsed.scheme == "file" else ""
+
+
+def _read_message(stream) -> Optional[dict]:
+    """Reads one JSON-RPC message with LSP base protocol headers"""
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.decode("ascii").strip()
+        if not header:
+            break
+        name, _, value = header.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(stream.read(length)) if length else dict()
+
+
+def _write_message(stream, message: dict) -> None:
+    """Writes one JSON-RPC message with LSP base protocol headers"""
+    body = json.dumps(dict(jsonrpc="2.0", **message)).encode()
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    stream.flush()
+
+
+def serve_lsp(options: Optional[dict] = None, stdin=None, stdout=None) -> int:
+    """Runs a language server over stdio until the client exits
+
+    Parameters
+    ----------
+    options : dict, optional
+        DataJoint checker options, keyed by config attribute name.
+    stdin, stdout : binary streams, optional
+        Streams for the protocol. Default the process's stdio.
+
+    Returns
+    -------
+    int
+        Exit code: 0 after shutdown then exit, 1 otherwise.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    server = DiagnosticServer(options)
+    documents: Dict[str, str] = dict()
+    shutdown = False
+
+    def publish(uri: str) -> None:
+        messages = server.lint(uri, documents[uri], _uri_path(uri))
+        _write_message(
+            stdout,
+            dict(
+                method="textDocument/publishDiagnostics",
+                params=dict(uri=uri, diagnostics=[to_lsp(m) for m in messages]),
+            ),
+        )
+
+    while True:
+        message = _read_message(stdin)
+        if message is None:
+            break
+        method, params = message.get("method"), message.get("params") or dict()
+        result = None
+
+        if method == "initialize":
+            result = dict(
+                capabilities=dict(
+                    textDocumentSync=dict(openClose=True, change=1, save=True)
+                ),
+                serverInfo=dict(name="dj-lint"),
+            )
+        elif method == "shutdown":
+            shutdown = True
+        elif method == "exit":
+            break
+        elif method == "textDocument/didOpen":
+            document = params["textDocument"]
+            documents[document["uri"]] = document["text"]
+            server.refresh()
+            publish(document["uri"])
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            documents[uri] = params["contentChanges"][-1]["text"]
+            publish(uri)
+        elif method == "textDocument/didSave" and "text" in params:
+            uri = params["textDocument"]["uri"]
+            documents[uri] = params["text"]
+            server.refresh()
+            publish(uri)
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            documents.pop(uri, None)
+            server.forget(uri)
+            _write_message(
+                stdout,
+                dict(
+                    method="textDocument/publishDiagnostics",
+                    params=dict(uri=uri, diagnostics=[]),
+                ),
+            )
+        elif "id" in message and method is not None:
+            _write_message(
+                stdout,
+                dict(
+                    id=message["id"],
+                    error=dict(code=-32601, message=f"Unknown {method}"),
+                ),
+            )
+            continue
+
+        if "id" in message and method is not None:
+            _write_message(stdout, dict(id=message["id"], result=result))
+
+    server.close()
+    return 0 if shutdown else 1
+
+
+def _mtimes(paths: Iterable[str]) -> Dict[str, float]:
+    """Returns modification times of files with tables under paths"""
+    from .cli import find_files
+
+    mtimes = dict()
+    for path in find_files(paths):
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def watch(
+    paths: Iterable[str],
+    options: Optional[dict] = None,
+    interval: float = 0.5,
+    output=sys.stdout,
+    iterations: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Polls files for changes, printing messages of each changed file
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        Files or directories to watch.
+    options : dict, optional
+        DataJoint checker options, keyed by config attribute name.
+    interval : float, optional
+        Seconds between polls. Default 0.5.
+    output : file, optional
+        Stream for results. Default stdout.
+    iterations : int, optional
+        Number of polls before returning. Default None, poll until
+        interrupted.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Number of polls and of files linted.
+    """
+    from pylint.reporters.text import TextReporter
+
+    server = DiagnosticServer(options)
+    seen: Dict[str, float] = dict()
+    polls = linted = 0
+    try:
+        while iterations is None or polls < iterations:
+            if polls:
+                time.sleep(interval)
+            polls += 1
+            mtimes = _mtimes(paths)
+            for path in set(seen) - set(mtimes):
+                server.forget(path)
+            if mtimes != seen:
+                server.refresh()
+            for path, mtime in sorted(mtimes.items()):
+                if seen.get(path) == mtime:
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    messages = server.lint(path, f.read(), path)
+                linted += 1
+                print(f"************* Module {path}", file=output)
+                for msg in messages:
+                    print(
+                        TextReporter.line_format.format(path=path, **msg),
+                        file=output,
+                    )
+                output.flush()
+            seen = mtimes
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return polls, linted
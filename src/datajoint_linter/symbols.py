@@ -0,0 +1,127 @@
+"""Compact table of the tables seen across modules of a run"""
+
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+ModuleEntry = Tuple[str, bool, Dict[str, str], List[str]]
+
+
+class PendingRef(NamedTuple):
+    """Foreign key reference into a module not yet checked, and its location"""
+
+    module: str
+    path: str
+    table: str
+    ref: str
+    qualified: str
+    line: int
+    col_offset: int
+    end_lineno: Optional[int]
+    end_col_offset: Optional[int]
+    enabled: bool  # definition-error not disabled by a pragma at the table
+
+
+class SymbolTable:
+    """Qualified names of tables in modules checked so far
+
+    Names are interned and kept in flat collections, one entry per table,
+    per checked module, and per module-level import or name that may be a
+    table, e.g. an assignment, rather than per namespace of each module.
+    """
+
+    def __init__(self) -> None:
+        self._tables = set()
+        self._modules = set()
+        self._packages = set()
+        self._imports: Dict[str, str] = dict()
+        self._unknown: Set[str] = set()
+        self._new_tables: List[str] = []
+        self._new_modules: List[ModuleEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def add_table(self, module: str, name: str) -> None:
+        """Records a table, dotted within module for part tables"""
+        qualified = sys.intern(f"{module}.{name}")
+        if qualified not in self._tables:
+            self._tables.add(qualified)
+            self._new_tables.append(qualified)
+
+    def add_module(
+        self,
+        module: str,
+        package: bool = False,
+        imports: Optional[Dict[str, str]] = None,
+        unknown: Iterable[str] = (),
+    ) -> None:
+        """Records that all tables of module, or package init, were seen
+
+        Parameters
+        ----------
+        module : str
+            Qualified name of the module
+        package : bool, optional
+            True for a package init, whose other names may be submodules
+        imports : dict, optional
+            Qualified names imported at module level, keyed by local name
+        unknown : Iterable[str], optional
+            Other module-level names that may be tables, e.g. assignments or
+            classes of bases that could not be inferred
+        """
+        module = sys.intern(module)
+        if module in self._modules:
+            return
+        self._modules.add(module)
+        if package:
+            self._packages.add(module)
+        imports = imports or dict()
+        unknown = list(unknown)
+        for name, target in imports.items():
+            self._imports[sys.intern(f"{module}.{name}")] = sys.intern(target)
+        self._unknown.update(sys.intern(f"{module}.{name}") for name in unknown)
+        self._new_modules.append((module, package, imports, unknown))
+
+    def drain(self) -> Tuple[List[str], List[ModuleEntry]]:
+        """Returns tables and modules added since the last drain
+
+        Used to send only new names from parallel workers.
+        """
+        new = (self._new_tables, self._new_modules)
+        self._new_tables, self._new_modules = [], []
+        return new
+
+    def merge(self, tables: List[str], modules: List[ModuleEntry]) -> None:
+        """Adds tables and modules drained from another symbol table"""
+        self._tables.update(sys.intern(name) for name in tables)
+        for module in modules:
+            self.add_module(*module)
+
+    def find(self, qualified: str) -> Optional[bool]:
+        """Returns whether a qualified name is a known table
+
+        Names imported by a checked module are followed to their source,
+        e.g. re-exports. Returns None if the name is not within a module
+        checked so far, as it may be a table of a module not yet visited,
+        and for names that may be tables of unknown kind. Names within a
+        package are also unknown, as they may be submodules.
+        """
+        seen = set()
+        while qualified not in seen:
+            seen.add(qualified)
+            if qualified in self._tables:
+                return True
+            parts = qualified.split(".")
+            for split in range(len(parts) - 1, 0, -1):
+                module = ".".join(parts[:split])
+                if module in self._modules:
+                    break
+            else:
+                return None
+            name = f"{module}.{parts[split]}"
+            if name not in self._imports:
+                if module in self._packages or name in self._unknown:
+                    return None
+                return False
+            qualified = ".".join([self._imports[name], *parts[split + 1 :]])
+        return False  # imported in a cycle, defined by none of its modules
@@ -0,0 +1,151 @@
+"""Byte widths of DataJoint attributes and tables as stored by MySQL
+
+Widths follow InnoDB's storage of each type, with strings counted at four
+bytes per character (utf8mb4, MySQL 8's default). Primary keys include the
+attributes inherited through `->` references, so a wide key at the root of
+a pipeline widens the key and index of every table below it.
+"""
+
+import re
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from .parser import Definition, UnsupportedDefinition, match_type
+
+CHAR_BYTES = 4
+INDEX_KEY_LIMIT = 3072  # InnoDB, DYNAMIC or COMPRESSED row format
+ROW_SIZE_LIMIT = 65535
+
+KeyTypes = Tuple[Tuple[str, str], ...]  # attribute name and type, in order
+
+_INTEGER_BYTES = dict(tiny=1, small=2, medium=3, big=8)
+_BLOB_BYTES = dict(tiny=9, small=10, medium=11, long=12)  # row pointer
+_TEMPORAL_BYTES = dict(date=3, time=3, year=1, datetime=5, timestamp=4)
+_UUID_BYTES = 16  # binary(16), also external storage references
+_ARGS = re.compile(r"\(\s*(\d+)(?:\s*,\s*(\d+))?\s*\)")
+
+
+class TableWidth(NamedTuple):
+    key: Optional[KeyTypes]  # primary key attributes, None if not resolved
+    primary_key: int  # bytes of the primary key index entry
+    row: int  # bytes of the row, toward MySQL's row size limit
+    complete: bool  # false if some references could not be resolved
+    attributes: Dict[str, str]  # type of each attribute, incl. inherited
+
+
+def _decimal_bytes(digits: int) -> int:
+    """Bytes of packed decimal digits, nine per four bytes"""
+    return digits // 9 * 4 + (0, 1, 1, 2, 2, 3, 3, 4, 4)[digits % 9]
+
+
+def attribute_width(attribute_type: str, in_index: bool = False) -> int:
+    """Returns the bytes of an attribute type, or 0 if not known
+
+    Parameters
+    ----------
+    attribute_type : str
+        DataJoint attribute type, e.g. `varchar(64)` or `int unsigned`.
+    in_index : bool
+        If true, returns the width in an index key, which excludes the
+        length prefix of variable length strings.
+    """
+    try:
+        category = match_type(attribute_type)
+    except UnsupportedDefinition:
+        return 0
+    name = attribute_type.lower()
+    args = _ARGS.search(name)
+    size = int(args.group(1)) if args else None
+    if category == "INTEGER":
+        if name.startswith("serial"):
+            return 8
+        return _INTEGER_BYTES.get(name.split("int")[0], 4)
+    if category == "DECIMAL":
+        precision = size or 10
+        scale = int(args.group(2) or 0) if args else 0
+        return _decimal_bytes(precision - scale) + _decimal_bytes(scale)
+    if category == "FLOAT":
+        single = name.startswith("float") and (size is None or size <= 24)
+        return 4 if single else 8
+    if category == "STRING":
+        width = (size or 1) * CHAR_BYTES
+        if in_index or not name.startswith("var"):
+            return width
+        return width + (1 if width <= 255 else 2)
+    if category == "ENUM":
+        return 1 if len(re.findall(r"'[^']*'|\"[^\"]*\"", name)) < 256 else 2
+    if category == "BOOL":
+        return 1
+    if category == "TEMPORAL":
+        fraction = (size + 1) // 2 if size else 0
+        return _TEMPORAL_BYTES[name.split("(")[0].strip()] + fraction
+    if category == "INTERNAL_BLOB":
+        return _BLOB_BYTES.get(name.split("blob")[0], 10)
+    if category in ("JSON", "INTERNAL_ATTACH"):
+        return _BLOB_BYTES["long"]
+    if category in ("UUID", "EXTERNAL_BLOB", "EXTERNAL_ATTACH", "FILEPATH"):
+        return _UUID_BYTES
+    return 0  # adapted types depend on the adapter
+
+
+def key_types(
+    definition: Definition,
+    parent_key: Callable[[str], Optional[KeyTypes]],
+) -> Tuple[KeyTypes, bool]:
+    """Returns the primary key attributes of a definition, with types
+
+    Parameters
+    ----------
+    definition : Definition
+        Parsed table definition.
+    parent_key : Callable[[str], Optional[KeyTypes]]
+        Returns the primary key of a referenced table, by name without
+        projection, or None if the reference can not be resolved.
+
+    Returns
+    -------
+    Tuple[KeyTypes, bool]
+        Key attributes in declared order, inherited ones in place of their
+        reference, and whether all references in the key were resolved.
+    """
+    key, complete = dict(), True
+    attributes = {attr.line: attr for attr in definition.attributes}
+    foreign_keys = {fk.line: fk for fk in definition.foreign_keys}
+    for line in definition.lines:
+        if line in attributes and attributes[line].in_key:
+            key.setdefault(attributes[line].name, attributes[line].type)
+        elif line in foreign_keys and foreign_keys[line].in_key:
+            inherited = parent_key(foreign_keys[line].name.strip())
+            complete = complete and inherited is not None
+            for name, attribute_type in inherited or ():
+                key.setdefault(name, attribute_type)
+    return tuple(key.items()), complete
+
+
+def table_width(
+    definition: Definition,
+    parent_key: Callable[[str], Optional[KeyTypes]],
+) -> TableWidth:
+    """Returns the primary key and row widths of a definition
+
+    References that can not be resolved add no width, so widths of
+    incomplete tables are lower bounds.
+    """
+    key, complete = key_types(definition, parent_key)
+    key_complete = complete
+    attributes = dict(key)
+    for fk in definition.foreign_keys:
+        if fk.in_key:
+            continue
+        inherited = parent_key(fk.name.strip())
+        complete = complete and inherited is not None
+        for name, attribute_type in inherited or ():
+            attributes.setdefault(name, attribute_type)
+    for attr in definition.attributes:
+        attributes.setdefault(attr.name, attr.type)
+    return TableWidth(
+        key=key if key_complete else None,
+        primary_key=sum(attribute_width(t, in_index=True) for _, t in key),
+        row=sum(attribute_width(t) for t in attributes.values()),
+        complete=complete,
+        attributes=attributes,
+    )
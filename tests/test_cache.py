@@ -0,0 +1,103 @@
+import astroid
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.cache import DefinitionCache
+from datajoint_linter.main import DataJointLinter
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = DefinitionCache(str(tmp_path))
+    key = cache.key("key : int\n---\nvalue : int")
+    assert cache.get(key) is None
+    cache.set(key, dict(primary_key=["key"], error=None))
+    cache.close()
+
+    cache = DefinitionCache(str(tmp_path))
+    assert cache.get(key) == dict(primary_key=["key"], error=None)
+    cache.close()
+
+
+def test_cache_key_normalized(tmp_path):
+    cache = DefinitionCache(str(tmp_path))
+    assert cache.key("  a : int\n  ---  \n b : int ") == cache.key(
+        "a : int\n---\nb : int"
+    )
+    assert cache.key("a : int") != DefinitionCache(
+        str(tmp_path), salt="other"
+    ).key("a : int")
+    cache.close()
+
+
+def test_cache_eviction(tmp_path):
+    cache = DefinitionCache(str(tmp_path), max_entries=2)
+    for idx in range(4):
+        cache.set(cache.key(f"key{idx} : int"), dict(primary_key=[]))
+    cache.close()
+
+    cache = DefinitionCache(str(tmp_path), max_entries=2)
+    assert len(cache) == 2
+    assert cache.get(cache.key("key3 : int")) is not None
+    assert cache.get(cache.key("key0 : int")) is None
+    cache.close()
+
+
+class TestCachedLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    def test_cache_hit(self, tmp_path, monkeypatch, test_cases_bad):
+        self.linter.config.dj_cache_dir = str(tmp_path)
+        self.linter.config.dj_native_parser = False
+        self.checker.open()
+        my_class = astroid.extract_node(test_cases_bad[3])
+        self.checker.visit_classdef(my_class)
+        first = self.linter.release_messages()
+        self.checker.close()
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("prepare_declare called on cache hit")
+
+        monkeypatch.setattr("datajoint.declare.prepare_declare", _fail)
+        monkeypatch.setattr("datajoint_linter.main.parse_foreign_keys", _fail)
+        self.checker.open()
+        self.checker.visit_classdef(my_class)
+        assert first == self.linter.release_messages()
+        self.checker.close()
+
+    def test_cache_foreign_keys(self, tmp_path, monkeypatch):
+        self.linter.config.dj_cache_dir = str(tmp_path)
+        self.checker.open()
+        module = astroid.parse(
+            '''
+            import datajoint as dj
+            from .upstream import Session
+
+            class Trial(dj.Manual):
+                definition = """
+                -> [nullable, bad] Session
+                -> Missing
+                trial : int
+                """
+            ''',
+            module_name="pkg.trials",
+        )
+        self.walk(module)
+        first = [
+            (m.msg_id, str(m.args)) for m in self.linter.release_messages()
+        ]
+        assert [msg_id for msg_id, _ in first] == [
+            "null-pk-ref",
+            "bad-opt",
+            "definition-error",  # Missing
+        ]
+        self.checker.close()
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("foreign keys parsed on cache hit")
+
+        monkeypatch.setattr("datajoint_linter.main.parse_foreign_keys", _fail)
+        self.checker.open()
+        self.walk(module)
+        assert first == [
+            (m.msg_id, str(m.args)) for m in self.linter.release_messages()
+        ]
+        self.checker.close()
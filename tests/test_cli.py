@@ -0,0 +1,197 @@
+import io
+
+from pylint.reporters.text import TextReporter
+
+from datajoint_linter.cli import find_files, has_tables, main, run
+
+OPTIONS = dict(permit_dj_filepath=False)
+
+
+def _lines(output):
+    return sorted(output.getvalue().splitlines())
+
+
+def test_find_files():
+    files = find_files(["./tests"])
+    assert "./tests/schema_bad.py" in files
+    assert "./tests/schema_good.py" in files
+    assert "./tests/conftest.py" not in files
+    assert not has_tables("./tests/conftest.py")
+
+
+def test_run():
+    output = io.StringIO()
+    status = run(["./tests/schema_bad.py"], OPTIONS, jobs=1, output=output)
+    assert status == 16  # convention messages, as with pylint
+    lines = _lines(output)
+    assert "************* Module tests.schema_bad" in lines
+    assert any("C0008" in line and "(no-def)" in line for line in lines)
+
+
+def test_run_parallel():
+    serial, parallel = io.StringIO(), io.StringIO()
+    paths = ["./tests/schema_good.py", "./tests/schema_bad.py"]
+    run(paths, OPTIONS, jobs=1, output=serial)
+    status = run(paths, OPTIONS, jobs=2, output=parallel)
+    assert status == 16
+    assert _lines(serial) == _lines(parallel)
+
+
+def test_main_options(capsys):
+    status = main(
+        ["./tests/schema_bad.py", "-j", "1", "--permit-dj-filepath=y"]
+    )
+    assert status == 16
+    assert "(no-fp)" not in capsys.readouterr().out
+
+
+def test_run_cross_module(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text(  # checked first, references into b
+        "import datajoint as dj\n"
+        "from .b import Missing, Session\n"
+        "class Trial(dj.Manual):\n"
+        '    definition = "-> Session\\n-> Missing\\ntrial : int"\n'
+    )
+    (pkg / "b.py").write_text(
+        "import datajoint as dj\n"
+        "class Session(dj.Manual):\n"
+        '    definition = "session : int"\n'
+    )
+    for jobs in (1, 2):
+        output = io.StringIO()
+        assert run([str(pkg)], OPTIONS, jobs=jobs, output=output) == 16
+        (line,) = [line for line in _lines(output) if "C0001" in line]
+        assert line.endswith(
+            "a.py:3:0: C0001: `Trial` err: Foreign key reference Missing "
+            + "could not be resolved (definition-error)"
+        )
+        assert "Session" not in line
+
+
+def test_run_reexport(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a_reexport.py").write_text(  # checked, as it declares a table
+        "import datajoint as dj\n"
+        "from pkg.base import Custom\n"
+        "from pkg.core import Session\n"
+        "class Local(dj.Lookup):\n"
+        '    definition = "local : int"\n'
+    )
+    (pkg / "b_user.py").write_text(
+        "import datajoint as dj\n"
+        "from pkg import core\n"
+        "from pkg.a_reexport import Custom, Session\n"
+        "class Trial(dj.Manual):\n"
+        '    definition = "-> Session\\n-> Custom\\n-> core.Missing\\nk : int"\n'
+    )
+    (pkg / "base.py").write_text(
+        "from unknown_lib import Base\n"
+        "class Custom(Base):\n"  # may be a table of an unknown base
+        '    definition = "custom : int"\n'
+    )
+    (pkg / "core.py").write_text(
+        "import datajoint as dj\n"
+        "class Session(dj.Manual):\n"
+        '    definition = "session : int"\n'
+    )
+    for jobs in (1, 2):
+        output = io.StringIO()
+        run([str(pkg)], OPTIONS, jobs=jobs, output=output)
+        lines = [line for line in _lines(output) if "C0001" in line]
+        assert len(lines) == 1
+        assert "reference core.Missing could not be resolved" in lines[0]
+
+
+def test_pylint_jobs(tmp_path):
+    from pylint.lint import Run
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for idx in range(4):  # each references tables of the next module
+        (pkg / f"m{idx}.py").write_text(
+            "import datajoint as dj\n"
+            f"from .m{(idx + 1) % 4} import Missing, Table{(idx + 1) % 4}\n"
+            f"class Table{idx}(dj.Manual):\n"
+            f'    definition = "-> Table{(idx + 1) % 4}\\n-> Missing\\nk : int"\n'
+        )
+    results = []
+    for jobs in (1, 2):
+        output = io.StringIO()
+        Run(
+            [str(pkg), f"-j{jobs}", "--load-plugins=datajoint_linter"]
+            + ["--disable=all", "--enable=definition-error"],
+            reporter=TextReporter(output),
+            exit=False,
+        )
+        lines = output.getvalue().splitlines()
+        results.append(sorted(line for line in lines if "C0001" in line))
+    assert results[0] == results[1]
+    assert sum("Missing could not be resolved" in r for r in results[0]) == 4
+
+
+def test_pending_disabled(tmp_path):
+    from pylint.lint import Run
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "analysis.py").write_text(
+        "import datajoint as dj\n"
+        "from .common import Missing\n"
+        "class Trial(dj.Manual):  # pylint: disable=definition-error\n"
+        '    definition = "-> Missing\\ntrial : int"\n'
+        "class Session(dj.Manual):\n"
+        '    definition = "-> Missing\\nsession : int"\n'
+    )
+    for pragma in ("", "# pylint: disable=definition-error\n"):
+        (pkg / "common.py").write_text(
+            pragma + "import datajoint as dj\n"
+            "class Subject(dj.Manual):\n"
+            '    definition = "subject : int"\n'
+        )
+        for files in (["analysis", "common"], ["common", "analysis"]):
+            paths = [str(pkg / f"{name}.py") for name in files]
+            output = io.StringIO()
+            Run(
+                paths
+                + ["--load-plugins=datajoint_linter"]
+                + ["--disable=all", "--enable=definition-error"],
+                reporter=TextReporter(output),
+                exit=False,
+            )
+            lines = [
+                line
+                for line in output.getvalue().splitlines()
+                if "C0001" in line
+            ]
+            assert len(lines) == 1 and "`Session`" in lines[0]
+
+            output = io.StringIO()
+            run(paths, OPTIONS, jobs=1, output=output)
+            lines = [line for line in _lines(output) if "C0001" in line]
+            assert len(lines) == 1 and "`Session`" in lines[0]
+
+
+def test_run_profile(tmp_path):
+    for name, count in (("a", 2), ("b", 1)):
+        (tmp_path / f"{name}.py").write_text(
+            "import datajoint as dj\n"
+            + "".join(
+                f"class {name.upper()}{idx}(dj.Manual):\n"
+                f'    definition = "k{idx} : int"\n'
+                for idx in range(count)
+            )
+        )
+    options = dict(OPTIONS, dj_profile=True)
+    for jobs in (1, 2):
+        output = io.StringIO()
+        run([str(tmp_path)], options, jobs=jobs, output=output)
+        report = output.getvalue()
+        assert "3 tables checked" in report
+        assert "Slowest DataJoint tables" in report
@@ -0,0 +1,144 @@
+import io
+import subprocess
+
+import astroid
+import pytest
+
+from datajoint_linter.cli import main, run
+from datajoint_linter.diff import affected_tables, changed_tables
+from datajoint_linter.main import DataJointLinter
+
+UPSTREAM = '''
+import datajoint as dj
+
+class Subject(dj.Manual):
+    definition = """
+    subject : int
+    """
+
+class Lab(dj.Lookup):
+    definition = """
+    lab : varchar(32)
+    """
+'''
+
+DOWNSTREAM = '''
+import datajoint as dj
+from .upstream import Subject
+
+class Session(dj.Manual):
+    definition = """
+    -> Subject
+    session_id : int
+    """
+
+    class Epoch(dj.Part):
+        definition = """
+        -> master
+        epoch : int
+        """
+
+class Unrelated(dj.Manual):
+    definition = """
+    other : int
+    """
+'''
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _commit(repo):
+    _git(repo, "add", ".")
+    _git(
+        repo,
+        *("-c", "user.name=test", "-c", "user.email=test@example.com"),
+        *("commit", "-q", "-m", "base"),
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "upstream.py").write_text(UPSTREAM)
+    (pkg / "downstream.py").write_text(DOWNSTREAM)
+    _git(tmp_path, "init", "-q")
+    _commit(tmp_path)
+    return tmp_path
+
+
+_CHECKED = DataJointLinter.CHECKED_CLASSES
+
+
+def _affected(repo):
+    return affected_tables("HEAD", [str(repo / "pkg")], _CHECKED)
+
+
+def test_unchanged(repo):
+    path = repo / "pkg" / "upstream.py"
+    path.write_text(UPSTREAM.replace("    subject", "        subject"))
+    assert _affected(repo) == (set(), set())
+
+
+def test_changed_dependents(repo):
+    path = repo / "pkg" / "upstream.py"
+    path.write_text(UPSTREAM.replace("subject : int", "subject : bigint"))
+    tables, files = _affected(repo)
+    assert tables == {
+        ("pkg.upstream", "Subject"),
+        ("pkg.downstream", "Session"),
+        ("pkg.downstream", "Session.Epoch"),
+    }
+    assert files == {str(path), str(repo / "pkg" / "downstream.py")}
+
+
+def test_removed(repo):
+    path = repo / "pkg" / "upstream.py"
+    path.write_text(UPSTREAM.split("class Lab")[0].replace("Subject", "Mouse"))
+    changed, removed, edited = changed_tables(
+        "HEAD", [str(repo / "pkg")], _CHECKED
+    )
+    assert changed == {("pkg.upstream", "Mouse")}
+    assert not edited
+    assert removed == {("pkg.upstream", "Subject"), ("pkg.upstream", "Lab")}
+    tables, _ = _affected(repo)
+    assert ("pkg.downstream", "Session.Epoch") in tables
+    assert ("pkg.downstream", "Unrelated") not in tables
+
+
+def test_edited_method(repo):
+    path = repo / "pkg" / "upstream.py"
+    path.write_text(
+        UPSTREAM.replace(
+            '    """\n\nclass Lab',
+            '    """\n\n'
+            "    def copy(self):\n"
+            '        for key in Subject.fetch("KEY"):\n'
+            "            self.insert1(key)\n\n"
+            "class Lab",
+        )
+    )
+    assert _affected(repo) == ({("pkg.upstream", "Subject")}, {str(path)})
+    assert main([str(repo / "pkg"), "--diff", "HEAD", "-j", "1"]) == 16
+    output = io.StringIO()
+    run([str(path)], dict(dj_tables=("pkg.upstream.Subject",)), output=output)
+    assert "(unrestricted-fetch)" in output.getvalue()
+    assert "(insert-in-loop)" in output.getvalue()
+
+
+def test_main_diff(repo):
+    path = repo / "pkg" / "downstream.py"
+    path.write_text(DOWNSTREAM.replace(": int", ": badtype"))
+    assert main([str(repo / "pkg"), "--diff", "HEAD", "-j", "1"]) == 16
+
+    _commit(repo)  # errors in unchanged tables are not reported
+    astroid.MANAGER.clear_cache()
+    path.write_text(
+        DOWNSTREAM.replace(": int", ": badtype").replace(
+            "other : badtype", "other : int"
+        )
+    )
+    assert main([str(repo / "pkg"), "--diff", "HEAD", "-j", "1"]) == 0
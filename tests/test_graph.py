@@ -0,0 +1,152 @@
+import io
+
+import astroid
+import pytest
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.cli import main, report_graph
+from datajoint_linter.graph import Dangling, DependencyGraph
+from datajoint_linter.index import TableIndex
+from datajoint_linter.main import DataJointLinter
+
+UPSTREAM = '''
+import datajoint as dj
+from .downstream import Trial
+
+class Subject(dj.Manual):
+    definition = """
+    subject : int
+    """
+
+class Session(dj.Manual):
+    definition = """
+    -> Subject
+    session_id : int
+    ---
+    -> [nullable] Trial
+    """
+'''
+
+DOWNSTREAM = '''
+import datajoint as dj
+import external
+from . import upstream as up
+
+class Trial(dj.Computed):
+    definition = """
+    -> up.Session
+    trial_id : int
+    ---
+    -> external.Table
+    -> Missing
+    """
+
+    class Part(dj.Part):
+        definition = """
+        -> master
+        -> up.Subject
+        """
+'''
+
+
+def _table(name, parent):
+    ref = f"-> {parent}" if parent else ""
+    return f'class {name}(dj.Manual):\n    definition = "{ref}\\nid : int"'
+
+
+@pytest.fixture
+def package(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "upstream.py").write_text(UPSTREAM)
+    (pkg / "downstream.py").write_text(DOWNSTREAM)
+    return pkg
+
+
+def test_graph(package):
+    index = TableIndex([str(package)], DataJointLinter.CHECKED_CLASSES)
+    report = DependencyGraph(index).analyze()
+
+    subject, session = ("pkg.upstream", "Subject"), ("pkg.upstream", "Session")
+    trial, part = ("pkg.downstream", "Trial"), ("pkg.downstream", "Trial.Part")
+    assert [set(cycle) for cycle in report.cycles] == [{session, trial}]
+    assert report.dangling == [Dangling(trial, "Missing")]
+    assert report.depth == {subject: 0, session: 1, trial: 1, part: 2}
+    assert report.max_depth == 2
+    assert report.fan_in == {subject: 2, session: 1, trial: 2, part: 0}
+    assert report.fan_out == {subject: 0, session: 2, trial: 1, part: 2}
+
+
+def test_deep_graph(tmp_path):
+    tables = 20000
+    source = ["import datajoint as dj"] + [
+        _table(f"T{idx}", idx and f"T{idx - 1}") for idx in range(tables)
+    ]
+    (tmp_path / "deep.py").write_text("\n".join(source))
+    index = TableIndex([str(tmp_path)], DataJointLinter.CHECKED_CLASSES)
+    report = DependencyGraph(index).analyze()
+    assert not report.cycles and not report.dangling
+    assert report.max_depth == tables - 1
+
+
+def test_report_graph(package):
+    output = io.StringIO()
+    assert report_graph([str(package)], output=output) == 16
+    lines = output.getvalue().splitlines()
+    assert "dangling: pkg.downstream.Trial -> Missing" in lines
+    assert "4 tables, 5 references, max depth 2" in lines
+    assert any(line.startswith("cycle: ") for line in lines)
+    assert "fan-in:      2 pkg.downstream.Trial" in lines
+    assert main([str(package), "--graph"]) == 16
+
+    output = io.StringIO()
+    report_graph([str(package)], top=1, output=output)
+    assert (
+        sum(
+            line.startswith("fan-in:")
+            for line in output.getvalue().splitlines()
+        )
+        == 1
+    )
+    assert main([str(package), "--graph", "--top", "1"]) == 16
+
+
+def test_report_graph_bases(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "base.py").write_text("class BaseTable:\n    pass\n")
+    (pkg / "tables.py").write_text(
+        "from .base import BaseTable\n"
+        "class Subject(BaseTable):\n"
+        '    definition = "subject : int"\n'
+        "class Session(BaseTable):\n"
+        '    definition = "-> Subject\\nsession : int"\n'
+    )
+    output = io.StringIO()
+    report_graph([str(pkg)], output=output)
+    assert "0 tables, 0 references, max depth 0" in output.getvalue()
+
+    output = io.StringIO()
+    report_graph([str(pkg)], output=output, table_bases=["pkg.base.BaseTable"])
+    assert "2 tables, 1 references, max depth 1" in output.getvalue()
+
+
+class TestCycleLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    def test_fk_cycle(self, package):
+        self.linter.config.dj_index_roots = [str(package)]
+        self.checker.open()
+        path = package / "upstream.py"
+        module = astroid.parse(path.read_text(), "pkg.upstream", str(path))
+        subject, session = module.body[2:]
+        self.checker._class_namespace.update(("Subject", "Trial"))
+        self.checker.visit_classdef(subject)
+        self.checker.visit_classdef(session)
+        (msg,) = self.linter.release_messages()
+        assert msg.msg_id == "fk-cycle"
+        assert msg.node == session
+        assert msg.args[0] == "Session"
+        assert set(msg.args[1].split(" -> ")) == {"Session", "Trial"}
@@ -0,0 +1,190 @@
+import ast
+import os
+
+import astroid
+import pytest
+from datajoint.errors import DataJointError
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.index import TableIndex, module_name, read_imports
+from datajoint_linter.main import DataJointLinter
+
+UPSTREAM = '''
+import datajoint as dj
+
+class Session(dj.Manual):
+    definition = """
+    session_id : int
+    """
+
+    class Epoch(dj.Part):
+        definition = """
+        -> master
+        epoch : int
+        """
+'''
+
+DOWNSTREAM = '''
+import datajoint as dj
+from . import upstream as up
+from .upstream import Session
+
+class Trial(dj.Computed):
+    definition = """
+    -> Session
+    trial_id : int
+    ---
+    -> up.Session.Epoch
+    """
+'''
+
+
+@pytest.fixture
+def package(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "upstream.py").write_text(UPSTREAM)
+    (pkg / "downstream.py").write_text(DOWNSTREAM)
+    return pkg
+
+
+def test_module_name(package):
+    assert module_name(str(package / "upstream.py")) == "pkg.upstream"
+    assert module_name(str(package / "__init__.py")) == "pkg"
+
+
+def test_read_imports():
+    tree = ast.parse(
+        "from .upstream import Session\n"
+        "if True:\n"
+        "    from .lab import Lab\n"
+        "try:\n"
+        "    import numpy as np\n"
+        "except ImportError:\n"
+        "    from . import fallback as np\n"
+        "def load():\n"
+        "    from .other import Session\n"
+        "class Table:\n"
+        "    from .other import Lab\n"
+    )
+    assert read_imports(tree, "pkg.downstream", False) == dict(
+        Session="pkg.upstream.Session",
+        Lab="pkg.lab.Lab",
+        np="pkg.fallback",
+    )
+
+
+def test_index(package):
+    index = TableIndex([str(package)], DataJointLinter.CHECKED_CLASSES)
+    assert len(index) == 3
+    assert index.has_module("pkg.downstream")
+
+    trial = index.get("pkg.downstream", "Trial")
+    epoch = index.resolve("pkg.downstream", "up.Session.Epoch")
+    assert epoch == index.get("pkg.upstream", "Session.Epoch")
+    assert index.resolve("pkg.downstream", "up.Missing") is None
+
+    assert index.primary_key(trial) == ("session_id", "trial_id")
+    assert index.primary_key(epoch) == ("session_id", "epoch")
+
+
+def test_index_update(package):
+    index = TableIndex([str(package)], DataJointLinter.CHECKED_CLASSES)
+    assert index.update() == []
+
+    path = package / "upstream.py"
+    path.write_text(UPSTREAM.replace("class Session", "class Other"))
+    os.utime(path, (0, 0))
+    assert index.update() == [str(path)]
+    assert index.get("pkg.upstream", "Session") is None
+    assert index.get("pkg.upstream", "Other") is not None
+
+
+def test_index_reexport(package):
+    (package / "__init__.py").write_text("from .upstream import Session\n")
+    (package / "util.py").write_text("from .upstream import Session\n")
+    index = TableIndex([str(package)], DataJointLinter.CHECKED_CLASSES)
+    assert index.locate("pkg.Session") == ("pkg.upstream", "Session")
+    assert index.locate("pkg.Missing") == ("pkg", "Missing")
+    assert index.locate("pkg.util.Session") == (None, None)  # not read
+
+
+class TestIndexedLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    _table = '''
+    class Trial(dj.Manual):
+        definition = """
+        -> {ref}
+        trial_id : int
+        """
+    '''
+
+    def _check(self, package, imports, ref):
+        self.linter.config.dj_index_roots = [str(package)]
+        self.checker.open()
+        for statement in imports:
+            node = astroid.extract_node(statement)
+            getattr(self.checker, f"visit_{node.__class__.__name__.lower()}")(
+                node
+            )
+        node = astroid.extract_node(self._table.format(ref=ref))
+        self.checker.visit_classdef(node)
+        return node
+
+    def test_indexed_fk(self, package):
+        with self.assertNoMessages():
+            self._check(package, ["import pkg.upstream as up"], "up.Session")
+
+    def test_indexed_missing(self, package):
+        self._check(package, ["import pkg.upstream as up"], "up.Missing")
+        (msg,) = self.linter.release_messages()
+        assert msg.msg_id == "definition-error"
+        assert repr(msg.args[1]) == repr(
+            DataJointError(
+                "Foreign key reference up.Missing could not be resolved"
+            )
+        )
+
+    def test_reexported_fk(self, package):
+        (package / "__init__.py").write_text("from .upstream import Session\n")
+        with self.assertNoMessages():
+            self._check(package, ["from pkg import Session"], "Session")
+
+    def test_index_built_once(self, package):
+        self._check(package, ["import pkg.upstream as up"], "up.Session")
+        path = package / "upstream.py"
+        path.write_text(UPSTREAM.replace("class Session", "class Other"))
+        os.utime(path, (0, 0))
+        self.checker.open()
+        assert self.checker._index.get("pkg.upstream", "Session") is not None
+        assert self.checker.refresh_index()
+        assert self.checker._index.get("pkg.upstream", "Session") is None
+
+    def test_unindexed_module(self, package):
+        with self.assertNoMessages():
+            self._check(package, ["import other"], "other.Missing")
+
+
+def test_index_bases(tmp_path):
+    (tmp_path / "mod.py").write_text(
+        """
+from datajoint import Manual
+import datajoint
+
+class Mixin:
+    pass
+
+class Imported(Manual):
+    definition = "key : int"
+
+class Second(Mixin, datajoint.Lookup):
+    definition = "key : int"
+
+class Plain(Mixin):
+    definition = "key : int"
+"""
+    )
+    index = TableIndex([str(tmp_path)], DataJointLinter.CHECKED_CLASSES)
+    assert sorted(entry.name for entry in index) == ["Imported", "Second"]
@@ -353,3 +353,173 @@ class TestDataJointLinter(CheckerTestCase):
             ),
         ):
             self.checker.visit_classdef(my_class)
+
+    def test_all_fk_errors(self):
+        my_class = astroid.extract_node(
+            '''
+            class ManyErrs(dj.Manual): #@
+                definition = """
+                -> FakeTable
+                -> [nullable] GoodTable1
+                key : int
+                ---
+                -> [nonoption] OtherFake
+                value : badtype
+                """
+            '''
+        )
+        self.checker._class_namespace.add("GoodTable1")
+        self.checker.visit_classdef(my_class)
+        got = [
+            (
+                msg.msg_id,
+                msg.args if isinstance(msg.args, str) else str(msg.args[1]),
+            )
+            for msg in self.linter.release_messages()
+        ]
+        assert got == [
+            (
+                "definition-error",
+                "Foreign key reference FakeTable could not be resolved",
+            ),
+            ("null-pk-ref", "ManyErrs"),
+            ("bad-opt", "NONOPTION"),
+            (
+                "definition-error",
+                "Foreign key reference  OtherFake could not be resolved",
+            ),
+            ("definition-error", "Unsupported attribute type badtype"),
+        ]
+
+    def test_fk_comment(self):
+        my_class = astroid.extract_node(
+            '''
+            class Commented(dj.Manual): #@
+                definition = """
+                -> [nullable] GoodTable1  # the table
+                key : int
+                """
+            '''
+        )
+        self.checker._class_namespace.add("GoodTable1")
+        self.checker.visit_classdef(my_class)
+        got = [msg.msg_id for msg in self.linter.release_messages()]
+        assert got == ["null-pk-ref"]
+
+    def test_folded_definition(self):
+        module = astroid.parse(
+            '''
+            KEY = """
+            key : int
+            """
+
+            class Folded(dj.Manual):
+                definition = KEY + "---\\n" + """value : badtype"""
+
+            class Inferred(dj.Manual):
+                definition = "%s : int" % "key"
+
+            class Method(dj.Manual):
+                @property
+                def definition(self):
+                    return "key : int"
+            '''
+        )
+        folded, inferred, method = module.body[1:]
+        assert self.checker._get_def(folded).split() == [
+            *("key", ":", "int", "---"),
+            *("value", ":", "badtype"),
+        ]
+        assert not self.checker._inferred
+        assert self.checker._get_def(inferred) == "key : int"
+        assert self.checker._get_def(method) is None
+        assert len(self.checker._inferred) == 1
+
+    def _check_module(self, source, name):
+        module = astroid.parse(source, module_name=name)
+        self.walk(module)
+        return module
+
+    def test_module_scope(self):
+        self._check_module(
+            """
+            import datajoint as dj
+
+            class Session(dj.Manual):
+                definition = "session_id : int"
+            """,
+            "pkg.upstream",
+        )
+        assert not self.linter.release_messages()
+        assert len(self.checker._symbols) == 1
+
+        self._check_module(  # not imported, and module not yet checked
+            '''
+            import datajoint as dj
+            from pkg.upstream import Session
+            from pkg.other import Other
+
+            class Trial(dj.Manual):
+                definition = """
+                -> Session
+                -> Other
+                trial_id : int
+                """
+            ''',
+            "pkg.downstream",
+        )
+        assert not self.linter.release_messages()
+
+        self._check_module(
+            '''
+            import datajoint as dj
+            from pkg import upstream
+
+            class Trial(dj.Manual):
+                definition = """
+                -> Session
+                -> upstream.Missing
+                trial_id : int
+                """
+            ''',
+            "pkg.unimported",
+        )
+        got = [str(msg.args[1]) for msg in self.linter.release_messages()]
+        assert got == [
+            "Foreign key reference Session could not be resolved",
+            "Foreign key reference upstream.Missing could not be resolved",
+        ]
+
+    def test_table_bases(self):
+        self.linter.config.dj_table_bases = ("pkg.base.Custom",)
+        self.checker.open()
+        module = self._check_module(
+            """
+            import datajoint as dj
+            from datajoint import Computed
+            from pkg.base import Custom
+
+            class Mixin:
+                pass
+
+            class Base(Mixin, dj.Manual):
+                definition = "key : int"
+
+            class Child(Base):
+                pass
+
+            class Imported(Computed):
+                definition = "key : int"
+
+            class Configured(Custom):
+                definition = "key : int"
+
+            class Plain(Mixin):
+                pass
+            """,
+            "pkg.tables",
+        )
+        kinds = [self.checker._table_kind(node) for node in module.body[3:]]
+        assert kinds == [None, "Manual", "Manual", "Computed", "Table", None]
+        assert not self.linter.release_messages()  # Child inherits definition
+        assert self.checker._base_kinds["pkg.tables.Mixin"] is None
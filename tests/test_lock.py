@@ -0,0 +1,158 @@
+import io
+import json
+
+import astroid
+import pytest
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.cli import prune_lock, run
+from datajoint_linter.lock import DefinitionLock, LockEntry, classify
+from datajoint_linter.main import DataJointLinter
+
+DEFINITION = """
+# Session table
+-> Subject
+session_id : int  # id
+---
+-> [nullable] Lab
+name : varchar(32)
+score : decimal(5,2)
+"""
+
+
+def _classify(old, new):
+    return classify(
+        LockEntry.from_definition(old), LockEntry.from_definition(new)
+    )
+
+
+@pytest.mark.parametrize(
+    "old, new, kinds",
+    [
+        ("# id", "# session id", ["comment-only"]),
+        ("-> Subject", "-> Subject  # the subject", ["comment-only"]),
+        ("Session table", "Sessions", ["comment-only"]),
+        (
+            "-> Subject",
+            "-> Animal",
+            ["primary key change", "foreign key change"],
+        ),
+        (
+            "session_id : int",
+            "session_id : bigint",
+            ["primary key change", "type widening"],
+        ),
+        ("[nullable] Lab", "Lab", ["foreign key change"]),
+        ("varchar(32)", "varchar(64)", ["type widening"]),
+        ("decimal(5,2)", "decimal(7,3)", ["type widening"]),
+        ("decimal(5,2)", "decimal(5,3)", ["type change"]),
+        ("varchar(32)", "int", ["type change"]),
+        ("score :", "score = null :", ["attribute change"]),
+    ],
+)
+def test_classify(old, new, kinds):
+    assert _classify(DEFINITION, DEFINITION.replace(old, new)) == kinds
+
+
+@pytest.mark.parametrize(
+    "old, new, kinds",
+    [
+        ("-> Subject", "-> Subject  # the subject", ["comment-only"]),
+        (
+            "-> Subject",
+            "-> Animal",
+            ["primary key change", "foreign key change"],
+        ),
+        ("[nullable] Lab", "Lab", ["foreign key change"]),
+        ("varchar(32)", "varchar(64)", ["type widening"]),
+    ],
+)
+def test_classify_unsupported(old, new, kinds):
+    definition = DEFINITION + "raw : filepath@store\n"  # not parsed natively
+    assert _classify(definition, definition.replace(old, new)) == kinds
+
+
+def test_lock(tmp_path):
+    path = tmp_path / "dj.lock"
+    lock = DefinitionLock(str(path))
+    assert lock.check("pkg.Session", DEFINITION) is None  # not locked
+    lock.update("pkg.Session", DEFINITION)
+    lock.save()
+    assert "pkg.Session" in json.loads(path.read_text())["tables"]
+
+    lock = DefinitionLock(str(path))
+    assert len(lock) == 1
+    assert lock.check("pkg.Session", "  " + DEFINITION + "\n") is None
+    assert lock.check("pkg.Session", DEFINITION.replace("# id", "")) == [
+        "comment-only"
+    ]
+
+
+def test_lock_parallel(tmp_path):
+    pkg, path = tmp_path / "pkg", tmp_path / "dj.lock"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for idx in range(24):
+        (pkg / f"m{idx}.py").write_text(
+            "import datajoint as dj\n"
+            f"class Table{idx}(dj.Manual):\n"
+            '    definition = "k : int"\n'
+        )
+    options = dict(dj_lockfile=str(path), dj_lock_update=True)
+    run([str(pkg)], options, jobs=4, output=io.StringIO())
+    assert len(json.loads(path.read_text())["tables"]) == 24
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dj.lock", "pkg"]
+
+
+def test_lock_prune(tmp_path):
+    pkg, path = tmp_path / "pkg", tmp_path / "dj.lock"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for name in ("Session", "Trial"):
+        (pkg / f"{name.lower()}.py").write_text(
+            "import datajoint as dj\n"
+            f"class {name}(dj.Manual):\n"
+            '    definition = "k : int"\n'
+        )
+    options = dict(dj_lockfile=str(path), dj_lock_update=True)
+    run([str(pkg)], options, jobs=1, output=io.StringIO())
+    (pkg / "trial.py").unlink()
+    run([str(pkg)], options, jobs=1, output=io.StringIO())
+    assert len(json.loads(path.read_text())["tables"]) == 2  # only added
+
+    output = io.StringIO()
+    assert prune_lock([str(pkg)], str(path), output=output) == 0
+    assert output.getvalue().splitlines()[0] == "pruned: pkg.trial.Trial"
+    assert list(json.loads(path.read_text())["tables"]) == [
+        "pkg.session.Session"
+    ]
+
+
+class TestLockLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    _table = '''
+    class Session(dj.Manual): #@
+        definition = """
+        session_id : {type}
+        """
+    '''
+
+    def _check(self, tmp_path, update, type_):
+        self.linter.config.dj_lockfile = str(tmp_path / "dj.lock")
+        self.linter.config.dj_lock_update = update
+        self.checker._lock = None
+        self.checker.open()
+        node = astroid.extract_node(self._table.format(type=type_))
+        self.checker.visit_classdef(node)
+        self.checker.close()
+        return node
+
+    def test_definition_changed(self, tmp_path):
+        with self.assertNoMessages():
+            self._check(tmp_path, True, "int")
+            self._check(tmp_path, False, "int")
+        self._check(tmp_path, False, "bigint")
+        (msg,) = self.linter.release_messages()
+        assert msg.msg_id == "definition-changed"
+        assert msg.args == ("Session", "primary key change, type widening")
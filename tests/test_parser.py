@@ -0,0 +1,146 @@
+import timeit
+
+import astroid
+import pytest
+from astroid import nodes
+from datajoint.declare import prepare_declare
+from datajoint.errors import DataJointError
+from pylint.testutils import UnittestLinter
+
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.parser import (
+    UnsupportedDefinition,
+    parse_definition,
+    parse_foreign_key,
+    parse_foreign_keys,
+)
+
+SCHEMAS = ("./tests/schema_good.py", "./tests/schema_bad.py")
+
+
+def _classdefs():
+    """Returns all classdef nodes of the test schemas"""
+    classes = []
+    for schema in SCHEMAS:
+        with open(schema) as f:
+            module = astroid.parse(f.read())
+        classes.extend(module.nodes_of_class(nodes.ClassDef))
+    return classes
+
+
+def _definitions():
+    """Returns all constant definition strings of the test schemas"""
+    return [
+        node.locals["definition"][0].parent.value.value
+        for node in _classdefs()
+        if "definition" in node.locals
+    ]
+
+
+def _lint(native: bool):
+    """Returns messages from checking all test tables with given parser"""
+    linter = UnittestLinter()
+    checker = DataJointLinter(linter)
+    linter.config.dj_native_parser = native
+    checker.open()
+    checker._class_namespace.add("GoodTable1")
+    checker._module_namespace.add("dj")
+    for node in _classdefs():
+        checker.visit_classdef(node)
+    checker.close()
+    return linter.release_messages()
+
+
+def test_conformance():
+    native, fallback = _lint(native=True), _lint(native=False)
+    assert len(native) == len(fallback)
+    for native_msg, fallback_msg in zip(native, fallback):
+        assert native_msg.msg_id == fallback_msg.msg_id
+        assert native_msg.node.name == fallback_msg.node.name
+        assert repr(native_msg.args) == repr(fallback_msg.args)
+
+
+@pytest.mark.parametrize("definition", _definitions())
+def test_definition_conformance(definition):
+    try:
+        parsed = parse_definition(definition)
+    except UnsupportedDefinition:
+        return  # covered by fallback
+    try:
+        _, primary_key, *_ = prepare_declare(definition, context={})
+    except DataJointError as error:
+        assert error.args[0] == (
+            "Foreign key reference %s could not be resolved"
+            % parsed.foreign_keys[0].ref
+        )
+    else:
+        assert not parsed.foreign_keys
+        assert parsed.primary_key == primary_key
+
+
+def test_native_coverage():
+    supported = []
+    for definition in _definitions():
+        try:
+            supported.append(parse_definition(definition))
+        except UnsupportedDefinition:
+            pass
+    assert len(supported) >= 8
+
+
+def test_fk_options():
+    fk = parse_foreign_key("-> [unique, nullable] GoodTable1.proj(new='key')")
+    assert fk.options == ("UNIQUE", "NULLABLE")
+    assert fk.name == "GoodTable1"
+    assert fk.ref == " GoodTable1.proj(new='key')"
+
+
+def test_fk_comment():
+    fk = parse_foreign_key("-> [nullable] Session  # the session [1]")
+    assert fk.options == ("NULLABLE",)
+    assert fk.ref.strip() == "Session"
+    assert fk.line == "-> [nullable] Session  # the session [1]"
+    fk = parse_foreign_key("-> Session.proj(s='#') # renamed")
+    assert fk.ref.strip() == "Session.proj(s='#')"
+    definition = "-> Session # id\n---\n-> [nullable] Nwbfile # file"
+    assert [fk.name for fk in parse_foreign_keys(definition)] == [
+        "Session",
+        "Nwbfile",
+    ]
+
+
+def test_fk_memoized():
+    definition = "-> Session\nkey : int\n---\n-> [nullable] Nwbfile"
+    first = parse_foreign_keys(definition)
+    hits = parse_foreign_key.cache_info().hits
+    second = parse_foreign_keys(
+        " -> Session \n key : int\n---\n-> [nullable] Nwbfile"
+    )
+    assert parse_foreign_key.cache_info().hits == hits + 2
+    assert [fk.in_key for fk in second] == [True, False]
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_throughput():
+    definitions = []
+    for definition in _definitions():
+        try:
+            parse_definition(definition)
+        except UnsupportedDefinition:
+            continue
+        definitions.append(definition)
+
+    def _native():
+        for definition in definitions:
+            parse_definition(definition)
+
+    def _fallback():
+        for definition in definitions:
+            try:
+                prepare_declare(definition, context={})
+            except DataJointError:
+                pass
+
+    native = min(timeit.repeat(_native, number=20, repeat=3))
+    fallback = min(timeit.repeat(_fallback, number=20, repeat=3))
+    assert native < fallback, f"native {native:.4f}s, dj {fallback:.4f}s"
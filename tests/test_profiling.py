@@ -0,0 +1,58 @@
+import astroid
+import pytest
+from pylint.exceptions import EmptyReportError
+from pylint.reporters.ureports.nodes import Section, Table
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.profiling import Profiler
+
+
+def test_profiler_merge():
+    profiler, other = Profiler(), Profiler()
+    profiler.record("_get_def", 0.1)
+    other.record("_get_def", 0.3)
+    other.record("_fk_check", 0.2)
+    profiler.merge(other.data())
+
+    assert profiler.methods["_get_def"] == (2, pytest.approx(0.4), 0.3)
+    assert profiler.methods["_fk_check"] == (1, 0.2, 0.2)
+
+
+class TestProfiledLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    def _table_rows(self, report):
+        section = Section()
+        report(section, None, None)
+        (table,) = [c for c in section.children if isinstance(c, Table)]
+        cells = [child.data for child in table.children]
+        return [
+            cells[i : i + table.cols] for i in range(0, len(cells), table.cols)
+        ]
+
+    def test_disabled(self, test_cases_good):
+        self.checker.visit_classdef(astroid.extract_node(test_cases_good[1]))
+        assert self.checker.get_map_data()["profile"] is None
+        with pytest.raises(EmptyReportError):
+            self.checker._report_timings(Section(), None, None)
+
+    def test_profiled(self, test_cases_good):
+        self.linter.config.dj_profile = True
+        self.linter.config.dj_profile_top = 2
+        self.checker.open()
+        for case in test_cases_good[1:5]:
+            self.checker.visit_classdef(astroid.extract_node(case))
+
+        profiler = self.checker._profiler
+        assert len(profiler.tables) == 4
+        assert profiler.methods["_get_def"][0] == 4
+
+        rows = self._table_rows(self.checker._report_tables)
+        assert rows[0] == ["table", "module", "line", "time (ms)"]
+        assert len(rows) == 3
+
+        data = self.checker.get_map_data()
+        self.checker._profiler = None
+        self.checker.reduce_map_data(self.linter, [data] * 2)
+        assert len(self.checker._profiler.tables) == 8
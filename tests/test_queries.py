@@ -0,0 +1,256 @@
+import astroid
+import pytest
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.queries import (
+    enclosing_loop,
+    make_phases,
+    table_expression,
+)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("Session", ("Session", False, False)),
+        ("Session()", ("Session", False, False)),
+        ("m.Session.Part", ("m.Session.Part", False, False)),
+        ("(Session & key)", ("Session", True, False)),
+        ("Session.proj() - Trial", ("Session", True, True)),
+        ("Session * (Trial & key)", ("Session", True, False)),
+        ("Session.restrict(key)", ("Session", True, False)),
+        ("Session.proj(a='b').aggr(Trial, n='count(*)')", ("Session", 0, 1)),
+        ("rows[0]", None),
+        ("get_table(key)", None),
+    ],
+)
+def test_table_expression(source, expected):
+    expression = table_expression(astroid.extract_node(source))
+    assert (expression and expression[:3]) == expected
+
+
+@pytest.mark.parametrize(
+    "source, in_loop",
+    [
+        ("for k in keys:\n    f(k) #@", True),
+        ("for k in f(): #@\n    pass", False),
+        ("while f(): #@\n    pass", True),
+        ("for k in keys:\n    pass\nelse:\n    f() #@", False),
+        ("[f(k) for k in keys] #@", True),
+        ("[k for k in f()] #@", False),
+        ("[k for k in keys if f(k)] #@", True),
+        ("[j for k in keys for j in f(k)] #@", True),
+        ("for k in keys:\n    def g():\n        f() #@", False),
+    ],
+)
+def test_enclosing_loop(source, in_loop):
+    node = astroid.extract_node(source)
+    call = next(node.nodes_of_class(astroid.nodes.Call))
+    assert (enclosing_loop(call) is not None) == in_loop
+
+
+class TestQueryLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    def test_fetch_in_loop(self):
+        module = astroid.parse(
+            '''
+            import datajoint as dj
+
+            class Result(dj.Computed):
+                definition = """
+                -> Session
+                """
+
+                def make(self, key):
+                    trials = (Trial & key).fetch("KEY")
+                    for trial in trials:
+                        (Trial & trial).fetch1("value")
+                    names = [
+                        (Session & k).fetch1("name") for k in trials
+                    ]
+                    rows = local.fetch()
+                    for row in Trial.fetch(as_dict=True):
+                        pass
+
+            class Session(dj.Manual):
+                definition = "session_id : int"
+
+            class Trial(dj.Manual):
+                definition = "-> Session\\ntrial_id : int"
+            '''
+        )
+        self.checker.visit_module(module)
+        self.checker.visit_classdef(module.body[1])
+        got = [
+            (msg.msg_id, msg.args, msg.node.lineno)
+            for msg in self.linter.release_messages()
+            if msg.msg_id == "fetch-in-loop"
+        ]
+        assert got == [
+            ("fetch-in-loop", ("Result", "fetch1", 11), 12),
+            ("fetch-in-loop", ("Result", "fetch1", 13), 14),
+        ]
+
+    def test_insert_in_loop(self):
+        module = astroid.parse(
+            """
+            import datajoint as dj
+
+            class Session(dj.Manual):
+                definition = "session_id : int"
+
+            class Result(dj.Computed):
+                definition = "-> Session"
+
+                class Value(dj.Part):
+                    definition = "-> master\\nidx : int"
+
+                def make(self, key):
+                    for idx in range(3):
+                        self.Value.insert1(dict(key, idx=idx))
+                    self.insert1(key)
+
+            for idx in range(3):
+                Session.insert1(dict(session_id=idx))
+            Session.insert([dict(session_id=3)])
+
+            def load(rows):
+                for row in rows:
+                    Session.insert1(row)
+            """
+        )
+        self.walk(module)
+        got = [
+            (msg.msg_id, msg.args, msg.node.lineno)
+            for msg in self.linter.release_messages()
+        ]
+        assert got == [
+            ("insert-in-loop", ("Result", "insert1", 14), 15),
+            ("insert-in-loop", ("Session", "insert1", 18), 19),
+        ]
+
+    def test_not_tables(self):
+        module = astroid.parse(
+            """
+            import sys
+            import datajoint as dj
+            import numpy as np
+
+            class Result(dj.Computed):
+                definition = "result : int"
+                log = []
+
+                def make(self, key):
+                    values = np.zeros(3)
+                    for idx in range(3):
+                        values = np.insert(values, idx, 1.0)
+                        self.log.insert(0, idx)
+                    self.insert1(key)
+
+            for path in ["lib"]:
+                sys.path.insert(0, path)
+            paths = []
+            for path in ["lib"]:
+                paths.insert(0, path)
+            rows = paths.fetch()
+            """
+        )
+        self.walk(module)
+        assert not [
+            msg
+            for msg in self.linter.release_messages()
+            if msg.msg_id in ("insert-in-loop", "unrestricted-fetch")
+        ]
+
+    _fetches = """
+        import datajoint as dj
+
+        class Kind(dj.Lookup):
+            definition = "kind : varchar(8)"
+
+        class Session(dj.Manual):
+            definition = "session_id : int"
+
+        kinds = Kind.fetch("kind")
+        sessions = Session().fetch(as_dict=True)
+        keys = Session.fetch("KEY")
+        some = Session.fetch(limit=10)
+        restricted = (Session & "session_id > 3").fetch()
+        projected = Session.proj().fetch()
+        one = Session.fetch1()
+        """
+
+    def test_unrestricted_fetch(self):
+        self.walk(astroid.parse(self._fetches))
+        got = [
+            (msg.msg_id, msg.args, msg.node.lineno)
+            for msg in self.linter.release_messages()
+        ]
+        assert got == [
+            ("unrestricted-fetch", ("Session", "Session", "fetch"), 11),
+            ("unrestricted-fetch", ("Session", "Session", "fetch"), 12),
+        ]
+
+    def test_lookup_fetch(self):
+        self.linter.config.dj_allow_lookup_fetch = False
+        self.walk(astroid.parse(self._fetches))
+        assert len(self.linter.release_messages()) == 3
+
+    _make = """
+        import datajoint as dj
+        import numpy as np
+
+        class Session(dj.Manual):
+            definition = "session_id : int"
+
+        class Result(dj.{kind}):
+            definition = "-> Session"
+
+            def make(self, key):
+                data = (Session & key).fetch1()
+                filtered = np.convolve(data, np.ones(10))
+                spectrum = np.fft.fft(filtered)
+                peaks = find_peaks(np.abs(spectrum))
+                key.update(n=len(peaks))
+                self.insert1(key)
+        """
+
+    def _split_make(self, kind="Computed"):
+        self.walk(astroid.parse(self._make.format(kind=kind)))
+        return [
+            msg
+            for msg in self.linter.release_messages()
+            if msg.msg_id == "split-make"
+        ]
+
+    def test_split_make(self):
+        (msg,) = self._split_make()
+        assert msg.args == ("Result", 5, 12, 17)
+        assert msg.node.name == "make"
+
+        assert not self._split_make("Manual")
+        self.linter.config.dj_make_compute_calls = 6
+        assert not self._split_make()
+
+
+def _is_table(expression):
+    return expression.name.partition(".")[0] in ("self", "Session")
+
+
+def test_make_phases():
+    source = """
+        from pipeline import Session
+
+        def make(self, key):
+            data = (Session & key).fetch1()
+            result = compute(data)
+            self.insert1(result)
+        """
+    phases = make_phases(astroid.parse(source).body[1], _is_table)
+    assert (phases.last_fetch.lineno, phases.first_insert.lineno) == (5, 7)
+    assert phases.compute_calls == 1
+
+    interleaved = source + "    more = (Session & key).fetch()\n"
+    assert make_phases(astroid.parse(interleaved).body[1], _is_table) is None
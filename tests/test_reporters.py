@@ -0,0 +1,124 @@
+import io
+import json
+import re
+
+from pylint.interfaces import UNDEFINED
+from pylint.message import Message
+from pylint.typing import MessageLocationTuple
+
+from datajoint_linter.cli import _make_linter, run
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.reporters import NDJSONReporter, message_data
+
+OPTIONS = dict(permit_dj_filepath=False)
+
+
+class _Lines(io.StringIO):
+    """Records the text written by each flush"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed = []
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+
+
+def test_ndjson():
+    output = _Lines()
+    status = run(
+        ["./tests/schema_bad.py"],
+        OPTIONS,
+        jobs=1,
+        output=output,
+        output_format="ndjson",
+    )
+    assert status == 16
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(output.flushed) >= len(messages)  # one flush per message
+    by_table = {msg.get("table"): msg for msg in messages}
+
+    assert by_table["DataTypeErr"]["attribute_type"] == "badtype"
+    assert by_table["BadFKRef"]["ref"] == "FakeTable"
+    assert by_table["BadFKOpt"]["option"] == "NONOPTION"
+    assert by_table["NullablePK"]["definition_line"].startswith("key=null")
+    assert by_table["NoPK"]["symbol"] == "no-pk"
+    assert by_table["NoPK"]["error"] == "Table must have a primary key."
+    assert by_table[None]["symbol"] == "dj-wildcard-import"
+
+
+def test_sarif():
+    output = io.StringIO()
+    run(
+        ["./tests/schema_bad.py"],
+        OPTIONS,
+        jobs=1,
+        output=output,
+        output_format="sarif",
+    )
+    (sarif_run,) = json.loads(output.getvalue())["runs"]
+    rules = {rule["id"] for rule in sarif_run["tool"]["driver"]["rules"]}
+    results = sarif_run["results"]
+    assert {result["ruleId"] for result in results} <= rules
+    result = next(r for r in results if r["properties"].get("ref"))
+    assert result["properties"]["table"] == "BadFKRef"
+    assert result["locations"][0]["physicalLocation"]["region"] == {
+        "startLine": 28,
+        "startColumn": 1,
+        "endLine": 28,
+        "endColumn": 15,
+    }
+
+
+def test_sarif_empty():
+    output = io.StringIO()
+    run([], OPTIONS, jobs=1, output=output, output_format="sarif")
+    assert json.loads(output.getvalue())["runs"][0]["results"] == []
+
+
+def test_registered():
+    linter = _make_linter(OPTIONS)
+    assert linter._reporters["dj-ndjson"] is NDJSONReporter
+
+
+def test_message_fields():
+    location = MessageLocationTuple("m", "m.py", "m.py", "", 1, 0, 1, 1)
+    for msg_id, (template, symbol, _) in DataJointLinter.msgs.items():
+        fields = DataJointLinter.MSG_FIELDS[msg_id]
+        args = tuple(
+            7 if placeholder == "%d" else f"{field} value"
+            for field, placeholder in zip(
+                fields, re.findall(r"%[sd]", template)
+            )
+        )
+        message = Message(
+            msg_id,
+            symbol,
+            location,
+            template % args if args else template,
+            UNDEFINED,
+        )
+        data = message_data(message)
+        for field, arg in zip(fields, args):
+            lists = ("cycle", "changes")  # split on their separators
+            assert data[field] == ([arg] if field in lists else arg)
+
+
+def test_typed_fields(tmp_path):
+    (tmp_path / "tables.py").write_text(
+        "import datajoint as dj\n"
+        "class Wide(dj.Manual):\n"
+        '    definition = "name : varchar(1000)"\n'
+        "    def make(self, key):\n"
+        "        for k in keys:\n"
+        "            Wide.insert1(k)\n"
+    )
+    output = io.StringIO()
+    run([str(tmp_path)], OPTIONS, jobs=1, output=output, output_format="ndjson")
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    by_symbol = {msg["symbol"]: msg for msg in messages}
+    assert by_symbol["wide-pk"]["width"] == 4000
+    assert by_symbol["wide-pk"]["limit"] == 3072
+    assert by_symbol["wide-pk"]["limit_name"] == "MySQL limit"
+    assert by_symbol["insert-in-loop"]["loop"] == 5
+    assert by_symbol["insert-in-loop"]["method"] == "insert1"
@@ -0,0 +1,156 @@
+import ast
+import io
+
+import pytest
+
+from datajoint_linter.cli import main, report_restrictions
+from datajoint_linter.index import TableIndex
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.restrictions import (
+    conditions,
+    find_restrictions,
+    table_indexes,
+    unindexed_restrictions,
+    unserved,
+)
+
+TABLES = '''
+import datajoint as dj
+
+class Subject(dj.Manual):
+    definition = """
+    subject : int
+    ---
+    species : varchar(32)
+    sex : enum("M", "F")
+    """
+
+class Session(dj.Manual):
+    definition = """
+    -> Subject
+    session : int
+    ---
+    -> [nullable] Rig
+    session_date : date
+    operator : varchar(32)
+    index(session_date, operator)
+    """
+
+    def sessions(self, date):
+        return (self & {"session_date": date, "operator": "me"}).fetch()
+
+    class Trial(dj.Part):
+        definition = """
+        -> master
+        trial : int
+        ---
+        outcome : varchar(8)
+        """
+
+        def hits(self):
+            return self & "outcome = 'hit'"
+
+class Rig(dj.Lookup):
+    definition = """
+    rig : varchar(8)
+    """
+'''
+
+QUERIES = """
+from .tables import Session, Subject
+from . import tables
+
+def queries(date, subject):
+    Subject & {"species": "mouse"}
+    Subject() & dict(species="rat", sex="F")
+    Subject.proj() & "species = 'mouse' and `sex` in ('M')"
+    Session & f"operator = '{subject}'"
+    Session.restrict({"session_date": date})
+    tables.Session & {"rig": 1, "unknown": 2}
+    Session & [{"subject": 1}, "session > 3"]
+    Session & subject
+    (Session * Subject) & {"species": "mouse"}
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "tables.py").write_text(TABLES)
+    (pkg / "queries.py").write_text(QUERIES)
+    return TableIndex([str(tmp_path)], DataJointLinter.CHECKED_CLASSES)
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ('{"a": 1, "b": x}', [("a", "b")]),
+        ("dict(a=1, **key)", [("a",)]),
+        ("\"a = 'b = c' AND c>2 and d IS NULL\"", [("a", "c", "d")]),
+        ("f'a = {x} and b not like \"%\"'", [("a", "b")]),
+        ('[{"a": 1}, "b < 2"]', [("a",), ("b",)]),
+        ("key", []),
+    ],
+)
+def test_conditions(source, expected):
+    assert conditions(ast.parse(source, mode="eval").body) == expected
+
+
+def test_unserved():
+    indexes = [("subject", "session"), ("session_date", "operator")]
+    assert unserved(("subject",), indexes) == ()
+    assert unserved(("session",), indexes) == ("session",)
+    assert unserved(("operator", "session_date"), indexes) == ()
+    assert unserved(("operator",), indexes) == ("operator",)
+
+
+def test_find_restrictions(index):
+    found = {
+        (".".join(r.table), r.attributes) for r in find_restrictions(index)
+    }
+    assert found == {
+        ("pkg.tables.Session", ("session_date", "operator")),
+        ("pkg.tables.Session.Trial", ("outcome",)),
+        ("pkg.tables.Subject", ("species",)),
+        ("pkg.tables.Subject", ("species", "sex")),
+        ("pkg.tables.Session", ("operator",)),
+        ("pkg.tables.Session", ("session_date",)),
+        ("pkg.tables.Session", ("rig", "unknown")),
+        ("pkg.tables.Session", ("subject",)),
+        ("pkg.tables.Session", ("session",)),
+    }
+
+
+def test_table_indexes(index):
+    session = index.get("pkg.tables", "Session")
+    assert table_indexes(index, session) == [
+        ("subject", "session"),
+        ("session_date", "operator"),
+        ("subject",),
+        ("rig",),
+    ]
+
+
+def test_unindexed_restrictions(index):
+    unindexed = unindexed_restrictions(index)
+    assert [(".".join(u.table), u.attribute, u.count) for u in unindexed] == [
+        ("pkg.tables.Subject", "species", 3),
+        ("pkg.tables.Subject", "sex", 2),
+        ("pkg.tables.Session", "operator", 1),
+        ("pkg.tables.Session", "session", 1),
+        ("pkg.tables.Session.Trial", "outcome", 1),
+    ]
+    assert unindexed[0].path.endswith("queries.py")
+    assert unindexed[0].line == 6
+
+
+def test_report_restrictions(index):
+    output = io.StringIO()
+    assert report_restrictions(index.roots, top=2, output=output) == 16
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "4 tables, 5 attributes restricted without an index"
+    assert lines[1].startswith("unindexed:      3 pkg.tables.Subject.species (")
+    assert len(lines) == 3
+    assert main(index.roots + ["--restrictions", "--top", "2"]) == 16
@@ -0,0 +1,95 @@
+import astroid
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.parser import parse_definition
+from datajoint_linter.secondary import (
+    bad_index_types,
+    describe,
+    redundant_indexes,
+)
+
+DEFINITION = """
+subject : varchar(32)
+session_id : int
+---
+rig : varchar(32)
+operator : varchar(32)
+notes : varchar(1024)
+data : longblob
+index(subject)
+index(rig, operator)
+index(rig)
+unique index(rig, operator)
+unique index(operator)
+index(operator)
+index(notes)
+index(data)
+"""
+
+
+def test_redundant_indexes():
+    parsed = parse_definition(DEFINITION)
+    redundant = {
+        describe(index): covered_by and describe(covered_by)
+        for index, covered_by in redundant_indexes(
+            parsed, ["subject", "session_id"]
+        )
+    }
+    assert redundant == {
+        "index(subject)": None,  # primary key
+        "index(rig, operator)": "unique index(rig, operator)",
+        "index(rig)": "index(rig, operator)",
+        "index(operator)": "unique index(operator)",
+    }
+    assert len(redundant_indexes(parsed, None)) == 3
+
+
+def test_duplicate_index():
+    parsed = parse_definition("key : int\n---\na : int\nindex(a)\nindex(a)")
+    ((index, covered_by),) = redundant_indexes(parsed, ["key"])
+    assert index is parsed.indexes[1] and covered_by is parsed.indexes[0]
+
+
+def test_bad_index_types():
+    parsed = parse_definition(DEFINITION)
+    types = {attr.name: attr.type for attr in parsed.attributes}
+    bad = [
+        (attr, kind) for _, attr, kind in bad_index_types(parsed, types, 255)
+    ]
+    assert bad == [("notes", "varchar(1024)"), ("data", "longblob")]
+    assert len(bad_index_types(parsed, types, 0)) == 1
+
+
+class TestSecondaryIndexLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    def test_inherited(self):
+        module = astroid.parse(
+            '''
+            import datajoint as dj
+
+            class Subject(dj.Manual):
+                definition = """
+                subject : varchar(32)
+                ---
+                data : longblob
+                """
+
+            class Session(dj.Manual):
+                definition = """
+                -> Subject
+                session_id : int
+                ---
+                -> [nullable] Subject.proj(other="subject")
+                index(subject)
+                index(other)
+                """
+            '''
+        )
+        self.checker.visit_module(module)
+        for node in module.body[1:]:
+            self.checker.visit_classdef(node)
+        (msg,) = self.linter.release_messages()
+        assert msg.msg_id == "redundant-index"
+        assert msg.args == ("Session", "index(subject)", "the primary key")
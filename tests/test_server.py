@@ -0,0 +1,168 @@
+import io
+import json
+
+from datajoint_linter.server import DiagnosticServer, serve_lsp, watch
+
+SCHEMA = "./tests/schema_bad.py"
+
+
+def _read(path=SCHEMA):
+    with open(path) as f:
+        return f.read()
+
+
+def _encode(*messages):
+    stream = b""
+    for message in messages:
+        body = json.dumps(dict(jsonrpc="2.0", **message)).encode()
+        stream += f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    return io.BytesIO(stream)
+
+
+def _decode(stream):
+    messages, data = [], stream.getvalue()
+    while data:
+        header, _, data = data.partition(b"\r\n\r\n")
+        length = int(header.split(b":")[1])
+        messages.append(json.loads(data[:length]))
+        data = data[length:]
+    return messages
+
+
+def test_lint():
+    server = DiagnosticServer()
+    messages = server.lint("bad", _read())
+    symbols = [msg["symbol"] for msg in messages]
+    assert symbols.count("definition-error") == 8
+    assert "dj-wildcard-import" in symbols
+    assert "no-def" in symbols
+    server.close()
+
+
+def test_incremental():
+    server = DiagnosticServer()
+    text = _read()
+    first = server.lint("bad", text)
+    checked = server.checked
+
+    shifted = server.lint("bad", "\n\n" + text)
+    assert server.checked == checked  # all classes reused
+    assert [m["line"] for m in shifted] == [m["line"] + 2 for m in first]
+
+    edited = text.replace("value : int\n", "value : int\n    other : int\n")
+    server.lint("bad", edited)
+    assert server.checked == checked + 1  # only NoPK checked again
+    server.close()
+
+
+def test_incremental_parent():
+    text = (
+        "import datajoint as dj\n"
+        "class Parent(dj.Manual):\n"
+        '    definition = "name : varchar(700)"\n'
+        "class Child(dj.Manual):\n"
+        '    definition = "-> Parent\\nsub : varchar(100)"\n'
+    )
+
+    def wide(server, text):
+        return [
+            m["line"]
+            for m in server.lint("doc", text)
+            if m["symbol"] == "wide-pk"
+        ]
+
+    server = DiagnosticServer()
+    assert wide(server, text) == [4]
+    assert wide(server, text.replace("(700)", "(10)")) == []  # Child again
+    assert wide(server, text) == [4]
+    assert wide(server, text.replace("(100)", "(101)")) == [4]  # Parent reused
+    assert wide(DiagnosticServer(), text.replace("(100)", "(101)")) == [4]
+    server.close()
+
+
+def test_edited_base():
+    text = (
+        "import datajoint as dj\n"
+        "class Base(dj.Manual):\n"
+        '    definition = "id : int"\n'
+        "class Child(Base):\n"
+        '    definition = "bad"\n'
+    )
+
+    def errors(server, text):
+        return [
+            m["line"]
+            for m in server.lint("doc", text)
+            if m["symbol"] == "definition-error"
+        ]
+
+    server = DiagnosticServer()
+    assert errors(server, text) == [4]
+    edited = text.replace("Base(dj.Manual)", "Base")
+    assert errors(server, edited) == []  # Child no longer a table
+    assert errors(DiagnosticServer(), edited) == []
+    server.close()
+
+
+def test_pending_cleared():
+    text = (
+        "import datajoint as dj\n"
+        "from other import Session\n"
+        "class Trial(dj.Manual):\n"
+        '    definition = "-> Session\\ntrial : int"\n'
+    )
+    server = DiagnosticServer()
+    for idx in range(3):
+        server.lint("doc", text + "#" * idx)
+        assert server.checker._pending == []
+    server.close()
+
+
+def test_disabled():
+    text = (
+        "import datajoint as dj\n"
+        "class NoPK(dj.Manual):  # pylint: disable=no-pk\n"
+        '    definition = "---\\nvalue : int"\n'
+    )
+    server = DiagnosticServer()
+    assert server.lint("doc", text) == []
+    enabled = text.replace("  # pylint: disable=no-pk", "")
+    assert [m["symbol"] for m in server.lint("doc", enabled)] == ["no-pk"]
+    disabled = "# pylint: disable=no-pk\n" + enabled
+    assert server.lint("doc", disabled) == []  # reused, then filtered
+    server.close()
+
+
+def test_lsp():
+    uri = "file:///tmp/schema_bad.py"
+    stdin = _encode(
+        dict(id=1, method="initialize", params=dict()),
+        dict(method="initialized", params=dict()),
+        dict(
+            method="textDocument/didOpen",
+            params=dict(textDocument=dict(uri=uri, text=_read(), version=1)),
+        ),
+        dict(id=2, method="shutdown"),
+        dict(method="exit"),
+    )
+    stdout = io.BytesIO()
+    assert serve_lsp(stdin=stdin, stdout=stdout) == 0
+
+    initialize, publish, shutdown = _decode(stdout)
+    assert initialize["id"] == 1
+    assert initialize["result"]["capabilities"]["textDocumentSync"]["change"]
+    assert publish["params"]["uri"] == uri
+    codes = {d["code"] for d in publish["params"]["diagnostics"]}
+    assert {"C0001", "C0002", "C0003", "C0008"} <= codes
+    assert shutdown == dict(jsonrpc="2.0", id=2, result=None)
+
+
+def test_watch(tmp_path):
+    path = tmp_path / "schema.py"
+    path.write_text(_read())
+    output = io.StringIO()
+    polls, linted = watch(
+        [str(tmp_path)], iterations=2, interval=0, output=output
+    )
+    assert (polls, linted) == (2, 1)
+    assert "(no-pk)" in output.getvalue()
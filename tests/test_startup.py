@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+STARTUP_BUDGET = 0.25  # seconds to import the plugin after pylint
+
+_SCRIPT = """
+import json, sys, time
+
+import astroid
+from pylint.lint import PyLinter
+from pylint.testutils import UnittestLinter
+
+start = time.perf_counter()
+import datajoint_linter
+from datajoint_linter.main import DataJointLinter
+elapsed = time.perf_counter() - start
+
+checker = DataJointLinter(UnittestLinter())
+checker.open()
+checker.visit_classdef(astroid.extract_node("class A(object): pass"))
+checker.visit_import(astroid.extract_node("import os"))
+checker.close()
+
+print(json.dumps(dict(elapsed=elapsed, loaded="datajoint" in sys.modules)))
+"""
+
+
+def _startup():
+    """Runs the plugin import in a fresh interpreter, returns stats"""
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_no_datajoint_import():
+    assert not _startup()["loaded"], "datajoint imported without tables"
+
+
+def test_startup_time():
+    elapsed = min(_startup()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET, f"Plugin import took {elapsed:.3f}s"
@@ -0,0 +1,122 @@
+import astroid
+import pytest
+from pylint.testutils import CheckerTestCase
+
+from datajoint_linter.index import TableIndex
+from datajoint_linter.main import DataJointLinter
+from datajoint_linter.parser import parse_definition
+from datajoint_linter.width import attribute_width, table_width
+
+
+@pytest.mark.parametrize(
+    "attribute_type, in_index, width",
+    [
+        ("tinyint unsigned", False, 1),
+        ("int", False, 4),
+        ("bigint", False, 8),
+        ("serial", False, 8),
+        ("decimal(5,2)", False, 3),
+        ("decimal(18,9)", False, 8),
+        ("float", False, 4),
+        ("double", False, 8),
+        ("char(8)", False, 32),
+        ("varchar(32)", False, 129),
+        ("varchar(64)", False, 258),
+        ("varchar(64)", True, 256),
+        ("enum('a', 'b')", False, 1),
+        ("datetime(3)", False, 7),
+        ("longblob", False, 12),
+        ("blob@store", False, 16),
+        ("uuid", False, 16),
+        ("<adapted>", False, 0),
+    ],
+)
+def test_attribute_width(attribute_type, in_index, width):
+    assert attribute_width(attribute_type, in_index) == width
+
+
+def test_table_width():
+    parents = dict(Subject=(("subject", "varchar(32)"),))
+    definition = parse_definition(
+        """
+        -> Subject
+        session_id : int
+        ---
+        -> [nullable] Missing
+        notes : varchar(1000)
+        data : longblob
+        """
+    )
+    width = table_width(definition, parents.get)
+    assert width.key == (("subject", "varchar(32)"), ("session_id", "int"))
+    assert width.primary_key == 128 + 4
+    assert width.row == 129 + 4 + 4002 + 12
+    assert not width.complete  # Missing adds no width
+
+
+def test_index_key_types(tmp_path):
+    (tmp_path / "mod.py").write_text(
+        '''
+import datajoint as dj
+
+class Subject(dj.Manual):
+    definition = """
+    subject : varchar(32)
+    """
+
+class Session(dj.Manual):
+    definition = """
+    -> Subject
+    session_id : int
+    """
+'''
+    )
+    index = TableIndex([str(tmp_path)], DataJointLinter.CHECKED_CLASSES)
+    assert index.key_types(index.get("mod", "Session")) == (
+        ("subject", "varchar(32)"),
+        ("session_id", "int"),
+    )
+
+
+class TestWidthLinter(CheckerTestCase):
+    CHECKER_CLASS = DataJointLinter
+
+    _module = '''
+    import datajoint as dj
+
+    class Subject(dj.Manual):
+        definition = """
+        subject : varchar(400)
+        """
+
+    class Session(dj.Manual):
+        definition = """
+        -> Subject
+        session_name : varchar(400)
+        ---
+        notes = "" : varchar(16000)
+        """
+    '''
+
+    def test_wide_pk(self):
+        module = astroid.parse(self._module)
+        self.checker.visit_module(module)
+        for node in module.body[1:]:
+            self.checker.visit_classdef(node)
+        pk, row = self.linter.release_messages()
+        assert (pk.msg_id, pk.args) == (
+            "wide-pk",
+            ("Session", 3200, "MySQL limit", 3072),
+        )
+        assert (row.msg_id, row.args) == (
+            "wide-row",
+            ("Session", 3204 + 64002, "MySQL limit", 65535),
+        )
+
+    def test_max_pk_bytes(self):
+        self.linter.config.dj_max_pk_bytes = 1000
+        module = astroid.parse(self._module.replace("16000", "16"))
+        self.checker.visit_module(module)
+        self.checker.visit_classdef(module.body[1])
+        (msg,) = self.linter.release_messages()
+        assert msg.args == ("Subject", 1600, "dj-max-pk-bytes", 1000)